@@ -0,0 +1,99 @@
+# coding: utf-8
+"""Compare Object.as_dict with the previous recursive implementation.
+
+Usage: PYTHONPATH=. python benchmarks/bench_as_dict.py [--number 20]
+"""
+from __future__ import print_function
+
+import argparse
+import io
+import json
+import timeit
+
+import six
+
+from bench_json import BASE_URL, issue, make_connection, make_response, reference
+
+from yandex_tracker_client.connection import decode_response
+from yandex_tracker_client.objects import Object
+
+
+def as_dict_recursive(obj):
+    # Object.as_dict before it became iterative
+    def to_simple(value):
+        if isinstance(value, dict):
+            return dict((k, to_simple(v)) for k, v in six.iteritems(value))
+        elif isinstance(value, Object):
+            return as_dict_recursive(value)
+        elif isinstance(value, (list, set, tuple)):
+            return [to_simple(v) for v in value]
+        else:
+            return value
+
+    return to_simple(obj._value)
+
+
+def changelog_entry(number):
+    user = reference('users', number % 10, passportUid=number % 10)
+    return {
+        'self': '{}/issues/TEST-1/changelog/{}'.format(BASE_URL, number),
+        'id': str(number),
+        'issue': reference('issues', 'TEST-1', key='TEST-1'),
+        'updatedAt': '2024-01-01T00:00:00.000+0000',
+        'updatedBy': user,
+        'type': 'IssueUpdated',
+        'transport': 'front',
+        'fields': [
+            {
+                'field': reference('fields', 'followers'),
+                'from': [reference('users', uid) for uid in range(number % 5)],
+                'to': [reference('users', uid) for uid in range(number % 5 + 1)],
+            },
+            {
+                'field': reference('fields', 'status'),
+                'from': reference('statuses', 1, key='open'),
+                'to': reference('statuses', 2, key='inProgress'),
+            },
+            {
+                'field': reference('fields', 'description'),
+                'from': 'Lorem ipsum dolor sit amet. ' * 5,
+                'to': 'Lorem ipsum dolor sit amet. ' * 6,
+            },
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=20)
+    args = parser.parse_args()
+
+    conn = make_connection()
+    payloads = [
+        ('issues', [issue(number) for number in range(100)]),
+        ('changelog', [changelog_entry(number) for number in range(100)]),
+    ]
+
+    def write_json(objects):
+        output = io.StringIO()
+        for obj in objects:
+            obj.write_json(output)
+
+    variants = [
+        ('recursive', lambda objects: [as_dict_recursive(obj) for obj in objects]),
+        ('as_dict', lambda objects: [obj.as_dict() for obj in objects]),
+        ('flattened', lambda objects: [obj.as_dict(flatten_references=True) for obj in objects]),
+        ('dumps(as_dict)', lambda objects: [json.dumps(obj.as_dict()) for obj in objects]),
+        ('write_json', write_json),
+    ]
+
+    for name, payload in payloads:
+        objects = decode_response(make_response(json.dumps(payload).encode('utf-8')), conn)
+        print('{} x {}:'.format(len(objects), name))
+        for variant, func in variants:
+            elapsed = timeit.timeit(lambda: func(objects), number=args.number)
+            print('  {:15} {:7.2f} ms'.format(variant, elapsed / args.number * 1000))
+
+
+if __name__ == '__main__':
+    main()
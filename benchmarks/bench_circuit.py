@@ -0,0 +1,71 @@
+# coding: utf-8
+"""Cost of calls to a failing endpoint, with and without a circuit breaker.
+
+One endpoint of the mocked API answers 500, another one works. Sleeps
+between retries are not made, only added up.
+
+Usage: PYTHONPATH=. python benchmarks/bench_circuit.py [--calls 100]
+"""
+from __future__ import print_function
+
+import argparse
+import logging
+import time
+
+import requests_mock
+
+from yandex_tracker_client import connection as connection_module
+from yandex_tracker_client.circuit import CircuitBreaker
+from yandex_tracker_client.connection import Connection
+from yandex_tracker_client.exceptions import CircuitOpen, OutOfRetries
+from yandex_tracker_client.retry import RetryPolicy
+
+BASE_URL = 'https://api.tracker.yandex.net'
+
+
+class FakeTime(object):
+    def __init__(self):
+        self.slept = 0
+
+    def sleep(self, seconds):
+        self.slept += seconds
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+def run(calls, breaker):
+    fake_time = connection_module.time = FakeTime()
+    connection = Connection(token='TOKEN', org_id='1', circuit_breaker=breaker,
+                            retry_policy=RetryPolicy(retries=10, initial_delay=0.5, max_delay=10))
+    failed = 0
+    started = time.time()
+    with requests_mock.Mocker() as mock:
+        mock.get(BASE_URL + '/v2/queues/BROKEN', status_code=500)
+        mock.get(BASE_URL + '/v2/issues/TEST-1', json={'key': 'TEST-1'})
+        for _ in range(calls):
+            try:
+                connection.get('/v2/queues/BROKEN')
+            except (CircuitOpen, OutOfRetries):
+                failed += 1
+            connection.get('/v2/issues/TEST-1')
+        requests = mock.call_count
+    connection_module.time = time
+    return time.time() - started, fake_time.slept, requests, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=100)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.CRITICAL)
+
+    print('{} calls to a broken and to a working endpoint each'.format(args.calls))
+    print('{:10}  {:>9}  {:>9}  {:>8}  {:>6}'.format('breaker', 'time, s', 'waited, s', 'requests', 'failed'))
+    for name, breaker in (('none', None), ('5 / 30 s', CircuitBreaker(failure_threshold=5, recovery_timeout=30))):
+        elapsed, slept, requests, failed = run(args.calls, breaker)
+        print('{:10}  {:9.2f}  {:9.1f}  {:8}  {:6}'.format(name, elapsed, slept, requests, failed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+# coding: utf-8
+"""Search issues and post bulk updates with and without compression.
+
+A local HTTP server gzips responses if the client accepts gzip and reads
+gzipped request bodies. Byte counts come from ``compression.ByteCounter``.
+
+Usage: PYTHONPATH=. python benchmarks/bench_compression.py [--issues 500] [--calls 50]
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bench_json import issue
+
+from yandex_tracker_client import TrackerClient, compression
+
+
+def serve(body):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        wbufsize = 64 * 1024
+
+        def do_GET(self):
+            self.reply(body)
+
+        def do_POST(self):
+            data = self.rfile.read(int(self.headers['Content-Length']))
+            json.loads(compression.decode(data, self.headers.get('Content-Encoding')).decode('utf-8'))
+            self.reply(b'{"id": "1", "status": "CREATED"}')
+
+        def reply(self, data):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                data = compression.gzip(data)
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def run(args, compressed):
+    body = json.dumps([issue(number) for number in range(args.issues)]).encode('utf-8')
+    keys = ['TEST-{}'.format(number) for number in range(args.issues)]
+    httpd = serve(body)
+    counter = compression.ByteCounter()
+    client = TrackerClient(
+        token='TOKEN', org_id='1', base_url='http://127.0.0.1:{}'.format(httpd.server_port),
+        headers=None if compressed else {'Accept-Encoding': 'identity'},
+        compress_threshold=1024 if compressed else None,
+        metrics_hook=counter,
+    )
+    client.issues._fields = {}
+    connection = client._connection
+    started = time.time()
+    for _ in range(args.calls):
+        connection.get('/v2/issues/')
+        connection.post('/v2/bulkchange/_update', data={'issues': keys, 'values': {'tags': {'add': ['bench']}}})
+    elapsed = time.time() - started
+    httpd.shutdown()
+    httpd.server_close()
+    return elapsed, counter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--issues', type=int, default=500)
+    parser.add_argument('--calls', type=int, default=50)
+    args = parser.parse_args()
+
+    print('{} searches of {} issues and {} bulk updates, over loopback'.format(args.calls, args.issues, args.calls))
+    print('{:12}  {:>10}  {:>12}  {:>12}  {:>12}'.format(
+        'compression', 'ms / pair', 'KiB sent', 'KiB received', 'KiB decoded'))
+    for compressed in (False, True):
+        elapsed, counter = run(args, compressed)
+        print('{:12}  {:10.2f}  {:12.0f}  {:12.0f}  {:12.0f}'.format(
+            'gzip' if compressed else 'identity', elapsed / args.calls * 1000,
+            counter.request_wire_bytes / 1024.0, counter.response_wire_bytes / 1024.0,
+            counter.response_bytes / 1024.0,
+        ))
+
+
+if __name__ == '__main__':
+    main()
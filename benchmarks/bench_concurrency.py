@@ -0,0 +1,109 @@
+# coding: utf-8
+"""Thread pools calling an API which degrades above its capacity, with and
+without an adaptive concurrency limiter (Python 3).
+
+A local HTTP server handles ``--capacity`` requests at once in ``--latency``
+seconds; more concurrent requests are proportionally slower, and above
+twice the capacity it answers 429.
+
+Usage: PYTHONPATH=. python benchmarks/bench_concurrency.py [--calls 600] [--capacity 8]
+"""
+from __future__ import print_function
+
+import argparse
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from yandex_tracker_client.concurrency import AdaptiveLimiter
+from yandex_tracker_client.connection import Connection
+from yandex_tracker_client.retry import RetryPolicy
+
+
+class Server(object):
+    def __init__(self, capacity, latency):
+        self.capacity = capacity
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.requests = self.rejected = 0
+
+    def handle(self):
+        """Status code of the next response."""
+        with self.lock:
+            self.requests += 1
+            if self.in_flight >= 2 * self.capacity:
+                self.rejected += 1
+                return 429
+            self.in_flight += 1
+            load = self.in_flight
+        try:
+            time.sleep(self.latency * max(1.0, float(load) / self.capacity))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+        return 200
+
+
+def serve(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # one write per response, small writes would wait for delayed ACKs
+        wbufsize = 64 * 1024
+
+        def do_GET(self):
+            status = server.handle()
+            body = b'{"login": "me"}' if status == 200 else b''
+            self.send_response(status)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def run(args, threads, limiter):
+    server = Server(args.capacity, args.latency)
+    httpd = serve(server)
+    connection = Connection(token='TOKEN', org_id='1', base_url='http://127.0.0.1:{}'.format(httpd.server_port),
+                            pool_maxsize=threads, concurrency_limiter=limiter,
+                            retry_policy=RetryPolicy(retries=50, initial_delay=0.05, max_delay=1))
+    started = time.time()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(lambda _: connection.get('/v2/myself'), range(args.calls)))
+    elapsed = time.time() - started
+    httpd.shutdown()
+    httpd.server_close()
+    return elapsed, server.requests, server.rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=600)
+    parser.add_argument('--capacity', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.02)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    print('{} calls, server capacity {} requests at once'.format(args.calls, args.capacity))
+    print('{:>7}  {:10}  {:>7}  {:>8}  {:>8}  {:>5}'.format(
+        'threads', 'limiter', 'time, s', 'requests', 'rejected', 'limit'))
+    for threads in (4, 8, 32, 64):
+        for name in ('none', 'adaptive'):
+            limiter = AdaptiveLimiter(initial_limit=4) if name == 'adaptive' else None
+            elapsed, requests, rejected = run(args, threads, limiter)
+            print('{:7}  {:10}  {:7.2f}  {:8}  {:8}  {:>5}'.format(
+                threads, name, elapsed, requests, rejected, limiter.limit if limiter else '-'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+# coding: utf-8
+"""Map status keys to objects in a loop, with and without dictionary_ttl.
+
+Requests go to a mocked API, so the "no cache" numbers are a lower bound
+of what a network round trip costs.
+
+Usage: PYTHONPATH=. python benchmarks/bench_dictionaries.py [--lookups 2000]
+"""
+from __future__ import print_function
+
+import argparse
+import time
+
+import requests_mock
+
+from yandex_tracker_client import TrackerClient
+
+BASE_URL = 'https://api.tracker.yandex.net/v2'
+KEYS = ['open', 'inProgress', 'needInfo', 'resolved', 'closed']
+
+
+def status(id, key):
+    return {'self': '{}/statuses/{}'.format(BASE_URL, id), 'id': id, 'key': key, 'name': key.title()}
+
+
+def run(lookups, dictionary_ttl):
+    statuses = [status(id, key) for id, key in enumerate(KEYS, 1)]
+    with requests_mock.Mocker() as mock:
+        mock.get(BASE_URL + '/statuses/', json=statuses)
+        for item in statuses:
+            mock.get('{}/statuses/{}'.format(BASE_URL, item['key']), json=item)
+
+        client = TrackerClient(token='TOKEN', org_id='1', dictionary_ttl=dictionary_ttl)
+        started = time.time()
+        for number in range(lookups):
+            client.statuses[KEYS[number % len(KEYS)]]
+        return time.time() - started, mock.call_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lookups', type=int, default=2000)
+    args = parser.parse_args()
+
+    print('{} lookups of status by key'.format(args.lookups))
+    print('{:16}  {:>12}  {:>8}'.format('dictionary_ttl', 'us / lookup', 'requests'))
+    for ttl in (None, 300):
+        elapsed, requests = run(args.lookups, ttl)
+        print('{!s:16}  {:12.2f}  {:8}'.format(ttl, elapsed / args.lookups * 1e6, requests))
+
+
+if __name__ == '__main__':
+    main()
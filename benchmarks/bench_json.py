@@ -0,0 +1,106 @@
+# coding: utf-8
+"""Compare JSON codecs and lazy decoding on a page of search results.
+
+Usage: PYTHONPATH=. python benchmarks/bench_json.py [--issues 100] [--number 200]
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import timeit
+
+import requests
+
+from yandex_tracker_client import TrackerClient, codec
+from yandex_tracker_client.connection import decode_response
+
+BASE_URL = 'https://api.tracker.yandex.net/v2'
+
+
+def reference(collection, id, **fields):
+    value = {'self': '{}/{}/{}'.format(BASE_URL, collection, id), 'id': str(id), 'display': 'Display {}'.format(id)}
+    value.update(fields)
+    return value
+
+
+def issue(number):
+    key = 'TEST-{}'.format(number)
+    user = lambda uid: reference('users', uid, passportUid=uid, cloudUid='cloud{}'.format(uid))
+    return reference(
+        'issues', key,
+        key=key,
+        version=number,
+        summary='Issue number {}'.format(number),
+        description='Lorem ipsum dolor sit amet. ' * 10,
+        queue=reference('queues', 'TEST', key='TEST'),
+        status=reference('statuses', 1, key='open'),
+        type=reference('issuetypes', 2, key='task'),
+        priority=reference('priorities', 3, key='normal'),
+        createdBy=user(number % 10),
+        updatedBy=user(number % 7),
+        assignee=user(number % 5),
+        followers=[user(uid) for uid in range(3)],
+        components=[reference('components', number % 4)],
+        parent=reference('issues', 'TEST-1', key='TEST-1'),
+        tags=['tag1', 'tag2'],
+        createdAt='2024-01-01T00:00:00.000+0000',
+        updatedAt='2024-01-02T00:00:00.000+0000',
+        votes=0,
+        favorite=False,
+    )
+
+
+def make_response(content):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    return response
+
+
+def make_connection(**kwargs):
+    client = TrackerClient(**kwargs)
+    # don't request the fields schema
+    client.issues._fields = {}
+    return client._connection
+
+
+def read_fields(issues):
+    # a typical export reads a few fields of every issue
+    return [(issue.key, issue.status.key) for issue in issues]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--issues', type=int, default=100)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    page = [issue(number) for number in range(args.issues)]
+    content = json.dumps(page).encode('utf-8')
+    print('page: {} issues, {} bytes'.format(args.issues, len(content)))
+
+    codecs = [codec.JSONCodec()]
+    if codec.orjson is not None:
+        codecs.append(codec.OrjsonCodec())
+    else:
+        print('orjson is not installed')
+
+    response = make_response(content)
+    for json_codec in codecs:
+        conn = make_connection(json_codec=json_codec)
+        lazy_conn = make_connection(json_codec=json_codec, lazy_decode=True)
+        loads = timeit.timeit(lambda: json_codec.loads(content), number=args.number)
+        decode = timeit.timeit(lambda: read_fields(decode_response(response, conn)), number=args.number)
+        lazy = timeit.timeit(lambda: read_fields(decode_response(response, lazy_conn)), number=args.number)
+        dumps = timeit.timeit(lambda: json_codec.dumps(page), number=args.number)
+        print('{:8} loads {:7.3f} ms  decode_response {:7.3f} ms  lazy {:7.3f} ms  dumps {:7.3f} ms'.format(
+            json_codec.name,
+            loads / args.number * 1000,
+            decode / args.number * 1000,
+            lazy / args.number * 1000,
+            dumps / args.number * 1000,
+        ))
+
+
+if __name__ == '__main__':
+    main()
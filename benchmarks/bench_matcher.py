@@ -0,0 +1,59 @@
+# coding: utf-8
+"""Compare route matching strategies by number of registered collections.
+
+Usage: PYTHONPATH=. python benchmarks/bench_matcher.py [--number 20000]
+"""
+from __future__ import print_function
+
+import argparse
+import re
+import timeit
+
+from yandex_tracker_client.uriutils import VARIABLE_VALUE, Matcher
+
+
+def make_matcher(collections):
+    matcher = Matcher()
+    for number in range(collections):
+        if number % 3:
+            matcher.add('/{{api_version}}/collection{}/{{id}}'.format(number), number)
+        else:
+            matcher.add('/{{api_version}}/parent{}/{{parent}}/children/{{id}}'.format(number), number, priority=1)
+    return matcher
+
+
+def linear(matcher):
+    """Matching by trying regular expressions of templates one by one."""
+    patterns = [
+        (re.compile('/'.join(VARIABLE_VALUE if part is None else part for part in parts)), value)
+        for _, value, parts in matcher._patterns
+    ]
+
+    def match(uri):
+        path = uri.strip('/')
+        for pattern, value in patterns:
+            if pattern.match(path):
+                return value
+        return None
+    return match
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    print('{:>11}  {:>9}  {:>9}  {:>9}  (us per match)'.format('collections', 'linear', 'trie', 'memoised'))
+    for collections in (10, 30, 60, 120, 240):
+        matcher = make_matcher(collections)
+        # the last one to be tried
+        uri = '/v2/collection{}/{}'.format(collections - 1 if (collections - 1) % 3 else collections - 2, 'ID-1')
+        timings = [
+            timeit.timeit(lambda: match(uri), number=args.number) / args.number * 1e6
+            for match in (linear(matcher), matcher._match, matcher.match)
+        ]
+        print('{:>11}  {:>9.2f}  {:>9.2f}  {:>9.2f}'.format(collections, *timings))
+
+
+if __name__ == '__main__':
+    main()
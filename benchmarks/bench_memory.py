@@ -0,0 +1,51 @@
+# coding: utf-8
+"""Measure memory held by decoded search results.
+
+Usage: PYTHONPATH=. python benchmarks/bench_memory.py [--issues 100000] [--lazy]
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from bench_json import issue, make_connection, make_response
+
+from yandex_tracker_client.connection import decode_response
+
+PAGE_SIZE = 100
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--issues', type=int, default=100000)
+    parser.add_argument('--lazy', action='store_true', help='use lazy_decode=True')
+    args = parser.parse_args()
+
+    conn = make_connection(lazy_decode=args.lazy)
+    # different pages, so that issues don't share parsed strings
+    pages = [
+        make_response(json.dumps([issue(number) for number in range(start, start + PAGE_SIZE)]).encode('utf-8'))
+        for start in range(0, args.issues, PAGE_SIZE)
+    ]
+
+    gc.collect()
+    tracemalloc.start()
+    started = time.time()
+    issues = []
+    for page in pages:
+        issues.extend(decode_response(page, conn))
+    elapsed = time.time() - started
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print('{} issues: {:.1f} MB held ({:.0f} bytes per issue), peak {:.1f} MB, decoded in {:.1f} s'.format(
+        len(issues), current / 2.0 ** 20, float(current) / len(issues), peak / 2.0 ** 20, elapsed,
+    ))
+
+
+if __name__ == '__main__':
+    main()
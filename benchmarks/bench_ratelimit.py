@@ -0,0 +1,93 @@
+# coding: utf-8
+"""Threads calling a rate-limited API, with and without a client-side limiter.
+
+The mocked server admits ``--rate`` requests per second and answers 429
+with ``Retry-After: 1`` otherwise.
+
+Usage: PYTHONPATH=. python benchmarks/bench_ratelimit.py [--threads 20] [--calls 20] [--rate 100]
+"""
+from __future__ import print_function
+
+import argparse
+import logging
+import os
+import tempfile
+import threading
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+import requests_mock
+
+from yandex_tracker_client.connection import Connection
+from yandex_tracker_client.ratelimit import FileTokenBucket, TokenBucket
+from yandex_tracker_client.retry import RetryPolicy
+
+URL = 'https://api.tracker.yandex.net/v2/myself'
+
+
+class Server(object):
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = float(rate)
+        self.updated = time.time()
+        self.lock = threading.Lock()
+        self.requests = self.rejected = 0
+
+    def __call__(self, request, context):
+        with self.lock:
+            now = time.time()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.requests += 1
+            if self.tokens < 1:
+                self.rejected += 1
+                context.status_code = 429
+                context.headers['Retry-After'] = '1'
+                return b''
+            self.tokens -= 1
+        return b'{"login": "me"}'
+
+
+def run(rate, threads, calls, limiter):
+    server = Server(rate)
+    connection = Connection(token='TOKEN', org_id='1', rate_limiter=limiter,
+                            retry_policy=RetryPolicy(retries=50, initial_delay=0.1, max_delay=2))
+    started = time.time()
+    with requests_mock.Mocker() as mock:
+        mock.get(URL, content=server)
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(lambda _: connection.get('/v2/myself'), range(threads * calls)))
+    return time.time() - started, server.requests, server.rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=20)
+    parser.add_argument('--calls', type=int, default=20)
+    parser.add_argument('--rate', type=int, default=100)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    directory = tempfile.mkdtemp()
+    bucket = TokenBucket(rate=1e6)
+    file_bucket = FileTokenBucket(rate=1e6, path=os.path.join(directory, 'overhead'))
+    print('reserve(): {:.2f} us in memory, {:.2f} us with a file lock'.format(
+        timeit.timeit(bucket.reserve, number=100000) * 10,
+        timeit.timeit(file_bucket.reserve, number=10000) * 100,
+    ))
+
+    print('{} calls by {} threads, {} requests/s allowed'.format(args.threads * args.calls, args.threads, args.rate))
+    print('{:18}  {:>7}  {:>8}  {:>8}'.format('limiter', 'time, s', 'requests', 'rejected'))
+    limiters = [
+        ('none', None),
+        ('TokenBucket', TokenBucket(args.rate * 0.95, burst=args.rate * 0.5)),
+        ('FileTokenBucket', FileTokenBucket(args.rate * 0.95, burst=args.rate * 0.5, path=os.path.join(directory, 'bucket'))),
+    ]
+    for name, limiter in limiters:
+        elapsed, requests, rejected = run(args.rate, args.threads, args.calls, limiter)
+        print('{:18}  {:7.2f}  {:8}  {:8}'.format(name, elapsed, requests, rejected))
+
+
+if __name__ == '__main__':
+    main()
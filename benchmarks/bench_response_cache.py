@@ -0,0 +1,94 @@
+# coding: utf-8
+"""Poll a slow-changing list of issues with and without a response cache.
+
+A local HTTP server answers with ``ETag`` and honours ``If-None-Match``;
+the list changes every ``--change-every`` polls.
+
+Usage: PYTHONPATH=. python benchmarks/bench_response_cache.py [--issues 100] [--polls 200]
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bench_json import issue
+
+from yandex_tracker_client import TrackerClient
+from yandex_tracker_client.cache import FileCache, LRUCache
+
+
+def serve(args, stats):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        wbufsize = 64 * 1024
+
+        def do_GET(self):
+            version = stats['polls'] // args.change_every
+            stats['polls'] += 1
+            etag = '"{}"'.format(version)
+            if self.headers.get('If-None-Match') == etag:
+                body = b''
+                self.send_response(304)
+            else:
+                body = stats['bodies'][version % 2]
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            stats['bytes'] += len(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def run(args, response_cache):
+    stats = {'polls': 0, 'bytes': 0, 'bodies': [
+        json.dumps([dict(issue(number), version=version) for number in range(args.issues)]).encode('utf-8')
+        for version in range(2)
+    ]}
+    httpd = serve(args, stats)
+    client = TrackerClient(token='TOKEN', org_id='1', base_url='http://127.0.0.1:{}'.format(httpd.server_port),
+                           response_cache=response_cache)
+    client.issues._fields = {}
+    connection = client._connection
+    started = time.time()
+    for _ in range(args.polls):
+        connection.get('/v2/issues/')
+    elapsed = time.time() - started
+    httpd.shutdown()
+    httpd.server_close()
+    return elapsed, stats['bytes']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--issues', type=int, default=100)
+    parser.add_argument('--polls', type=int, default=200)
+    parser.add_argument('--change-every', type=int, default=20)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        print('{} polls of {} issues, changed every {} polls'.format(args.polls, args.issues, args.change_every))
+        print('{:10}  {:>12}  {:>14}'.format('cache', 'ms per poll', 'KiB received'))
+        for name, response_cache in (('none', None), ('LRUCache', LRUCache()), ('FileCache', FileCache(directory))):
+            elapsed, received = run(args, response_cache)
+            print('{:10}  {:12.2f}  {:14.0f}'.format(name, elapsed / args.polls * 1000, received / 1024.0))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# coding: utf-8
+"""Simulate many workers retrying against a rate-limited API.
+
+The server admits ``--rate`` requests per second (token bucket, one second
+of burst) and answers 429 with ``Retry-After`` otherwise. Time is simulated,
+nothing sleeps.
+
+Usage: PYTHONPATH=. python benchmarks/bench_retry.py [--workers 50] [--calls 20] [--rate 100]
+"""
+from __future__ import print_function
+
+import argparse
+import heapq
+import math
+import random
+
+from yandex_tracker_client import retry
+from yandex_tracker_client.retry import RetryPolicy
+
+
+class Response(object):
+    def __init__(self, status_code, headers):
+        self.status_code = status_code
+        self.headers = headers
+
+
+class Server(object):
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = float(rate)
+        self.updated = 0.0
+
+    def handle(self, now, send_retry_after):
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return Response(200, {})
+        headers = {}
+        if send_retry_after:
+            wait = (1 - self.tokens) / self.rate
+            headers['Retry-After'] = str(int(math.ceil(wait)))
+        return Response(429, headers)
+
+
+def simulate(policy, workers, calls, rate, send_retry_after=True, latency=0.05):
+    server = Server(rate)
+    # (time, worker, calls left, retries state)
+    events = [(random.uniform(0, latency), worker, calls, None) for worker in range(workers)]
+    heapq.heapify(events)
+    attempts = failures = 0
+    now = 0.0
+
+    while events:
+        now, worker, left, retries = heapq.heappop(events)
+        if retries is None:
+            retries = policy.start()
+        attempts += 1
+        response = server.handle(now, send_retry_after)
+        if retries.should_retry(response):
+            delay = retries.next_delay(response)
+            if delay is not None:
+                heapq.heappush(events, (now + latency + delay, worker, left, retries))
+                continue
+            failures += 1
+        elif response.status_code != 200:
+            failures += 1
+
+        if left > 1:
+            heapq.heappush(events, (now + latency, worker, left - 1, None))
+
+    return now, attempts, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=50)
+    parser.add_argument('--calls', type=int, default=20)
+    parser.add_argument('--rate', type=int, default=100)
+    args = parser.parse_args()
+
+    variants = [
+        ('fixed, no Retry-After', RetryPolicy(initial_delay=1, multiplier=2, max_delay=10,
+                                             jitter=retry.NO_JITTER), False),
+        ('fixed + Retry-After', RetryPolicy(initial_delay=1, multiplier=2, max_delay=10,
+                                           jitter=retry.NO_JITTER), True),
+        ('full jitter', RetryPolicy(initial_delay=1, multiplier=2, max_delay=10), True),
+        ('decorrelated', RetryPolicy(initial_delay=1, multiplier=2, max_delay=10,
+                                     jitter=retry.DECORRELATED_JITTER), True),
+        ('full jitter, 30 retries', RetryPolicy(retries=30, initial_delay=1, multiplier=2, max_delay=10), True),
+    ]
+
+    total = args.workers * args.calls
+    print('{} calls by {} workers, {} requests/s allowed'.format(total, args.workers, args.rate))
+    print('{:24}  {:>8}  {:>10}  {:>8}  {:>8}'.format('policy', 'time, s', 'calls/s', 'attempts', 'failed'))
+    for name, policy, send_retry_after in variants:
+        random.seed(0)
+        elapsed, attempts, failures = simulate(policy, args.workers, args.calls, args.rate, send_retry_after)
+        print('{:24}  {:8.1f}  {:10.1f}  {:8}  {:8}'.format(
+            name, elapsed, (total - failures) / elapsed, attempts, failures))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# coding: utf-8
+"""Bursts of identical GETs from many threads, with and without single-flight.
+
+A local HTTP server answers every request in ``--latency`` seconds. Every
+thread reads one of ``--keys`` queues ``--calls`` times.
+
+Usage: PYTHONPATH=. python benchmarks/bench_single_flight.py [--threads 50] [--keys 5] [--calls 20]
+"""
+from __future__ import print_function
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from yandex_tracker_client.client import TrackerClient
+
+
+def serve(latency, counter):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        wbufsize = 64 * 1024
+
+        def do_GET(self):
+            with counter['lock']:
+                counter['requests'] += 1
+            time.sleep(latency)
+            key = self.path.rstrip('/').rsplit('/', 1)[-1]
+            body = '{{"self": "http://localhost{}", "key": "{}"}}'.format(self.path, key).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    return httpd
+
+
+def run(args, single_flight):
+    counter = {'lock': threading.Lock(), 'requests': 0}
+    httpd = serve(args.latency, counter)
+    client = TrackerClient(token='TOKEN', org_id='1', base_url='http://127.0.0.1:{}'.format(httpd.server_port),
+                           pool_maxsize=args.threads, single_flight=single_flight)
+
+    def work(thread):
+        for call in range(args.calls):
+            client.queues['QUEUE{}'.format((thread + call) % args.keys)]
+
+    started = time.time()
+    with ThreadPoolExecutor(args.threads) as pool:
+        list(pool.map(work, range(args.threads)))
+    elapsed = time.time() - started
+    httpd.shutdown()
+    httpd.server_close()
+    return elapsed, counter['requests']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=50)
+    parser.add_argument('--keys', type=int, default=5)
+    parser.add_argument('--calls', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.02)
+    args = parser.parse_args()
+
+    print('{} threads x {} calls over {} keys'.format(args.threads, args.calls, args.keys))
+    print('{:14}  {:>7}  {:>8}'.format('single_flight', 'time, s', 'requests'))
+    for single_flight in (False, True):
+        elapsed, requests = run(args, single_flight)
+        print('{!s:14}  {:7.2f}  {:8}'.format(single_flight, elapsed, requests))
+
+
+if __name__ == '__main__':
+    main()
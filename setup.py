@@ -43,5 +43,10 @@ setup(
         'setuptools<=42.0.2; python_version <= "2.7"',
         'setuptools; python_version >= "3.4"',
         'six>=1.9',
-    ]
+    ],
+    extras_require={
+        'async': ['aiohttp>=3.6; python_version >= "3.6"'],
+        'fast': ['orjson>=3; python_version >= "3.6"'],
+        'brotli': ['brotli>=1.0'],
+    },
 )
@@ -1,5 +1,7 @@
 # coding: utf-8
 
+import sys
+
 import pytest
 from mock import mock_open, patch
 
@@ -12,6 +14,20 @@ from common.queues import FakeQueue, FakeQueuesCollection
 from common.url import api_url
 from yandex_tracker_client import TrackerClient
 
+# the asyncio client and its tests need Python 3.6+
+collect_ignore = ['smoke/test_aio.py'] if sys.version_info < (3, 6) else []
+
+
+@pytest.fixture
+def clock(request, monkeypatch):
+    """Fake time, starting at 100.0, of modules passed to the
+    ``clock(*modules)`` marker; advance it by changing ``clock[0]``."""
+    now = [100.0]
+    for marker in request.node.iter_markers('clock'):
+        for module in marker.args:
+            monkeypatch.setattr(module, 'timer', lambda: now[0])
+    return now
+
 
 @pytest.fixture
 def client():
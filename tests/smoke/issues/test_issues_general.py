@@ -3,7 +3,8 @@
 import pytest
 from common.url import api_url
 
-from yandex_tracker_client import exceptions
+from yandex_tracker_client import TrackerClient, exceptions
+from yandex_tracker_client.cache import FileCache
 
 
 @pytest.mark.parametrize('issue_field', ['key', 'version', 'summary',
@@ -132,3 +133,26 @@ def test_update_local_field_issue(net_mock, client, fake_issue):
     assert real_request['6063181a59590573909db929--localTestField'] == new_local_value
     assert '6063181a59590573909db929--customField' not in real_request  # The expected logic will be implemented in the future
     assert real_request['customField'] == new_custom_value
+
+
+def test_fields_cache(net_mock, tmpdir):
+    fields_cache = FileCache(str(tmpdir), ttl=3600)
+
+    def get_fields():
+        client = TrackerClient(token='TEST_TOKEN', org_id='15', fields_cache=fields_cache)
+        return client.issues.fields
+
+    first, second = get_fields(), get_fields()
+
+    fields_requests = [r for r in net_mock.request_history if r.path.endswith('/fields/')]
+    assert len(fields_requests) == 1
+    assert second == first
+
+
+def test_refresh_fields(net_mock, client, tmpdir):
+    client._connection.fields_cache = FileCache(str(tmpdir))
+    client.issues.fields
+    client.issues.refresh_fields()
+
+    fields_requests = [r for r in net_mock.request_history if r.path.endswith('/fields/')]
+    assert len(fields_requests) == 2
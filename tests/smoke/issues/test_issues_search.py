@@ -4,6 +4,7 @@ import random
 
 import pytest
 
+from common.issues import FakeIssuesCollection
 from common.url import api_url
 
 
@@ -52,3 +53,42 @@ def test_issues_search_response(net_mock, client, fake_issues, issue_field):
         else current_field)
 
     assert current_value == expected_value
+
+
+def test_issues_scroll(net_mock, client):
+    fake_issues = FakeIssuesCollection(count=5)
+    pages = [fake_issues.json[:2], fake_issues.json[2:4], fake_issues.json[4:], []]
+    net_mock.post(api_url('/issues/_search'), [
+        {'json': page, 'headers': {'X-Scroll-Id': 'scroll-id', 'X-Scroll-Token': 'token-{}'.format(num)}}
+        for num, page in enumerate(pages)
+    ])
+
+    issues = client.issues.scroll(query='Queue: TEST', per_page=2, ttl=1000)
+
+    assert [issue.key for issue in issues] == [issue['key'] for issue in fake_issues.json]
+    requests = [request for request in net_mock.request_history if request.method == 'POST']
+    first, second = requests[:2]
+    assert first.qs == {'scrolltype': ['sorted'], 'perscroll': ['2'], 'scrollttlmillis': ['1000']}
+    assert 'X-Scroll-Token' not in first.headers
+    assert second.qs == {'scrollid': ['scroll-id'], 'perscroll': ['2'], 'scrollttlmillis': ['1000']}
+    assert second.headers['X-Scroll-Token'] == 'token-0'
+    assert second.json()['query'] == 'Queue: TEST'
+    assert len(requests) == len(pages)
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_issues_get_many(net_mock, client, workers):
+    fake_issues = dict((issue['key'], issue) for issue in FakeIssuesCollection(count=5).json)
+
+    def search(request, context):
+        return [fake_issues[key] for key in request.json()['keys'] if key in fake_issues]
+
+    net_mock.post(api_url('/issues/_search'), json=search)
+    keys = list(fake_issues) + ['MISSING-1', list(fake_issues)[0]]
+
+    issues = client.issues.get_many(keys, fields=['summary'], chunk_size=2, workers=workers)
+
+    assert [issue.key if issue is not None else None for issue in issues] == keys[:5] + [None, keys[0]]
+    requests = [request for request in net_mock.request_history if request.method == 'POST']
+    assert len(requests) == 3
+    assert all(request.qs['fields'] == ['key,summary'] for request in requests)
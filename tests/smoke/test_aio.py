@@ -0,0 +1,449 @@
+# coding: utf-8
+
+import json
+import socket
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+import asyncio
+
+from common.issues import FakeIssuesCollection
+from common.mock import backend_response
+from common.url import api_url
+
+from yandex_tracker_client import compression, export
+from yandex_tracker_client.aio import AsyncTrackerClient, _BufferedRequest, _BufferedResponse, aiter_rows
+from yandex_tracker_client.cache import FileCache, LRUCache
+from yandex_tracker_client.circuit import CircuitBreaker
+from yandex_tracker_client.concurrency import AdaptiveLimiter
+from yandex_tracker_client.exceptions import (
+    NotFound, OutOfRetries, ReferenceNotLoaded, TooManyRequests, TrackerClientError,
+)
+from yandex_tracker_client.retry import NO_JITTER, RetryPolicy
+
+
+class FakeTransport(object):
+    def __init__(self):
+        self.routes = {}
+        self.calls = []
+
+    def add(self, method, url, json=None, status_code=200, headers=None):
+        self.routes[(method, url)] = (status_code, json, headers or {})
+
+    async def __call__(self, method, url, data=None, headers=None, params=None, **kwargs):
+        self.calls.append((method, url, params, data))
+        status_code, body, response_headers = self.routes[(method, url)]
+        if callable(body):
+            body = body(json.loads(data))
+        return _BufferedResponse(
+            status_code=status_code,
+            reason='Reason',
+            headers=response_headers,
+            content=json.dumps(body).encode('utf-8') if body is not None else b'',
+            request=_BufferedRequest(method, url, data, headers),
+        )
+
+
+@pytest.fixture
+def transport():
+    transport = FakeTransport()
+    transport.add('GET', api_url('/fields/'), json=backend_response('fields.json'))
+    return transport
+
+
+@pytest.fixture
+def aclient(transport):
+    client = AsyncTrackerClient(token='TEST_TOKEN', org_id='15', retries=2)
+    client._connection._send = transport
+    return client
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_get_issue(transport, aclient, fake_issue):
+    transport.add('GET', api_url('/issues/{}'.format(fake_issue.key)), json=fake_issue.json)
+
+    issue = run(aclient.issues[fake_issue.key])
+
+    assert issue.key == fake_issue.key
+    assert issue.summary == fake_issue.json['summary']
+    assert issue.status.key == 'open'
+
+
+def test_async_pagination(transport, aclient, fake_issues):
+    first, second = fake_issues.json[:1], fake_issues.json[1:]
+    next_link = '<{}>; rel="next"'.format(api_url('/issues/_search?page=2'))
+    transport.add('POST', api_url('/issues/_search'), json=first, headers={'Link': next_link})
+    transport.add('POST', api_url('/issues/_search?page=2'), json=second)
+
+    async def collect():
+        issues = await aclient.issues.find(query='Queue: TEST')
+        return [issue.key async for issue in issues]
+
+    keys = run(collect())
+
+    assert keys == [issue['key'] for issue in fake_issues.json]
+
+
+@pytest.fixture
+def seekable_issues(transport):
+    issues = FakeIssuesCollection(count=6).json
+    seek = '<{}>; rel="seek"'.format(api_url('/issues/_search?perPage=2{&page}'))
+    for page in (1, 2, 3):
+        links = [seek]
+        if page < 3:
+            links.append('<{}>; rel="next"'.format(api_url('/issues/_search?perPage=2&page={}'.format(page + 1))))
+        transport.add(
+            'POST',
+            api_url('/issues/_search') if page == 1 else api_url('/issues/_search?perPage=2&page={}'.format(page)),
+            json=issues[(page - 1) * 2:page * 2],
+            headers={'Link': ', '.join(links), 'X-Total-Count': '6', 'X-Total-Pages': '3'},
+        )
+    return [issue['key'] for issue in issues]
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_async_iter_parallel(aclient, seekable_issues, ordered):
+    async def collect():
+        issues = await aclient.issues.find(query='Queue: TEST', per_page=2)
+        return [issue.key async for issue in issues.iter_parallel(workers=2, ordered=ordered)]
+
+    keys = run(collect())
+
+    if ordered:
+        assert keys == seekable_issues
+    else:
+        assert sorted(keys) == sorted(seekable_issues)
+
+
+@pytest.mark.parametrize('prefetch_pages', [0, 1])
+def test_async_iter_streaming(aclient, seekable_issues, prefetch_pages):
+    async def collect():
+        issues = await aclient.issues.find(query='Queue: TEST', per_page=2)
+        issues.prefetch_pages = prefetch_pages
+        keys = [issue.key async for issue in issues.iter_streaming()]
+        return keys, issues
+
+    keys, issues = run(collect())
+
+    assert keys == seekable_issues
+    assert len(issues) == 0
+
+
+def test_async_export(aclient, seekable_issues):
+    async def export_rows():
+        issues = await aclient.issues.find(query='Queue: TEST', per_page=2)
+        with pytest.raises(TypeError):
+            list(export.iter_rows(issues, ['key']))
+        return [row async for row in aiter_rows(issues, ['key', 'status.key'])]
+
+    rows = run(export_rows())
+
+    assert rows == [[key, 'open'] for key in seekable_issues]
+
+
+def test_async_retries(transport, aclient):
+    transport.add('GET', api_url('/queues/TEST'), status_code=500)
+
+    with pytest.raises(OutOfRetries):
+        run(aclient.queues['TEST'])
+
+    assert len(transport.calls) == 2 + 1
+
+
+def test_async_retry_after(transport, aclient, monkeypatch):
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr(asyncio, 'sleep', sleep)
+    aclient._connection.retry_policy = RetryPolicy(retries=2, jitter=NO_JITTER)
+    transport.add('GET', api_url('/queues/TEST'), status_code=429, headers={'Retry-After': '3'})
+
+    with pytest.raises(TooManyRequests):
+        run(aclient.queues['TEST'])
+
+    assert len(transport.calls) == 2 + 1
+    assert sleeps == [3, 3]
+
+
+def test_async_concurrency_limiter(transport, aclient, fake_queue):
+    transport.add('GET', api_url('/queues/TEST'), json=fake_queue.json)
+    limiter = aclient._connection.concurrency_limiter = AdaptiveLimiter(initial_limit=2)
+
+    async def get_many():
+        return await asyncio.gather(*(aclient.queues['TEST'] for _ in range(10)))
+
+    queues = run(get_many())
+
+    assert len(queues) == 10
+    assert limiter.in_flight == 0
+
+
+def test_async_single_flight(transport, aclient, fake_queue):
+    transport.add('GET', api_url('/queues/TEST'), json=fake_queue.json)
+    aclient._connection.single_flight = True
+
+    async def get_many():
+        return await asyncio.gather(*(aclient.queues['TEST'] for _ in range(5)))
+
+    queues = run(get_many())
+
+    assert len(transport.calls) == 1
+    assert all(queue is queues[0] for queue in queues)
+
+
+def test_async_response_cache(transport, aclient, fake_queue):
+    aclient._connection.response_cache = LRUCache()
+    transport.add('GET', api_url('/queues/TEST'), json=fake_queue.json, headers={'ETag': '"v1"'})
+    run(aclient.queues['TEST'])
+
+    transport.add('GET', api_url('/queues/TEST'), status_code=304)
+    queue = run(aclient.queues['TEST'])
+
+    assert queue.key == fake_queue.json['key']
+
+
+def test_async_dictionary(transport, aclient):
+    aclient._connection.dictionary_ttl = 60
+    statuses = [{'self': api_url('/statuses/1'), 'id': 1, 'key': 'open'}]
+    transport.add('GET', api_url('/statuses/'), json=statuses)
+    for path in ('/priorities/', '/issuetypes/', '/resolutions/', '/linktypes/', '/fields/categories/'):
+        transport.add('GET', api_url(path), json=[])
+
+    async def lookup():
+        await aclient.warm_up(workers=2)
+        return await aclient.statuses['open'], await aclient.statuses.get_all()
+
+    status, all_statuses = run(lookup())
+
+    assert status.id == 1
+    assert [s.key for s in all_statuses] == ['open']
+    assert len(transport.calls) == 7
+
+
+def test_async_not_found(transport, aclient):
+    transport.add('GET', api_url('/queues/TEST'), status_code=404, json={'errorMessages': ['Not found']})
+
+    with pytest.raises(NotFound):
+        run(aclient.queues['TEST'])
+
+
+def test_dereference(transport, aclient, fake_issue, fake_queue):
+    transport.add('GET', api_url('/issues/{}'.format(fake_issue.key)), json=fake_issue.json)
+    transport.add('GET', api_url('/queues/{}'.format(fake_issue.queue)), json=fake_queue.json)
+
+    issue = run(aclient.issues[fake_issue.key])
+    with pytest.raises(ReferenceNotLoaded):
+        issue.queue.lead
+
+    queue = run(aclient.dereference(issue.queue))
+
+    assert issue.queue.lead == queue.lead
+
+
+def test_batch_dereference_rejected():
+    with pytest.raises(TrackerClientError):
+        AsyncTrackerClient(token='TEST_TOKEN', org_id='15', batch_dereference=True)
+
+
+def test_update_issue(transport, aclient, fake_issue):
+    url = api_url('/issues/{}'.format(fake_issue.key))
+    transport.add('GET', url, json=fake_issue.json)
+    transport.add('PATCH', url, json=dict(fake_issue.json, summary='New summary'))
+
+    issue = run(aclient.issues[fake_issue.key])
+    run(issue.update(summary='New summary'))
+
+    assert issue.summary == 'New summary'
+    assert json.loads(transport.calls[-1][3]) == {'summary': 'New summary'}
+
+
+def test_get_many(transport, aclient, fake_issues):
+    issues = dict((issue['key'], issue) for issue in fake_issues.json)
+    transport.add('POST', api_url('/issues/_search'), json=lambda data: [
+        issues[key] for key in data['keys'] if key in issues
+    ])
+    keys = ['MISSING-1'] + list(issues)
+
+    result = run(aclient.issues.get_many(keys, chunk_size=1, workers=4))
+
+    assert [issue.key if issue is not None else None for issue in result] == [None] + list(issues)
+    assert len(transport.calls) == len(keys) + 1
+
+
+def test_resolve(transport, aclient, fake_issues, fake_queue):
+    for issue in fake_issues.json:
+        issue['queue']['self'] = fake_queue.json['self']
+    transport.add('POST', api_url('/issues/_search'), json=fake_issues.json)
+    transport.add('GET', fake_queue.json['self'], json=fake_queue.json)
+
+    async def resolve():
+        issues = await aclient.issues.find(query='Queue: TEST')
+        await aclient.resolve(issues, attrs=['queue'])
+        return issues
+
+    issues = run(resolve())
+
+    assert all(issue.queue.name == fake_queue.json['name'] for issue in issues)
+    assert [call[1] for call in transport.calls].count(fake_queue.json['self']) == 1
+
+
+def test_fields_cache(transport, tmpdir):
+    fields_cache = FileCache(str(tmpdir))
+
+    def load_fields():
+        client = AsyncTrackerClient(token='TEST_TOKEN', org_id='15', fields_cache=fields_cache)
+        client._connection._send = transport
+        return run(client.issues.load_fields())
+
+    assert load_fields() == load_fields()
+    assert len(transport.calls) == 1
+
+
+def test_async_compressed_response(aclient):
+    body = json.dumps({'key': 'TEST'}).encode('utf-8')
+    compressed = compression.gzip(body)
+
+    class Response(object):
+        status = 200
+        reason = 'OK'
+        headers = {'Content-Encoding': 'gzip'}
+
+        async def read(self):
+            return compressed
+
+    kwargs = {'method': 'GET', 'url': api_url('/queues/TEST')}
+    response = run(aclient._connection._buffer(Response(), kwargs))
+
+    assert response.content == body
+    assert aclient._connection._wire_size(response, len(body)) == len(compressed)
+
+
+def test_async_cancelled_probe(transport, aclient, fake_queue):
+    url = api_url('/queues/TEST')
+    transport.add('GET', url, status_code=500)
+    connection = aclient._connection
+    breaker = connection.circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0)
+    limiter = connection.concurrency_limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+    key = connection._endpoint_key('GET', url)
+
+    with pytest.raises(OutOfRetries):
+        run(aclient.queues['TEST'])
+    assert breaker.state(key) == 'half-open'
+
+    # the probe waits for a slot and is cancelled
+    slot = limiter.try_acquire()
+    with pytest.raises(asyncio.TimeoutError):
+        run(asyncio.wait_for(aclient.queues['TEST'], 0.05))
+    limiter.release(slot)
+
+    transport.add('GET', url, json=fake_queue.json)
+    assert run(aclient.queues['TEST']).key == fake_queue.json['key']
+    assert breaker.state(key) == 'closed'
+
+
+async def start_server(web, app):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    await web.SockSite(runner, sock).start()
+    return runner, 'http://127.0.0.1:{}'.format(sock.getsockname()[1])
+
+
+def test_async_http(fake_issue, tmpdir):
+    web = pytest.importorskip('aiohttp.web')
+    uploads = []
+
+    async def get_fields(request):
+        return web.json_response(backend_response('fields.json'))
+
+    async def search(request):
+        assert (await request.json())['query'] == 'Queue: TEST'
+        body = compression.gzip(json.dumps([fake_issue.json]).encode('utf-8'))
+        return web.Response(body=body, content_type='application/json', headers={'Content-Encoding': 'gzip'})
+
+    async def upload(request):
+        part = await (await request.multipart()).next()
+        uploads.append((request.query['filename'], await part.read()))
+        return web.json_response({
+            'self': str(request.url.with_path('/v2/attachments/1').with_query(None)),
+            'id': '1',
+            'name': request.query['filename'],
+        })
+
+    async def main():
+        app = web.Application()
+        app.router.add_get('/v2/fields/', get_fields)
+        app.router.add_post('/v2/issues/_search', search)
+        app.router.add_post('/v2/attachments/', upload)
+        runner, base_url = await start_server(web, app)
+        try:
+            async with AsyncTrackerClient(token='TEST_TOKEN', org_id='15', base_url=base_url) as client:
+                issues = await client.issues.find(query='Queue: TEST')
+                keys = [issue.key async for issue in issues]
+                path = tmpdir.join('report.txt')
+                path.write('report')
+                attachment = await client.attachments.create(str(path))
+        finally:
+            await runner.cleanup()
+        return issues, keys, attachment
+
+    issues, keys, attachment = run(main())
+
+    assert keys == [issue.key for issue in issues] == [fake_issue.key]
+    assert attachment.name == 'report.txt'
+    assert uploads == [('report.txt', b'report')]
+
+
+def test_async_stream_retries():
+    web = pytest.importorskip('aiohttp.web')
+    statuses = [503, 200]
+
+    async def download(request):
+        status = statuses.pop(0)
+        if status != 200:
+            return web.json_response({'errorMessages': ['unavailable']}, status=status)
+        body = compression.gzip(b'x' * 100000)
+        return web.Response(body=body, headers={'Content-Encoding': 'gzip'})
+
+    async def main():
+        app = web.Application()
+        app.router.add_get('/v2/attachments/1/report.txt', download)
+        runner, base_url = await start_server(web, app)
+        try:
+            async with AsyncTrackerClient(token='TEST_TOKEN', org_id='15', base_url=base_url,
+                                          retry_policy=RetryPolicy(retries=1, jitter=NO_JITTER,
+                                                                   initial_delay=0)) as client:
+                connection = client._connection
+                return b''.join([chunk async for chunk in connection.stream('/v2/attachments/1/report.txt')])
+        finally:
+            await runner.cleanup()
+
+    assert run(main()) == b'x' * 100000
+    assert statuses == []
+
+
+def test_async_transition_invalidates_issue(transport, aclient, fake_issue):
+    issue_url = api_url('/issues/{}'.format(fake_issue.key))
+    transport.add('GET', issue_url, json=fake_issue.json)
+    transport.add('GET', issue_url + '/transitions/close', json={'self': issue_url + '/transitions/close', 'id': 'close'})
+    transport.add('POST', issue_url + '/transitions/close/_execute', json=[])
+    identity_map = aclient._connection.identity_map = LRUCache()
+
+    async def close():
+        issue = await aclient.issues[fake_issue.key]
+        identity_map.set(issue._path, issue)
+        transition = await issue.transitions['close']
+        await transition.execute()
+        return issue._path
+
+    path = run(close())
+
+    assert identity_map.get(path) is None
@@ -0,0 +1,71 @@
+# coding: utf-8
+
+import io
+import json
+
+import pytest
+
+from common.url import api_url
+
+from yandex_tracker_client.objects import Resource
+
+
+@pytest.fixture
+def issue(net_mock, client, fake_issue):
+    fake_issue.json['assignee'] = {'self': api_url('/users/1'), 'id': '1', 'display': 'User'}
+    fake_issue.json['followers'] = [{'self': api_url('/users/2'), 'id': '2', 'display': 'Follower'}]
+    fake_issue.json['tags'] = []
+    fake_issue.json['sprint'] = None
+    net_mock.get(api_url('/issues/{}'.format(fake_issue.key)), json=fake_issue.json)
+    return client.issues[fake_issue.key]
+
+
+def test_as_dict(issue, fake_issue):
+    result = issue.as_dict()
+
+    assert result['assignee'] == fake_issue.json['assignee']
+    assert result['followers'] == fake_issue.json['followers']
+    assert result['status'] == fake_issue.json['status']
+    assert type(result) is dict
+
+
+def test_as_dict_flatten_references(issue, fake_issue):
+    result = issue.as_dict(flatten_references=True)
+
+    assert result['key'] == fake_issue.key
+    assert result['assignee'] == '1'
+    assert result['followers'] == ['2']
+    assert result['status'] == fake_issue.json['status']['key']
+
+
+def test_as_dict_skip_defaults(issue):
+    result = issue.as_dict(skip_defaults=True)
+
+    assert 'tags' not in result
+    assert 'sprint' not in result
+    assert result['followers'] == issue.as_dict()['followers']
+
+
+def test_as_dict_deep(client):
+    value = leaf = {}
+    for _ in range(10000):
+        leaf['nested'] = {}
+        leaf = leaf['nested']
+    resource = Resource(client._connection, '/v2/issues/TEST-1/changelog/1', {'id': '1', 'data': value})
+
+    result = resource.as_dict()['data']
+
+    depth = 0
+    while result:
+        assert result is not value
+        result, value = result['nested'], value['nested']
+        depth += 1
+    assert depth == 10000
+
+
+@pytest.mark.parametrize('options', [{}, {'flatten_references': True}, {'skip_defaults': True}])
+def test_write_json(issue, options):
+    output = io.StringIO()
+    issue.write_json(output, sort_keys=True, **options)
+
+    assert json.loads(output.getvalue()) == issue.as_dict(**options)
@@ -0,0 +1,70 @@
+# coding: utf-8
+
+import os
+import stat
+
+import pytest
+
+from yandex_tracker_client import cache
+
+
+def test_lru_eviction():
+    lru = cache.LRUCache(maxsize=2)
+    lru.set('a', 1)
+    lru.set('b', 2)
+    lru.get('a')
+    lru.set('c', 3)
+
+    assert lru.get('a') == 1
+    assert lru.get('b') is None
+    assert lru.get('c') == 3
+    assert len(lru) == 2
+
+
+@pytest.mark.clock(cache)
+def test_lru_ttl(clock):
+    lru = cache.LRUCache(ttl=10)
+    lru.set('a', 1)
+
+    clock[0] += 5
+    assert 'a' in lru
+    clock[0] += 5
+    assert lru.get('a') is None
+
+
+def test_lru_delete():
+    lru = cache.LRUCache()
+    lru.set('a', 1)
+    lru.delete('a')
+    lru.delete('missing')
+
+    assert 'a' not in lru
+
+
+def test_file_cache(tmpdir):
+    directory = str(tmpdir.join('cache'))
+    cache.FileCache(directory).set('key', {'a': [1, 2]})
+
+    file_cache = cache.FileCache(directory)
+    assert file_cache.get('key') == {'a': [1, 2]}
+    assert file_cache.get('other') is None
+
+    file_cache.delete('key')
+    assert 'key' not in file_cache
+
+
+def test_file_cache_ttl(tmpdir):
+    cache.FileCache(str(tmpdir)).set('key', 1)
+
+    assert cache.FileCache(str(tmpdir), ttl=3600).get('key') == 1
+    assert cache.FileCache(str(tmpdir), ttl=0).get('key') is None
+
+
+def test_file_cache_default_directory(tmpdir, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir))
+    file_cache = cache.FileCache()
+    file_cache.set('key', 1)
+
+    assert file_cache.directory == str(tmpdir.join('yandex_tracker_client'))
+    assert stat.S_IMODE(os.stat(file_cache.directory).st_mode) & 0o077 == 0
+    assert file_cache.get('key') == 1
@@ -0,0 +1,114 @@
+# coding: utf-8
+
+import pytest
+from common.url import api_url
+
+from yandex_tracker_client import circuit
+from yandex_tracker_client.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from yandex_tracker_client.exceptions import CircuitOpen, OutOfRetries
+
+KEY = ('GET', '/{api_version}/queues/{id}')
+
+
+pytestmark = pytest.mark.clock(circuit)
+
+
+def fail(breaker, key=KEY, times=1):
+    for _ in range(times):
+        breaker.leave(key, breaker.enter(key), failed=True)
+
+
+def test_opens_after_threshold(clock):
+    changes = []
+    breaker = CircuitBreaker(failure_threshold=3, on_state_change=lambda key, state: changes.append(state))
+    fail(breaker, times=2)
+    assert breaker.state(KEY) == CLOSED
+
+    fail(breaker)
+    assert breaker.state(KEY) == OPEN
+    assert changes == [OPEN]
+    with pytest.raises(CircuitOpen) as error:
+        breaker.enter(KEY)
+    assert error.value.key == KEY
+    assert error.value.retry_after == 30
+
+
+def test_success_resets_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3)
+    fail(breaker, times=2)
+    breaker.leave(KEY, breaker.enter(KEY), failed=False)
+    fail(breaker, times=2)
+
+    assert breaker.state(KEY) == CLOSED
+
+
+def test_keys_are_independent(clock):
+    breaker = CircuitBreaker(failure_threshold=1)
+    fail(breaker)
+
+    assert breaker.enter(('POST', '/{api_version}/issues/')) is False
+
+
+def test_half_open_probe_closes(clock):
+    changes = []
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, probes=1,
+                             on_state_change=lambda key, state: changes.append(state))
+    fail(breaker)
+    clock[0] += 10
+
+    assert breaker.state(KEY) == HALF_OPEN
+    probe = breaker.enter(KEY)
+    assert probe is True
+    with pytest.raises(CircuitOpen):
+        breaker.enter(KEY)
+
+    breaker.leave(KEY, probe, failed=False)
+    assert breaker.state(KEY) == CLOSED
+    assert changes == [OPEN, HALF_OPEN, CLOSED]
+
+
+def test_half_open_probe_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    fail(breaker)
+    clock[0] += 10
+
+    fail(breaker)
+    assert breaker.state(KEY) == OPEN
+    clock[0] += 5
+    with pytest.raises(CircuitOpen):
+        breaker.enter(KEY)
+
+
+def test_late_response_does_not_close_open_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1)
+    probe = breaker.enter(KEY)
+    fail(breaker)
+
+    breaker.leave(KEY, probe, failed=False)
+    assert breaker.state(KEY) == OPEN
+
+
+def test_connection_fails_fast(net_mock, connection):
+    connection.retries = 10
+    connection.circuit_breaker = breaker = CircuitBreaker(failure_threshold=3)
+    net_mock.get(api_url('/queues/TEST'), status_code=500)
+    net_mock.post(api_url('/queues/TEST'), status_code=500)
+
+    with pytest.raises(CircuitOpen):
+        connection.get(api_url('/queues/TEST'))
+    assert net_mock.call_count == 3
+
+    with pytest.raises(CircuitOpen):
+        connection.get(api_url('/queues/TEST'))
+    assert net_mock.call_count == 3
+    assert breaker.state(('GET', '/{api_version}/queues/{id}')) == OPEN
+
+    # other method, other circuit
+    with pytest.raises(CircuitOpen):
+        connection.post(api_url('/queues/TEST'))
+    assert net_mock.call_count == 6
+
+    connection.circuit_breaker = CircuitBreaker(failure_threshold=100)
+    connection.retries = 1
+    with pytest.raises(OutOfRetries):
+        connection.get(api_url('/queues/TEST'))
@@ -0,0 +1,43 @@
+# coding: utf-8
+
+import pytest
+
+from yandex_tracker_client import codec
+from yandex_tracker_client.connection import encode_resource
+from yandex_tracker_client.exceptions import UnencodableValue
+
+CODECS = [codec.JSONCodec]
+if codec.orjson is not None:
+    CODECS.append(codec.OrjsonCodec)
+
+DOCUMENT = b'[{"self": "a", "inner": {"self": "b", "list": [{"x": 1}, [{"y": 2}]]}}, 3, "s"]'
+
+
+@pytest.fixture(params=CODECS, ids=lambda cls: cls.name)
+def json_codec(request):
+    return request.param()
+
+
+def test_object_hook(json_codec):
+    hooked = []
+
+    def object_hook(obj):
+        hooked.append(sorted(obj))
+        return ('hooked', obj)
+
+    decoded = json_codec.loads(DOCUMENT, object_hook=object_hook)
+
+    assert decoded == codec.JSONCodec().loads(DOCUMENT, object_hook=lambda obj: ('hooked', obj))
+    # children are hooked before their parents
+    assert hooked.index(['inner', 'self']) == len(hooked) - 1
+
+
+def test_dumps(json_codec):
+    data = {'summary': u'Привет', 'tags': ['a'], 'count': 1}
+
+    assert codec.JSONCodec().loads(json_codec.dumps(data)) == data
+
+
+def test_dumps_unencodable(json_codec):
+    with pytest.raises(UnencodableValue):
+        json_codec.dumps({'value': object()}, default=encode_resource)
@@ -1,8 +1,12 @@
 # coding: utf-8
 
 import inspect
+import re
+
+import pytest
 
 from yandex_tracker_client.settings import VERSION_V2
+from yandex_tracker_client.uriutils import VARIABLE_VALUE
 
 
 def test_url_slots():
@@ -52,3 +56,36 @@ def test_extract_url_params():
     assert coll._extract_params({'foo': 2}) == ({'id': '', 'api_version': VERSION_V2}, {}, {'foo': 2})
     assert coll._extract_params({'id': 3}) == ({'id': 3, 'api_version': VERSION_V2}, {}, {})
     assert coll._extract_params({'id': 3, 'x_org_id': 278}) == ({'id': 3, 'api_version': VERSION_V2}, {'X-ORG-ID': '278'}, {})
+
+
+
+@pytest.mark.parametrize('path', [
+    '/v2/issues/TEST-1',
+    '/v2/issues/TEST-1/comments/15',
+    '/v2/issues/TEST-1/comments',
+    '/v2/issues/TEST-1/permissions/read',
+    '/v2/users/1120000000016876',
+    '/v2/users/user@example.com',
+    '/v2/fields/categories/1',
+    '/v2/queues/TEST/localFields/field',
+    '/v2/entities/project/5',
+    '/v2/entities/project/5/links',
+    '/v2/unknown/1',
+])
+def test_match_collection(path):
+    from yandex_tracker_client.collections import CollectionMeta
+
+    matcher = CollectionMeta.matcher
+    assert matcher._match(path) is match_linear(matcher, path)
+    assert matcher.match(path) is match_linear(matcher, path)
+
+
+def match_linear(matcher, uri):
+    """Value of the first template whose regular expression matches the
+    beginning of ``uri``, as the matcher did before the trie."""
+    path = uri.strip('/')
+    for _, value, parts in matcher._patterns:
+        pattern = '/'.join(VARIABLE_VALUE if part is None else part for part in parts)
+        if re.match(pattern, path):
+            return value
+    return None
@@ -0,0 +1,99 @@
+# coding: utf-8
+
+import json
+import zlib
+
+from common.issues import FakeIssuesCollection
+from common.url import api_url
+
+from yandex_tracker_client import compression
+from yandex_tracker_client.compression import ByteCounter, TransferSizes
+
+
+def test_accept_encoding(net_mock, connection):
+    url = api_url('/queues/TEST')
+    net_mock.get(url, json={'key': 'TEST'})
+
+    connection.get(url)
+
+    assert net_mock.last_request.headers['Accept-Encoding'] == compression.accept_encoding()
+
+
+def test_small_body_is_not_compressed(net_mock, connection):
+    connection.compress_threshold = 1024
+    url = api_url('/issues/')
+    net_mock.post(url, json={'key': 'TEST-1'})
+
+    connection.post(url, data={'summary': 'short'})
+
+    assert 'Content-Encoding' not in net_mock.last_request.headers
+    assert net_mock.last_request.json() == {'summary': 'short'}
+
+
+def test_large_body_is_compressed(net_mock, connection):
+    connection.compress_threshold = 1024
+    url = api_url('/bulkchange/_update')
+    data = {'issues': ['TEST-{}'.format(number) for number in range(1000)]}
+    net_mock.post(url, json={'id': '1'})
+
+    connection.post(url, data=data)
+
+    request = net_mock.last_request
+    assert request.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(zlib.decompress(request.body, 16 + zlib.MAX_WBITS).decode('utf-8')) == data
+
+
+def test_metrics_hook(net_mock, connection):
+    counter = connection.metrics_hook = ByteCounter()
+    connection.compress_threshold = 0
+    url = api_url('/issues/_search')
+    body = json.dumps([{'key': 'TEST-{}'.format(number)} for number in range(100)]).encode('utf-8')
+    compressed = compression.gzip(body)
+    net_mock.post(url, content=compressed, headers={'Content-Encoding': 'gzip'})
+
+    issues = connection.post(url, data={'query': 'Queue: TEST'})
+
+    assert len(issues) == 100
+    request_body = zlib.decompress(net_mock.last_request.body, 16 + zlib.MAX_WBITS)
+    assert counter.calls == 1
+    assert counter.request_bytes == len(request_body)
+    assert counter.request_wire_bytes == len(net_mock.last_request.body)
+    assert counter.response_bytes == len(body)
+    assert counter.response_wire_bytes == len(compressed)
+    assert counter.saved_bytes > 0
+
+
+def test_metrics_hook_arguments(net_mock, connection):
+    calls = []
+    connection.metrics_hook = lambda method, url, sizes: calls.append((method, url, sizes))
+    url = api_url('/queues/TEST')
+    net_mock.get(url, content=b'{"key": "TEST"}')
+
+    connection.get(url)
+
+    assert calls == [('GET', url, TransferSizes(0, 0, 15, 15))]
+
+
+def test_decoder_passes_unknown_encodings():
+    assert compression.decode(b'data', 'identity') == b'data'
+    assert compression.decode(b'data', None) == b'data'
+    assert compression.decode(compression.gzip(b'data'), 'gzip') == b'data'
+    assert compression.decode(zlib.compress(b'data'), 'deflate') == b'data'
+
+
+def test_paginated_search_with_compression(net_mock, client):
+    client._connection.compress_threshold = 0
+    issues = FakeIssuesCollection(count=4).json
+    for page in (1, 2):
+        url = api_url('/issues/_search?perPage=2') if page == 1 else api_url('/issues/_search?perPage=2&page=2')
+        headers = {}
+        if page == 1:
+            headers['Link'] = '<{}>; rel="next"'.format(api_url('/issues/_search?perPage=2&page=2'))
+        net_mock.post(url, json=issues[(page - 1) * 2:page * 2], headers=headers)
+
+    found = client.issues.find(query='Queue: TEST', per_page=2)
+
+    assert [issue.key for issue in found] == [issue['key'] for issue in issues]
+    request = net_mock.last_request
+    assert request.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(compression.decode(request.body, 'gzip').decode('utf-8'))['query'] == 'Queue: TEST'
@@ -0,0 +1,130 @@
+# coding: utf-8
+
+import threading
+
+import pytest
+from common.url import api_url
+
+from yandex_tracker_client import concurrency
+from yandex_tracker_client.concurrency import AdaptiveLimiter
+
+
+pytestmark = pytest.mark.clock(concurrency)
+
+
+def fill(limiter):
+    slots = []
+    slot = limiter.try_acquire()
+    while slot is not None:
+        slots.append(slot)
+        slot = limiter.try_acquire()
+    return slots
+
+
+def test_limit_is_enforced():
+    limiter = AdaptiveLimiter(initial_limit=3)
+    slots = fill(limiter)
+
+    assert len(slots) == 3
+    assert limiter.in_flight == 3
+    limiter.release(slots[0])
+    assert limiter.try_acquire() is not None
+
+
+def test_increase_per_round_trip(clock):
+    changes = []
+    limiter = AdaptiveLimiter(initial_limit=4, metrics_hook=lambda limit, reason: changes.append((limit, reason)))
+
+    for _ in range(2):
+        slots = fill(limiter)
+        clock[0] += 0.1
+        for slot in slots:
+            limiter.release(slot)
+
+    assert limiter.limit == 5
+    assert changes == [(5, 'increase')]
+
+
+def test_idle_limit_does_not_grow(clock):
+    limiter = AdaptiveLimiter(initial_limit=10)
+    for _ in range(100):
+        slot = limiter.acquire()
+        clock[0] += 0.1
+        limiter.release(slot)
+
+    assert limiter.limit == 10
+
+
+def test_decrease_once_per_burst(clock):
+    changes = []
+    limiter = AdaptiveLimiter(initial_limit=8, metrics_hook=lambda limit, reason: changes.append((limit, reason)))
+    slots = fill(limiter)
+    clock[0] += 0.1
+
+    for slot in slots:
+        limiter.release(slot, dropped=True)
+
+    assert limiter.limit == 4
+    assert changes == [(4, 'decrease')]
+
+    clock[0] += 0.1
+    limiter.release(limiter.acquire(), dropped=True)
+    assert limiter.limit == 2
+
+
+def test_min_and_max_limit(clock):
+    limiter = AdaptiveLimiter(initial_limit=2, min_limit=2, max_limit=3)
+    limiter.release(limiter.acquire(), dropped=True)
+    assert limiter.limit == 2
+
+    for _ in range(10):
+        slots = fill(limiter)
+        clock[0] += 0.1
+        for slot in slots:
+            limiter.release(slot)
+    assert limiter.limit == 3
+
+
+def test_latency_spike(clock):
+    limiter = AdaptiveLimiter(initial_limit=4, latency_tolerance=2, smoothing=0.2)
+    for latency in (0.1, 0.1, 0.5):
+        slot = limiter.acquire()
+        clock[0] += latency
+        limiter.release(slot)
+    assert limiter.limit == 4
+
+    slot = limiter.acquire()
+    clock[0] += 0.5
+    limiter.release(slot)
+    assert limiter.limit == 2
+
+
+def test_acquire_waits_for_release():
+    limiter = AdaptiveLimiter(initial_limit=1)
+    slot = limiter.acquire()
+    acquired = threading.Event()
+
+    def acquire():
+        limiter.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    assert not acquired.wait(0.05)
+
+    limiter.release(slot)
+    thread.join()
+    assert acquired.is_set()
+
+
+def test_connection_reports_throttling(net_mock, connection):
+    connection.retries = 0
+    connection.concurrency_limiter = limiter = AdaptiveLimiter(initial_limit=10)
+    url = api_url('/myself')
+    net_mock.get(url, status_code=429)
+
+    with pytest.raises(Exception):
+        connection.get(url)
+
+    assert limiter.limit == 5
+    assert limiter.in_flight == 0
@@ -1,8 +1,14 @@
 # coding: utf-8
+import pickle
+import threading
+import time
+
 import pytest
 from common.url import api_url
 
+from yandex_tracker_client.connection import Connection
 from yandex_tracker_client.exceptions import OutOfRetries, InvalidJSONResponse
+from yandex_tracker_client.parallel import SingleFlight
 
 
 def test_retries(net_mock, connection):
@@ -43,3 +49,154 @@ def test_invalid_json_response(net_mock, connection):
 
     with pytest.raises(InvalidJSONResponse):
         connection.get(url)
+
+
+def test_pool_options():
+    connection = Connection(token='TEST_TOKEN', org_id='15', pool_maxsize=64, pool_block=True)
+
+    adapter = connection.session.get_adapter(api_url('/issues/'))
+
+    assert adapter._pool_maxsize == 64
+    assert adapter._pool_block is True
+
+
+def test_session_per_thread():
+    connection = Connection(token='TEST_TOKEN', org_id='15', session_per_thread=True)
+    sessions = []
+
+    threads = [
+        threading.Thread(target=lambda: sessions.append(connection.session))
+        for _ in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert connection.session is connection.session
+    assert len({id(session) for session in sessions + [connection.session]}) == 3
+    assert all(session.headers['Authorization'] == 'OAuth TEST_TOKEN' for session in sessions)
+
+
+@pytest.mark.parametrize('url, path', [
+    (api_url('/users/1'), '/v2/users/1'),
+    (api_url('/users/1?expand=all'), '/v2/users/1'),
+    ('https://tracker.example.com/v2/users/1', '/v2/users/1'),
+])
+def test_decode_reference_path(net_mock, connection, url, path):
+    net_mock.get(api_url('/myself'), json={'self': url, 'assignee': {'self': url}})
+
+    myself = connection.get(api_url('/myself'))
+
+    assert myself._path == path
+    assert myself.assignee._path == path
+
+
+def test_single_flight_shares_result():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return object()
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', load)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do('key', load))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5 and all(result is results[0] for result in results)
+    assert len(flight) == 0
+
+    flight.do('key', load)
+    assert len(calls) == 2
+
+
+def test_single_flight_shares_error():
+    flight = SingleFlight()
+    release = threading.Event()
+    errors = []
+
+    def fail():
+        release.wait(5)
+        raise ValueError('boom')
+
+    def call():
+        try:
+            flight.do('key', fail)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3
+    assert len(flight) == 0
+
+
+def test_connection_coalesces_gets(net_mock, connection):
+    connection.single_flight = True
+    release = threading.Event()
+
+    def respond(request, context):
+        release.wait(5)
+        return {'key': 'TEST'}
+
+    url = api_url('/queues/TEST')
+    net_mock.get(url, json=respond)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(connection.get(url))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert net_mock.call_count == 1
+    assert len(results) == 5 and all(result is results[0] for result in results)
+
+    # different params are different requests
+    connection.get(url, params={'expand': 'projects'})
+    assert net_mock.call_count == 2
+
+
+def test_single_flight_key(connection):
+    connection.single_flight = True
+    url = api_url('/queues/TEST')
+
+    assert connection._single_flight_key('GET', url, {'a': 1}, None, None, None, {}) == \
+        connection._single_flight_key('GET', url + '?a=1', None, None, None, None, {})
+    assert connection._single_flight_key('POST', url, None, None, None, None, {}) is None
+    assert connection._single_flight_key('GET', url, None, None, None, None, {'stream': True}) is None
+
+
+@pytest.mark.parametrize('single_flight', [False, True])
+def test_pickle_resource(net_mock, connection, fake_queue, single_flight):
+    connection.single_flight = single_flight
+    url = api_url('/queues/TEST')
+    net_mock.get(url, json=fake_queue.json)
+    queue = connection.get(url)
+
+    restored = pickle.loads(pickle.dumps(queue))
+
+    assert restored.key == queue.key
+    assert restored._path == queue._path
+    assert len(restored._connection._in_flight) == 0
@@ -0,0 +1,85 @@
+# coding: utf-8
+
+import pytest
+from common.url import api_url
+
+from yandex_tracker_client import TrackerClient
+from yandex_tracker_client import collections
+from yandex_tracker_client.exceptions import TrackerClientError
+
+
+def status(id, key, name):
+    return {'self': api_url('/statuses/{}'.format(id)), 'id': id, 'key': key, 'name': name}
+
+
+STATUSES = [status(1, 'open', 'Open'), status(2, 'inProgress', 'In progress'), status(3, 'closed', 'Closed')]
+
+
+@pytest.fixture
+def cached_client():
+    return TrackerClient(token='TEST_TOKEN', org_id='15', dictionary_ttl=60)
+
+
+pytestmark = pytest.mark.clock(collections)
+
+
+def test_lookup_without_requests(net_mock, cached_client, clock):
+    net_mock.get(api_url('/statuses/'), json=STATUSES)
+
+    assert [s.key for s in cached_client.statuses.get_all()] == ['open', 'inProgress', 'closed']
+    assert cached_client.statuses['inProgress'].id == 2
+    assert cached_client.statuses.get(2).key == 'inProgress'
+    assert cached_client.statuses.get('2').key == 'inProgress'
+    assert cached_client.statuses.get('Closed').key == 'closed'
+    assert net_mock.call_count == 1
+
+
+def test_expiry(net_mock, cached_client, clock):
+    net_mock.get(api_url('/statuses/'), json=STATUSES)
+    cached_client.statuses.get_all()
+
+    clock[0] += 59
+    cached_client.statuses.get('open')
+    assert net_mock.call_count == 1
+
+    clock[0] += 1
+    cached_client.statuses.get('open')
+    assert net_mock.call_count == 2
+
+
+def test_unknown_key_asks_api(net_mock, cached_client):
+    net_mock.get(api_url('/statuses/'), json=STATUSES)
+    net_mock.get(api_url('/statuses/new'), json=status(4, 'new', 'New'))
+
+    assert cached_client.statuses['new'].id == 4
+    assert net_mock.call_count == 2
+
+
+def test_params_bypass_copy(net_mock, cached_client):
+    net_mock.get(api_url('/statuses/'), json=STATUSES)
+
+    cached_client.statuses.get_all(localized=False)
+    cached_client.statuses.get_all(localized=False)
+    assert net_mock.call_count == 2
+
+
+def test_disabled_by_default(net_mock, client):
+    net_mock.get(api_url('/statuses/'), json=STATUSES)
+
+    client.statuses.get_all()
+    client.statuses.get_all()
+    assert net_mock.call_count == 2
+    with pytest.raises(TrackerClientError):
+        client.warm_up()
+
+
+def test_warm_up(net_mock):
+    net_mock.get(api_url('/statuses/'), json=STATUSES)
+    for path in ('/priorities/', '/issuetypes/', '/resolutions/', '/linktypes/', '/fields/', '/fields/categories/'):
+        net_mock.get(api_url(path), json=[])
+
+    client = TrackerClient(token='TEST_TOKEN', org_id='15', dictionary_ttl=60, warm_up=4)
+    assert net_mock.call_count == 7
+
+    assert client.statuses['open'].name == 'Open'
+    assert net_mock.call_count == 7
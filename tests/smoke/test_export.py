@@ -0,0 +1,103 @@
+# coding: utf-8
+
+import io
+import json
+
+import pytest
+
+from common.issues import FakeIssuesCollection
+from common.url import api_url
+
+from yandex_tracker_client import TrackerClient, export
+
+FIELDS = ['key', 'status.key', 'assignee', 'assignee.display', 'followers.id', 'missing.field']
+
+
+@pytest.fixture
+def issues_json(net_mock):
+    issues = FakeIssuesCollection(count=5).json
+    for num, issue in enumerate(issues):
+        issue['assignee'] = {'self': api_url('/users/{}'.format(num)), 'id': str(num), 'display': 'User {}'.format(num)}
+        issue['followers'] = [
+            {'self': api_url('/users/{}'.format(uid)), 'id': str(uid), 'display': 'User {}'.format(uid)}
+            for uid in range(num)
+        ]
+    next_link = '<{}>; rel="next"'.format(api_url('/issues/_search?page=2'))
+    net_mock.post(api_url('/issues/_search'), json=issues[:2], headers={'Link': next_link})
+    net_mock.post(api_url('/issues/_search?page=2'), json=issues[2:])
+    return issues
+
+
+def expected_rows(issues):
+    return [
+        [
+            issue['key'],
+            issue['status']['key'],
+            issue['assignee']['id'],
+            issue['assignee']['display'],
+            [follower['id'] for follower in issue['followers']],
+            None,
+        ]
+        for issue in issues
+    ]
+
+
+def test_iter_rows(client, issues_json):
+    issues = client.issues.find(query='Queue: TEST')
+
+    assert list(export.iter_rows(issues, FIELDS)) == expected_rows(issues_json)
+    # paginated results are consumed
+    assert list(issues) == []
+
+
+def test_iter_batches(client, issues_json):
+    issues = client.issues.find(query='Queue: TEST')
+
+    batches = list(export.iter_batches(issues, ['key', 'status.key'], batch_size=2))
+
+    assert [len(batch['key']) for batch in batches] == [2, 2, 1]
+    assert sum((batch['key'] for batch in batches), []) == [issue['key'] for issue in issues_json]
+
+
+def test_write_csv(client, issues_json):
+    output = io.StringIO() if str is not bytes else io.BytesIO()
+    export.write_csv(client.issues.find(query='Queue: TEST'), FIELDS, output)
+
+    lines = output.getvalue().splitlines()
+    assert lines[0] == ','.join(FIELDS)
+    assert lines[3].split(',', 3)[:3] == [issues_json[2]['key'], issues_json[2]['status']['key'], '2']
+    assert lines[3].endswith('User 2,"0,1",')
+
+
+def test_write_jsonl(client, issues_json):
+    output = io.StringIO()
+    export.write_jsonl(client.issues.find(query='Queue: TEST'), FIELDS, output)
+
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert rows == [dict(zip(FIELDS, row)) for row in expected_rows(issues_json)]
+
+
+def test_record_batches(client, issues_json):
+    pyarrow = pytest.importorskip('pyarrow')
+
+    batches = list(export.iter_record_batches(client.issues.find(query='Queue: TEST'), FIELDS, batch_size=3))
+    table = pyarrow.Table.from_batches(batches)
+
+    assert table.num_rows == len(issues_json)
+    assert table.column('followers.id').to_pylist() == [row[4] for row in expected_rows(issues_json)]
+
+
+def test_to_pandas(client, issues_json):
+    pytest.importorskip('pandas')
+
+    frame = export.to_pandas(client.issues.find(query='Queue: TEST'), FIELDS, batch_size=2)
+
+    assert list(frame.columns) == FIELDS
+    assert list(frame['status.key']) == [issue['status']['key'] for issue in issues_json]
+
+
+def test_iter_rows_lazy(issues_json):
+    client = TrackerClient(token='TEST_TOKEN', org_id='15', lazy_decode=True)
+    issues = client.issues.find(query='Queue: TEST')
+
+    assert list(export.iter_rows(issues, FIELDS)) == expected_rows(issues_json)
@@ -0,0 +1,137 @@
+# coding: utf-8
+
+import gc
+import threading
+import weakref
+
+import pytest
+
+from common.issues import FakeIssuesCollection
+from common.url import api_url
+
+from yandex_tracker_client import parallel
+from yandex_tracker_client.exceptions import NotFound
+
+PER_PAGE = 2
+PAGES = 4
+
+
+@pytest.fixture
+def paginated_issues(net_mock):
+    issues = FakeIssuesCollection(count=PER_PAGE * PAGES).json
+    headers = {
+        'X-Total-Count': str(len(issues)),
+        'X-Total-Pages': str(PAGES),
+    }
+    for page in range(1, PAGES + 1):
+        links = ['<{}>; rel="seek"'.format(api_url('/issues/_search?perPage=2{&page}'))]
+        if page < PAGES:
+            links.append('<{}>; rel="next"'.format(api_url('/issues/_search?perPage=2&page={}'.format(page + 1))))
+        net_mock.post(
+            api_url('/issues/_search?perPage=2') if page == 1 else api_url('/issues/_search?perPage=2&page={}'.format(page)),
+            json=issues[(page - 1) * PER_PAGE:page * PER_PAGE],
+            headers=dict(headers, Link=', '.join(links)),
+        )
+    return [issue['key'] for issue in issues]
+
+
+def test_iter(client, paginated_issues):
+    issues = client.issues.find(query='Queue: TEST', per_page=PER_PAGE)
+
+    assert [issue.key for issue in issues] == paginated_issues
+
+
+@pytest.mark.parametrize('workers', [1, 3, 8])
+def test_iter_parallel(client, paginated_issues, workers):
+    issues = client.issues.find(query='Queue: TEST', per_page=PER_PAGE)
+
+    assert len(issues) == len(paginated_issues)
+    assert [issue.key for issue in issues.iter_parallel(workers=workers)] == paginated_issues
+
+
+def test_iter_parallel_unordered(client, paginated_issues):
+    issues = client.issues.find(query='Queue: TEST', per_page=PER_PAGE)
+
+    keys = [issue.key for issue in issues.iter_parallel(workers=3, ordered=False)]
+
+    assert sorted(keys) == sorted(paginated_issues)
+
+
+def test_iter_parallel_error(net_mock, client, paginated_issues):
+    net_mock.post(api_url('/issues/_search?perPage=2&page=3'), status_code=404)
+    issues = client.issues.find(query='Queue: TEST', per_page=PER_PAGE)
+
+    keys = []
+    with pytest.raises(NotFound):
+        for issue in issues.iter_parallel(workers=3):
+            keys.append(issue.key)
+
+    assert keys == paginated_issues[:2 * PER_PAGE]
+
+
+def test_imap_lookahead():
+    started = []
+
+    def func(arg):
+        started.append(arg)
+        return arg * 2
+
+    results = parallel.imap(func, range(100), workers=2, lookahead=3)
+
+    assert next(results) == 0
+    assert len(started) <= 4
+    assert list(results) == [arg * 2 for arg in range(1, 100)]
+
+
+def test_iter_prefetch(client, paginated_issues):
+    issues = client.issues.find(query='Queue: TEST', per_page=PER_PAGE)
+    issues.prefetch_pages = 2
+
+    assert [issue.key for issue in issues] == paginated_issues
+
+
+def test_prefetch_runs_ahead():
+    produced = threading.Event()
+
+    def produce():
+        yield 1
+        yield 2
+        produced.set()
+        yield 3
+
+    items = parallel.prefetch(produce(), depth=2)
+
+    assert next(items) == 1
+    assert produced.wait(5)
+    assert list(items) == [2, 3]
+
+
+def test_prefetch_error():
+    def produce():
+        yield 1
+        raise ValueError
+
+    items = parallel.prefetch(produce())
+
+    assert next(items) == 1
+    with pytest.raises(ValueError):
+        next(items)
+
+
+def test_iter_streaming(client, paginated_issues):
+    issues = client.issues.find(query='Queue: TEST', per_page=PER_PAGE)
+    refs = []
+    released = []
+
+    for issue in issues.iter_streaming():
+        refs.append(weakref.ref(issue))
+        if len(refs) == 2 * PER_PAGE + 1:
+            gc.collect()
+            released = [ref() is None for ref in refs[:PER_PAGE]]
+    del issue
+    gc.collect()
+
+    assert len(refs) == len(paginated_issues)
+    assert all(released)
+    assert all(ref() is None for ref in refs)
+    assert list(issues) == []
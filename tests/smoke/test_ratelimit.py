@@ -0,0 +1,112 @@
+# coding: utf-8
+
+import multiprocessing
+import os
+import stat
+import threading
+import time
+
+import pytest
+from common.url import api_url
+
+from yandex_tracker_client import ratelimit
+from yandex_tracker_client.ratelimit import FileTokenBucket, TokenBucket
+
+
+pytestmark = pytest.mark.clock(ratelimit)
+
+
+def test_burst_then_rate(clock):
+    bucket = TokenBucket(rate=10, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+
+    clock[0] += 1
+    assert bucket.reserve() == 0
+
+
+def test_refill_is_capped_by_burst(clock):
+    bucket = TokenBucket(rate=10, burst=2)
+    clock[0] += 60
+
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, pytest.approx(0.1)]
+
+
+def test_invalid_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_threads_share_bucket(clock):
+    bucket = TokenBucket(rate=100, burst=1)
+    waits = []
+
+    def reserve():
+        for _ in range(50):
+            waits.append(bucket.reserve())
+
+    threads = [threading.Thread(target=reserve) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # every token is handed out once: waits are 0, 0.01, ..., 1.99
+    assert sorted(round(wait * 100) for wait in waits) == list(range(200))
+
+
+def reserve_many(path, count, queue):
+    bucket = FileTokenBucket(rate=1, burst=1, path=path)
+    queue.put([bucket.reserve() for _ in range(count)])
+
+
+def test_file_bucket_shared_between_processes(tmpdir):
+    path = str(tmpdir.join('bucket'))
+    queue = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=reserve_many, args=(path, 10, queue)) for _ in range(3)]
+    for process in processes:
+        process.start()
+    waits = sorted(sum((queue.get(timeout=10) for _ in processes), []))
+    for process in processes:
+        process.join()
+
+    # 30 tokens at 1 per second: the last one is ~29 seconds away
+    assert waits[0] == 0
+    assert 27 < waits[-1] <= 29
+    assert all(0.5 < b - a < 1.5 for a, b in zip(waits, waits[1:]))
+
+
+def test_file_bucket_recovers_from_garbage(tmpdir):
+    path = tmpdir.join('bucket')
+    path.write('garbage')
+
+    assert FileTokenBucket(rate=1, path=str(path)).reserve() == 0
+
+
+def test_file_bucket_requires_path():
+    with pytest.raises(ValueError):
+        FileTokenBucket(rate=1)
+
+
+def test_file_bucket_private_file(tmpdir):
+    path = tmpdir.join('bucket')
+    FileTokenBucket(rate=1, path=str(path)).reserve()
+
+    assert stat.S_IMODE(os.stat(str(path)).st_mode) & 0o077 == 0
+
+
+def test_connection_waits_for_token(net_mock, connection, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    connection.rate_limiter = TokenBucket(rate=2, burst=1)
+    url = api_url('/myself')
+    net_mock.get(url, json={'login': 'me'})
+
+    for _ in range(3):
+        connection.get(url)
+
+    assert net_mock.call_count == 3
+    assert len(sleeps) == 2
+    assert all(0 < delay <= 1 for delay in sleeps)
@@ -0,0 +1,174 @@
+# coding: utf-8
+
+import pytest
+
+from common.issues import FakeIssuesCollection
+from common.url import api_url
+
+from yandex_tracker_client import TrackerClient
+from yandex_tracker_client.cache import LRUCache
+
+USERS = ['1120000000006155', '1120000000006156']
+
+
+@pytest.fixture
+def issues_with_users(net_mock):
+    issues = FakeIssuesCollection(count=6).json
+    for num, issue in enumerate(issues):
+        uid = USERS[num % len(USERS)]
+        issue['assignee'] = {'self': api_url('/users/' + uid), 'id': uid, 'display': 'User ' + uid}
+        issue['parent'] = {'self': api_url('/issues/PARENT-1'), 'key': 'PARENT-1', 'display': 'Parent'}
+    for uid in USERS:
+        net_mock.get(api_url('/users/' + uid), json={
+            'self': api_url('/users/' + uid), 'uid': uid, 'email': uid + '@example.com',
+        })
+    net_mock.post(api_url('/issues/_search'), json=issues)
+    return issues
+
+
+def user_requests(net_mock):
+    return [request for request in net_mock.request_history if '/users/' in request.url]
+
+
+def test_resolve(net_mock, client, issues_with_users):
+    issues = client.issues.find(query='Queue: TEST')
+
+    resolved = client.resolve(issues, attrs=['assignee'], workers=2)
+
+    assert len(resolved) == len(USERS)
+    assert len(user_requests(net_mock)) == len(USERS)
+    assert [issue.assignee.email for issue in issues] == [
+        issue['assignee']['id'] + '@example.com' for issue in issues_with_users
+    ]
+    assert len(user_requests(net_mock)) == len(USERS)
+
+
+def test_resolve_issues_by_search(net_mock, client, issues_with_users):
+    issues = client.issues.find(query='Queue: TEST')
+    net_mock.post(api_url('/issues/_search'), json=[
+        {'self': api_url('/issues/PARENT-1'), 'key': 'PARENT-1', 'summary': 'Parent issue'},
+    ])
+
+    client.resolve([issue.parent for issue in issues])
+
+    assert all(issue.parent.summary == 'Parent issue' for issue in issues)
+    assert not [request for request in net_mock.request_history if '/issues/PARENT-1' in request.url]
+
+
+def test_batch_dereference(net_mock, issues_with_users):
+    client = TrackerClient(token='TEST_TOKEN', org_id='15', batch_dereference=True)
+    issues = client.issues.find(query='Queue: TEST')
+
+    emails = [issue.assignee.email for issue in issues]
+
+    assert emails == [issue['assignee']['id'] + '@example.com' for issue in issues_with_users]
+    assert len(user_requests(net_mock)) == len(USERS)
+    assert not [request for request in net_mock.request_history if 'PARENT' in request.url]
+
+
+def test_identity_map(net_mock, issues_with_users):
+    client = TrackerClient(token='TEST_TOKEN', org_id='15', identity_map=LRUCache(maxsize=100, ttl=60))
+    issues = client.issues.find(query='Queue: TEST')
+
+    assignees = [issue.assignee for issue in issues]
+    targets = [assignee._dereference() for assignee in assignees]
+
+    assert len(user_requests(net_mock)) == len(USERS)
+    assert targets[0] is targets[2]
+
+
+def test_identity_map_invalidation(net_mock, issues_with_users):
+    client = TrackerClient(token='TEST_TOKEN', org_id='15', identity_map=LRUCache(maxsize=100))
+    issues = client.issues.find(query='Queue: TEST')
+    user = issues[0].assignee._dereference()
+    net_mock.patch(api_url(user._path[len('/v2'):]), json=dict(user._value, email='new@example.com'))
+
+    user.update(email='new@example.com')
+
+    assert issues[2].assignee.email == USERS[0] + '@example.com'
+    assert len(user_requests(net_mock)) == 3
+
+
+@pytest.fixture
+def lazy_client():
+    return TrackerClient(token='TEST_TOKEN', org_id='15', lazy_decode=True)
+
+
+def test_lazy_decode(net_mock, lazy_client, client, issues_with_users):
+    lazy_issues = list(lazy_client.issues.find(query='Queue: TEST'))
+    issue = lazy_issues[0]
+
+    assert issue.key == issues_with_users[0]['key']
+    assert issue.assignee.id == USERS[0]
+    # only accessed fields are decoded
+    assert isinstance(issue._lazy.raw['parent'], dict)
+    assert issue.tags == []
+
+    issues = list(client.issues.find(query='Queue: TEST'))
+    for lazy, eager in zip(lazy_issues, issues):
+        lazy_dict, eager_dict = lazy.as_dict(), eager.as_dict()
+        assert all(lazy_dict[key] == eager_dict[key] for key in issues_with_users[0])
+    assert issue._lazy is None
+
+
+def test_lazy_decode_local_fields(net_mock, lazy_client, fake_issue):
+    net_mock.get(api_url('/issues/{}'.format(fake_issue.key)), json=fake_issue.json)
+    issue = lazy_client.issues[fake_issue.key]
+
+    assert issue.description == 'Empty description'
+    assert issue.localTestField == 'local_field_value'
+    assert issue.local_description == 'local_description'
+
+
+def test_lazy_decode_update_local_field(net_mock, lazy_client, fake_issue):
+    url = api_url('/issues/{}'.format(fake_issue.key))
+    net_mock.get(url, json=fake_issue.json)
+    net_mock.patch(url, json=fake_issue.json)
+    issue = lazy_client.issues[fake_issue.key]
+
+    issue.update(localTestField='new_local_field_value')
+
+    real_request = net_mock.request_history[1].json()
+    assert real_request == {'6063181a59590573909db929--localTestField': 'new_local_field_value'}
+    assert '_pyClientLocalMapUpdate=6063181a59590573909db929--localTestField' in net_mock.request_history[1].url
+
+
+def test_lazy_decode_resolve(net_mock, lazy_client, issues_with_users):
+    issues = list(lazy_client.issues.find(query='Queue: TEST'))
+    lazy_client.resolve(issues, attrs=['assignee'])
+
+    assert [issue.assignee.email for issue in issues] == [
+        USERS[num % len(USERS)] + '@example.com' for num in range(len(issues))
+    ]
+    assert len(user_requests(net_mock)) == len(USERS)
+
+
+def test_compact_objects(net_mock, client, issues_with_users):
+    issue = list(client.issues.find(query='Queue: TEST'))[0]
+    assignee = issue.assignee
+
+    assert type(issue).__dictoffset__ == type(assignee).__dictoffset__ == 0
+    assert assignee._connection is client._connection
+    assert assignee._local_fields_map is None
+
+
+def test_identity_map_transition(net_mock):
+    client = TrackerClient(token='TEST_TOKEN', org_id='15', identity_map=LRUCache(maxsize=100))
+    parent_url = api_url('/issues/TEST-1')
+
+    def issue(key, status, **fields):
+        return dict(fields, self=api_url('/issues/' + key), key=key, status={
+            'self': api_url('/statuses/' + status), 'key': status,
+        })
+
+    net_mock.get(api_url('/issues/TEST-2'), json=issue('TEST-2', 'open', parent={'self': parent_url, 'key': 'TEST-1'}))
+    net_mock.get(parent_url, [{'json': issue('TEST-1', 'open')}, {'json': issue('TEST-1', 'closed')}])
+    net_mock.get(parent_url + '/transitions/close', json={'self': parent_url + '/transitions/close', 'id': 'close'})
+    net_mock.post(parent_url + '/transitions/close/_execute', json=[])
+
+    subtask = client.issues['TEST-2']
+    assert subtask.parent.status.key == 'open'
+
+    subtask.parent.transitions['close'].execute()
+
+    assert client.issues['TEST-2'].parent.status.key == 'closed'
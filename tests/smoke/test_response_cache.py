@@ -0,0 +1,136 @@
+# coding: utf-8
+
+import json
+
+import pytest
+from common.url import api_url
+
+from yandex_tracker_client.cache import FileCache, LRUCache
+from yandex_tracker_client.exceptions import TrackerServerError
+
+
+@pytest.fixture(params=['memory', 'disk'])
+def response_cache(request, tmpdir):
+    if request.param == 'memory':
+        return LRUCache()
+    return FileCache(str(tmpdir))
+
+
+def test_not_modified(net_mock, connection, response_cache, fake_queue):
+    connection.response_cache = response_cache
+    url = api_url('/queues/TEST')
+    net_mock.get(url, [
+        {'json': fake_queue.json, 'headers': {'ETag': '"v1"', 'X-Total-Count': '1'}},
+        {'status_code': 304, 'headers': {'ETag': '"v1"'}},
+    ])
+
+    first = connection.get(url)
+    second = connection.get(url)
+
+    assert net_mock.request_history[1].headers['If-None-Match'] == '"v1"'
+    assert second.key == first.key == fake_queue.json['key']
+    assert second._path == first._path
+
+
+def test_last_modified(net_mock, connection, response_cache, fake_queue):
+    connection.response_cache = response_cache
+    url = api_url('/queues/TEST')
+    date = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    net_mock.get(url, [
+        {'json': fake_queue.json, 'headers': {'Last-Modified': date}},
+        {'status_code': 304},
+    ])
+
+    connection.get(url)
+    queue = connection.get(url)
+
+    assert net_mock.request_history[1].headers['If-Modified-Since'] == date
+    assert 'If-None-Match' not in net_mock.request_history[1].headers
+    assert queue.key == fake_queue.json['key']
+
+
+def test_modified(net_mock, connection, response_cache):
+    connection.response_cache = response_cache
+    url = api_url('/queues/TEST')
+    net_mock.get(url, [
+        {'json': {'key': 'TEST', 'name': 'old'}, 'headers': {'ETag': '"v1"'}},
+        {'json': {'key': 'TEST', 'name': 'new'}, 'headers': {'ETag': '"v2"'}},
+        {'status_code': 304},
+    ])
+
+    assert connection.get(url)['name'] == 'old'
+    assert connection.get(url)['name'] == 'new'
+    assert connection.get(url)['name'] == 'new'
+    assert net_mock.request_history[2].headers['If-None-Match'] == '"v2"'
+
+
+def test_not_cached(net_mock, connection, response_cache):
+    connection.response_cache = response_cache
+    url = api_url('/queues/TEST')
+    net_mock.get(url, json={'key': 'TEST'})
+    net_mock.post(url, json={'key': 'TEST'}, headers={'ETag': '"v1"'})
+
+    connection.get(url)
+    connection.post(url)
+    connection.get(url)
+
+    assert 'If-None-Match' not in net_mock.request_history[2].headers
+
+
+def test_credentials_are_not_stored(net_mock, connection, tmpdir):
+    connection.response_cache = FileCache(str(tmpdir))
+    url = api_url('/queues/TEST')
+    net_mock.get(url, json={'key': 'TEST'}, headers={'ETag': '"v1"'})
+
+    connection.get(url)
+
+    [entry] = tmpdir.listdir()
+    assert 'TEST_TOKEN' not in entry.read()
+
+
+def test_paginated_list(net_mock, connection, response_cache):
+    connection.response_cache = response_cache
+    date = 'Wed, 21 Oct 2015 07:28:00 GMT'
+    first, second = api_url('/queues/?perPage=1'), api_url('/queues/?perPage=1&page=2')
+
+    def page(queue, next_page=None):
+        def respond(request, context):
+            context.headers['Last-Modified'] = date
+            if next_page is not None:
+                context.headers['Link'] = '<{}>; rel="next"'.format(next_page)
+            if request.headers.get('If-Modified-Since') == date:
+                context.status_code = 304
+                return ''
+            return json.dumps([{'self': api_url('/queues/' + queue), 'key': queue}])
+        return respond
+
+    net_mock.get(first, text=page('A', next_page=second))
+    net_mock.get(second, text=page('B'))
+
+    assert [queue.key for queue in connection.get(first)] == ['A', 'B']
+    assert [queue.key for queue in connection.get(first)] == ['A', 'B']
+    # each page is revalidated with its own cached response
+    assert [request.headers.get('If-Modified-Since') for request in net_mock.request_history] == \
+        [None, None, date, date]
+
+
+def test_credentials_of_next_pages_are_not_stored(net_mock, connection, tmpdir):
+    connection.response_cache = FileCache(str(tmpdir))
+    first, second = api_url('/queues/?perPage=1'), api_url('/queues/?perPage=1&page=2')
+    net_mock.get(first, json=[{'key': 'A'}], headers={'ETag': '"v1"', 'Link': '<{}>; rel="next"'.format(second)})
+    net_mock.get(second, json=[{'key': 'B'}], headers={'ETag': '"v1"'})
+
+    list(connection.get(first))
+
+    entries = tmpdir.listdir()
+    assert len(entries) == 2
+    assert all('TEST_TOKEN' not in entry.read() for entry in entries)
+
+
+def test_not_modified_without_cached_body(net_mock, connection, response_cache):
+    connection.response_cache = response_cache
+    url = api_url('/queues/TEST')
+    net_mock.get(url, status_code=304)
+
+    with pytest.raises(TrackerServerError):
+        connection.get(url, headers={'If-None-Match': '"v1"'})
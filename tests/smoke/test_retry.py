@@ -0,0 +1,159 @@
+# coding: utf-8
+
+import email.utils
+import time
+
+import pytest
+import requests
+from common.url import api_url
+
+from yandex_tracker_client import retry
+from yandex_tracker_client.exceptions import OutOfRetries, TooManyRequests
+from yandex_tracker_client.retry import RetryPolicy
+
+
+def make_response(status_code, retry_after=None):
+    response = requests.Response()
+    response.status_code = status_code
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    return response
+
+
+def delays(policy, responses):
+    retries = policy.start()
+    return [retries.next_delay(response) for response in responses]
+
+
+def test_exponential_delays():
+    policy = RetryPolicy(retries=5, initial_delay=1, multiplier=2, max_delay=5, jitter=retry.NO_JITTER)
+
+    assert delays(policy, [None] * 6) == [1, 2, 4, 5, 5, None]
+
+
+def test_full_jitter():
+    policy = RetryPolicy(retries=100, initial_delay=1, multiplier=2, max_delay=8)
+    result = delays(policy, [None] * 100)
+
+    assert all(0 <= delay <= 8 for delay in result)
+    assert len(set(result)) > 1
+
+
+def test_decorrelated_jitter():
+    policy = RetryPolicy(retries=100, initial_delay=1, max_delay=8, jitter=retry.DECORRELATED_JITTER)
+    result = delays(policy, [None] * 100)
+
+    assert all(1 <= delay <= 8 for delay in result)
+
+
+def test_unknown_jitter():
+    with pytest.raises(ValueError):
+        RetryPolicy(jitter='half')
+
+
+@pytest.mark.parametrize('status_code, delay, retry_after, expected', [
+    (500, 0, None, True),
+    (503, 0, None, True),
+    (429, 0, None, False),
+    (429, 1, None, True),
+    (429, 0, '1', True),
+    (409, 1, None, True),
+    (404, 1, None, False),
+])
+def test_is_retriable(status_code, delay, retry_after, expected):
+    response = make_response(status_code, retry_after)
+
+    assert RetryPolicy().is_retriable(response, delay) is expected
+
+
+def test_retry_after_seconds():
+    policy = RetryPolicy(initial_delay=1, jitter=retry.NO_JITTER)
+
+    assert delays(policy, [make_response(429, '7')]) == [7]
+    assert delays(policy, [make_response(503, '0')]) == [0]
+    assert delays(policy, [make_response(500, '7')]) == [1]
+
+
+def test_retry_after_date():
+    date = email.utils.formatdate(time.time() + 30, usegmt=True)
+    retry_after = RetryPolicy().retry_after(make_response(429, date))
+
+    assert 25 < retry_after <= 30
+
+
+def test_retry_after_with_jitter():
+    policy = RetryPolicy(initial_delay=1)
+    result = delays(policy, [make_response(429, '5')] * 10)
+
+    assert all(5 <= delay <= 10 for delay in result)
+
+
+def test_retry_after_too_long():
+    policy = RetryPolicy(max_retry_after=60)
+
+    assert delays(policy, [make_response(429, '3600')]) == [None]
+
+
+@pytest.mark.clock(retry)
+def test_budget(clock):
+    policy = RetryPolicy(initial_delay=4, multiplier=1, jitter=retry.NO_JITTER, budget=10)
+    retries = policy.start()
+
+    assert retries.next_delay() == 4
+    clock[0] += 4
+    assert retries.next_delay() == 4
+    clock[0] += 4
+    assert retries.next_delay() is None
+
+
+def test_connection_honours_retry_after(net_mock, connection, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    connection.retry_policy = RetryPolicy(jitter=retry.NO_JITTER)
+    url = api_url('/myself')
+    net_mock.get(url, [
+        {'status_code': 429, 'headers': {'Retry-After': '2'}},
+        {'status_code': 200, 'json': {'login': 'me'}},
+    ])
+
+    myself = connection.get(url)
+
+    assert myself['login'] == 'me'
+    assert sleeps == [2]
+
+
+def test_default_policy_fails_fast_on_429(net_mock, connection, monkeypatch):
+    monkeypatch.setattr(time, 'sleep', pytest.fail)
+    url = api_url('/myself')
+    net_mock.get(url, status_code=429, headers={'Retry-After': '100'})
+
+    with pytest.raises(TooManyRequests):
+        connection.get(url)
+
+    assert net_mock.call_count == 1
+
+
+def test_connection_retry_policy(net_mock, connection, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    connection.retry_policy = RetryPolicy(retries=3, initial_delay=1, jitter=retry.NO_JITTER)
+    url = api_url('/myself')
+    net_mock.get(url, status_code=502)
+
+    with pytest.raises(OutOfRetries):
+        connection.get(url)
+
+    assert net_mock.call_count == 3 + 1
+    assert sleeps == [1, 2, 4]
+
+
+def test_connection_gives_up_on_long_retry_after(net_mock, connection, monkeypatch):
+    monkeypatch.setattr(time, 'sleep', pytest.fail)
+    connection.retry_policy = RetryPolicy(max_retry_after=60)
+    url = api_url('/myself')
+    net_mock.get(url, status_code=429, headers={'Retry-After': '3600'})
+
+    with pytest.raises(TooManyRequests):
+        connection.get(url)
+
+    assert net_mock.call_count == 1
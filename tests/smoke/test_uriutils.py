@@ -0,0 +1,55 @@
+# coding: utf-8
+
+from yandex_tracker_client.uriutils import Matcher
+
+
+def make_matcher():
+    matcher = Matcher(memo_size=2)
+    matcher.add('/{api_version}/issues/{id}', 'issues')
+    matcher.add('/{api_version}/issues/{issue}/comments/{id}', 'comments', priority=1)
+    matcher.add('/{api_version}/issues/_search', 'search', priority=1)
+    matcher.add('/{api_version}/{collection}/{id}/access', 'access', priority=1)
+    return matcher
+
+
+def test_priority():
+    matcher = make_matcher()
+
+    assert matcher.match('/v2/issues/TEST-1') == 'issues'
+    assert matcher.match('/v2/issues/TEST-1/comments/5') == 'comments'
+    assert matcher.match('/v2/issues/_search') == 'search'
+    assert matcher.match('/v2/issues/TEST-1/access') == 'access'
+    assert matcher.match('/v2/issues/TEST-1/accessors') == 'access'
+    assert matcher.match('/v2/queues/TEST') is None
+
+
+def test_same_priority_in_order_of_registration():
+    matcher = make_matcher()
+    matcher.add('/{api_version}/issues/{id}', 'other')
+
+    assert matcher.match('/v2/issues/TEST-1') == 'issues'
+
+
+def test_add_after_match():
+    matcher = make_matcher()
+    assert matcher.match('/v2/queues/TEST') is None
+    assert matcher.match('/v2/issues/user@example.com/access') == 'issues'
+
+    matcher.add('/{api_version}/queues/{id}', 'queues')
+    matcher.add('/{api_version}/issues/{id}/access', 'issue access', priority=5)
+
+    assert matcher.match('/v2/queues/TEST') == 'queues'
+    assert matcher.match('/v2/issues/user@example.com/access') == 'issues'
+    assert matcher.match('/v2/issues/TEST-1/access') == 'issue access'
+
+
+
+def test_memo():
+    matcher = make_matcher()
+
+    for _ in range(2):
+        assert matcher.match('/v2/issues/TEST-1') == 'issues'
+        assert matcher.match('/v2/issues/TEST-2') == 'issues'
+        assert matcher.match('/v2/issues/TEST-3') == 'issues'
+
+    assert len(matcher._recent) == 2
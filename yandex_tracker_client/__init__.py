@@ -1,5 +1,12 @@
 # coding: utf-8
 
+import sys
+
 from .client import TrackerClient
 
 __all__ = ['TrackerClient']
+
+# aio uses async generators, which appeared in Python 3.6
+if sys.version_info >= (3, 6):
+    from .aio import AsyncTrackerClient
+    __all__.append('AsyncTrackerClient')
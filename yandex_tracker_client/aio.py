@@ -0,0 +1,878 @@
+# coding: utf-8
+"""asyncio flavour of the client.
+
+``AsyncTrackerClient`` exposes the same collections as ``TrackerClient``,
+but every method which talks to the API returns an awaitable::
+
+    async with AsyncTrackerClient(token=<token>, org_id=<org_id>) as client:
+        issue = await client.issues['MYQUEUE-42']
+        async for comment in issue.comments:
+            print(comment.text)
+
+Requires Python 3.6+ and ``aiohttp``
+(``pip install yandex_tracker_client[async]``).
+"""
+
+import asyncio
+import functools
+import itertools
+import json
+import logging
+import os
+import ssl
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import parse_header_links
+from six import string_types
+
+try:
+    import aiohttp
+    import yarl
+except ImportError:
+    aiohttp = None
+
+from . import collections
+from . import compression
+from . import exceptions
+from . import export
+from .client import TrackerClient
+from .connection import Connection, decode_response, _THROTTLED
+from .objects import (
+    Reference, PaginatedList, SeekablePaginatedList,
+    collect_references, _fill_targets, _pending_references, _split_pending,
+)
+
+__all__ = ['AsyncTrackerClient', 'AsyncConnection', 'aiter_rows']
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncReference(Reference):
+    __slots__ = ()
+
+    def _dereference(self):
+        if self._connection.identity_map is not None:
+            self._target = self._connection.identity_map.get(self._path)
+        if self._target is None:
+            raise exceptions.ReferenceNotLoaded(
+                "Reference {} is not loaded, use `await client.dereference(reference)`".format(self._path)
+            )
+        return self._target
+
+
+class AsyncPaginatedList(PaginatedList):
+    """Paginated results of ``AsyncTrackerClient``, iterated with
+    ``async for``. ``iter_streaming()`` and ``prefetch_pages`` work as for
+    ``PaginatedList``, with next pages fetched by a task."""
+
+    def __iter__(self):
+        raise TypeError("Use `async for` to iterate over {}".format(self.__class__.__name__))
+
+    async def __aiter__(self):
+        for item in self._data:
+            yield item
+
+        if not self._one_page:
+            async for data in self._pages():
+                for item in data:
+                    yield item
+
+    async def iter_streaming(self):
+        data, self._data = self._data, []
+        one_page, self._one_page = self._one_page, True
+
+        data.reverse()
+        while data:
+            yield data.pop()
+
+        if not one_page:
+            async for data in self._pages():
+                data.reverse()
+                while data:
+                    yield data.pop()
+
+    async def _pages(self):
+        if self.prefetch_pages <= 0:
+            async for data in self._iter_pages(self._next_page):
+                yield data
+            return
+
+        queue = asyncio.Queue(maxsize=self.prefetch_pages)
+
+        async def fetch():
+            try:
+                async for data in self._iter_pages(self._next_page):
+                    await queue.put((data, None))
+            except Exception as e:
+                await queue.put((None, e))
+            else:
+                await queue.put((None, None))
+
+        task = asyncio.ensure_future(fetch())
+        try:
+            while True:
+                data, error = await queue.get()
+                if error is not None:
+                    raise error
+                if data is None:
+                    return
+                yield data
+        finally:
+            task.cancel()
+
+    async def _iter_pages(self, next_page):
+        while next_page is not None:
+            page = await self._get_page_data(next_page)
+            if isinstance(page, list):
+                next_page = None
+                data = page
+            else:
+                next_page = page._next_page
+                data = page._data
+
+            yield data
+
+
+class AsyncList(list):
+    """Results which fit in one page. Unlike ``AsyncPaginatedList`` they
+    are all here, so both ``for`` and ``async for`` work."""
+
+    async def __aiter__(self):
+        for item in self:
+            yield item
+
+
+class AsyncSeekablePaginatedList(AsyncPaginatedList, SeekablePaginatedList):
+
+    async def get_page(self, number):
+        path = self._seek_page.replace('{&page}', '&page={}'.format(number))
+        plist = await self._get_page_data(path)
+        if isinstance(plist, SeekablePaginatedList):
+            plist._one_page = True
+        return plist
+
+    async def iter_parallel(self, workers=8, ordered=True, lookahead=None):
+        for item in self._data:
+            yield item
+
+        if self._one_page:
+            return
+
+        semaphore = asyncio.Semaphore(workers)
+
+        async def get_page_items(number):
+            async with semaphore:
+                page = await self.get_page(number)
+            return page if isinstance(page, list) else page._data
+
+        numbers = iter(range(2, self.pages_count + 1))
+        pending = [
+            asyncio.ensure_future(get_page_items(number))
+            for number in itertools.islice(numbers, lookahead or workers)
+        ]
+        try:
+            while pending:
+                if ordered:
+                    data = await pending.pop(0)
+                else:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    task = done.pop()
+                    pending.remove(task)
+                    data = task.result()
+                for number in itertools.islice(numbers, 1):
+                    pending.append(asyncio.ensure_future(get_page_items(number)))
+                for item in data:
+                    yield item
+        finally:
+            for task in pending:
+                if task.done() and not task.cancelled():
+                    task.exception()  # retrieved, so that it is not logged
+                else:
+                    task.cancel()
+
+
+class _BufferedRequest(object):
+    def __init__(self, method, url, body=None, headers=None):
+        self.method = method
+        self.url = url
+        self.body = body
+        self.headers = headers or {}
+
+
+class _BufferedResponse(object):
+    """Fully read aiohttp response with the subset of ``requests.Response``
+    interface used by decoding, pagination and exceptions."""
+
+    def __init__(self, status_code, reason, headers, content, request):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = CaseInsensitiveDict(headers)
+        self._content = content
+        self.request = request
+        self.wire_size = None
+        # open aiohttp response of a streamed request
+        self.raw = None
+
+    @property
+    def content(self):
+        return self._content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', 'replace')
+
+    def json(self, **kwargs):
+        return json.loads(self.text, **kwargs)
+
+    @property
+    def links(self):
+        links = {}
+        header = self.headers.get('link')
+        if header:
+            for link in parse_header_links(header):
+                links[link.get('rel') or link.get('url')] = link
+        return links
+
+
+class AsyncConnection(Connection):
+    """Non-blocking counterpart of ``Connection`` backed by ``aiohttp``.
+
+    Accepts the same arguments as ``Connection`` plus ``connector_limit``,
+    the maximum number of simultaneously open HTTP connections.
+    Retries and error handling follow ``Connection`` exactly.
+    ``batch_dereference`` is not supported: references can't fetch their
+    targets on attribute access, load them with ``await client.resolve()``.
+    The HTTP session is created on first request inside the running loop,
+    call ``close()`` when done.
+    """
+
+    reference_type = AsyncReference
+    list_type = AsyncList
+    paginated_list_type = AsyncPaginatedList
+    seekable_paginated_list_type = AsyncSeekablePaginatedList
+    slot_poll_interval = 0.01
+
+    def __init__(self, *args, **kwargs):
+        if aiohttp is None:
+            raise exceptions.TrackerClientError(
+                "aiohttp is required for AsyncConnection, "
+                "install yandex_tracker_client[async]"
+            )
+        if kwargs.get('batch_dereference'):
+            raise exceptions.TrackerClientError(
+                "batch_dereference is not supported by AsyncConnection, "
+                "use `await client.resolve(objects)`"
+            )
+        self.connector_limit = kwargs.pop('connector_limit', 100)
+        super(AsyncConnection, self).__init__(*args, **kwargs)
+        self._http = None
+        self._pending_gets = {}
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
+
+    def _get_http(self):
+        if self._http is None or self._http.closed:
+            verify = self.session.verify
+            if verify is False:
+                ssl_context = False
+            elif isinstance(verify, string_types):
+                ssl_context = ssl.create_default_context(cafile=verify)
+            else:
+                ssl_context = None
+
+            if isinstance(self.timeout, tuple):
+                connect_timeout, read_timeout = self.timeout
+            else:
+                connect_timeout = read_timeout = self.timeout
+
+            # bodies are decoded by the connection, which counts their
+            # size on the wire
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connector_limit, ssl=ssl_context),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+                auto_decompress=False,
+            )
+        return self._http
+
+    async def stream(self, path, params=None):
+        logger.info("Stream GET %s", path)
+        response = await self._request('GET', self.build_url(path), stream=True, params=params)
+        try:
+            decoder = compression.Decoder(response.headers.get('Content-Encoding'))
+            async for chunk in response.raw.content.iter_chunked(8 * 1024):
+                chunk = decoder.decode(chunk)
+                if chunk:
+                    yield chunk
+            chunk = decoder.flush()
+            if chunk:
+                yield chunk
+        finally:
+            response.raw.release()
+
+    async def _link(self, method, path, resource, rel, params=None, version=None):
+        logger.info("Request %s %s", method, path)
+        url = self.build_url(path)
+        link = '<{resource}>; rel="{rel}"'.format(
+            resource=resource,
+            rel=rel
+        )
+        response = await self._request(method, url, headers={'Link': link}, version=version, params=params)
+        return decode_response(response, self)
+
+    async def request(self, method, path, params=None, data=None, files=None, version=None, **kwargs):
+        return (await self.request_with_response(method, path, params, data, files, version, **kwargs))[0]
+
+    async def request_with_response(self, method, path, params=None, data=None, files=None, version=None,
+                                    **kwargs):
+        logger.info("Request %s %s", method, path)
+        url = self.build_url(path)
+        key = self._single_flight_key(method, url, params, data, files, version, kwargs)
+        if key is None:
+            return await self._request_and_decode(method, url, params, data, files, version, **kwargs)
+
+        future = self._pending_gets.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._request_and_decode(method, url, params, data, files, version, **kwargs)
+            )
+            self._pending_gets[key] = future
+            future.add_done_callback(lambda _: self._pending_gets.pop(key, None))
+        # one caller being cancelled must not cancel the request for others
+        return await asyncio.shield(future)
+
+    async def _request_and_decode(self, method, url, params=None, data=None, files=None, version=None,
+                                  **kwargs):
+        response = await self._request(
+            method=method,
+            url=url,
+            data=data,
+            files=files,
+            version=version,
+            params=params,
+            **kwargs
+        )
+        return decode_response(response, self), response
+
+    async def _request(self, method, url, data=None, files=None, version=None, headers=None, stream=False,
+                       params=None):
+        kwargs = self._prepare_request(
+            method=method,
+            url=url,
+            data=data,
+            files=files,
+            version=version,
+            headers=headers,
+            stream=stream,
+            params=params,
+        )
+        request_bytes = self._compress_body(kwargs)
+        cache_key, cached = self._add_validators(kwargs)
+        response = await self._try_request(**kwargs)
+        self._report_sizes(kwargs, request_bytes, response)
+        return self._use_cached(cache_key, cached, response)
+
+    async def _try_request(self, **kwargs):
+        response = None
+        exception = None
+        retries = self._get_retry_policy().start()
+        endpoint = self._endpoint_key(kwargs['method'], kwargs['url'])
+
+        while True:
+            if self.rate_limiter is not None:
+                wait = self.rate_limiter.reserve()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            # a probe of a half-open circuit must be left even if the call
+            # is cancelled, so nothing is awaited between these
+            probe = self._enter_circuit(endpoint)
+            slot = None
+            dropped = failed = True
+            try:
+                slot = await self._acquire_slot()
+                response = await self._send(**kwargs)
+            except Exception as e:
+                exception = e
+            else:
+                exception = None
+                dropped = response.status_code in _THROTTLED
+                failed = response.status_code >= 500
+            finally:
+                self._release_slot(slot, dropped)
+                self._leave_circuit(endpoint, probe, failed)
+
+            if exception is None:
+                if retries.should_retry(response):
+                    logger.warning(
+                        "Request failed with status %d, retrying (%d)...",
+                        response.status_code, retries.attempt
+                    )
+                    self._log_error(logging.WARNING, response)
+                else:
+                    break
+
+            delay = retries.next_delay(response if exception is None else None)
+            if delay is None:
+                break
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        return self._check_response(response, exception)
+
+    def _wire_size(self, response, size):
+        if response.wire_size is not None:
+            return response.wire_size
+        return super(AsyncConnection, self)._wire_size(response, size)
+
+    async def _acquire_slot(self):
+        limiter = self.concurrency_limiter
+        if limiter is None:
+            return None
+        # the limiter blocks threads, so the loop polls it instead
+        slot = limiter.try_acquire()
+        while slot is None:
+            await asyncio.sleep(self.slot_poll_interval)
+            slot = limiter.try_acquire()
+        return slot
+
+    async def _send(self, **kwargs):
+        if kwargs.get('stream'):
+            response = await self._open(**kwargs)
+            if response.status < 400:
+                # the body is read by the caller, who releases the response
+                streamed = self._wrap(response, kwargs, b'')
+                streamed.raw = response
+                return streamed
+            try:
+                return await self._buffer(response, kwargs)
+            finally:
+                response.release()
+
+        async with self._open(**kwargs) as response:
+            return await self._buffer(response, kwargs)
+
+    def _open(self, method, url, data=None, files=None, timeout=None, headers=None, stream=False, params=None):
+        prepared = requests.PreparedRequest()
+        prepared.prepare_url(url, params)
+
+        merged_headers = dict(self.session.headers)
+        merged_headers.update(headers or {})
+        merged_headers = dict(
+            (name, value) for name, value in merged_headers.items()
+            if value is not None
+        )
+
+        if files:
+            data = aiohttp.FormData()
+            for name, (filename, file) in files.items():
+                data.add_field(name, file, filename=filename)
+
+        return self._get_http().request(
+            method,
+            yarl.URL(prepared.url, encoded=True),
+            data=data,
+            headers=merged_headers,
+        )
+
+    async def _buffer(self, response, kwargs):
+        body = await response.read()
+        buffered = self._wrap(response, kwargs, compression.decode(body, response.headers.get('Content-Encoding')))
+        buffered.wire_size = len(body)
+        return buffered
+
+    def _wrap(self, response, kwargs, content):
+        return _BufferedResponse(
+            status_code=response.status,
+            reason=response.reason,
+            headers=response.headers,
+            content=content,
+            request=_BufferedRequest(
+                method=kwargs['method'],
+                url=kwargs['url'],
+                body=kwargs.get('data'),
+                headers=kwargs.get('headers'),
+            ),
+        )
+
+
+async def aiter_rows(objects, fields, dereference=False):
+    """``export.iter_rows()`` for results of ``AsyncTrackerClient``.
+
+    Feed the rows to a ``csv.writer`` or build batches from them; only
+    references loaded beforehand (``await client.resolve()``) can be
+    dereferenced.
+    """
+    paths = [field.split('.') for field in fields]
+    if isinstance(objects, AsyncPaginatedList):
+        objects = objects.iter_streaming()
+    else:
+        objects = AsyncList(objects)
+    async for obj in objects:
+        yield [export._simplify(export._get_path(obj, path, dereference)) for path in paths]
+
+
+async def _collect(result):
+    result = await result
+    if isinstance(result, AsyncPaginatedList):
+        return [item async for item in result]
+    return result
+
+
+async def _upload_attachments(current_collection, data):
+    attachments = data.pop('attachments', None)
+    if attachments:
+        collection = current_collection._associated(collections.Attachments)
+        uploaded = await asyncio.gather(*(
+            collection.create(attachment)
+            for attachment in attachments
+        ))
+        data['attachmentIds'] = [attachment.id for attachment in uploaded]
+
+
+def _associated(self, collection, **kwargs):
+    return async_collection(collection)(self._connection, **kwargs)
+
+
+async def _aiter(self):
+    for item in await _collect(self.get_all()):
+        yield item
+
+
+async def _update(self, obj, params=None, **kwargs):
+    if kwargs:
+        if isinstance(self, _UPLOADS_ATTACHMENTS):
+            await _upload_attachments(self, kwargs)
+        kwargs = obj.process_kwargs(kwargs)
+        ignore_version_change = kwargs.pop('ignore_version_change', False)
+        if ignore_version_change:
+            version = None
+        else:
+            version = obj._version
+
+        result = await self._execute_request(
+            self._connection.patch,
+            path=obj._path,
+            params=params,
+            data=kwargs,
+            version=version,
+        )
+    else:
+        result = await self._execute_request(
+            self._connection.get,
+            path=obj._path,
+            params=params,
+        )
+    self._connection.invalidate(obj._path)
+    obj._assign(result)
+    return obj
+
+
+async def _delete(self, obj):
+    result = await collections.Collection.delete(self, obj)
+    self._connection.invalidate(obj._path)
+    return result
+
+
+async def _perform_action(self, obj, *args, **kwargs):
+    result = await collections.Collection.perform_action(self, obj, *args, **kwargs)
+    self._connection.invalidate(obj._path)
+    return result
+
+
+async def _execute_transition(self, transition, **kwargs):
+    result = await collections.IssueTransitions.execute(self, transition, **kwargs)
+    self._connection.invalidate(self._issue_path(transition))
+    return result
+
+
+async def _create_with_attachments(self, params=None, **kwargs):
+    await _upload_attachments(self, kwargs)
+    return await collections.Collection.create(self, params=params, **kwargs)
+
+
+async def _create_issue(self, params=None, **kwargs):
+    await _upload_attachments(self, kwargs)
+    self._add_unique(kwargs)
+    try:
+        return await collections.Collection.create(self, params=params, **kwargs)
+    except exceptions.Conflict:
+        unique = kwargs.get('unique')
+        if unique is not None:
+            try:
+                return await self._execute_request(
+                    self._connection.post,
+                    path=self.unique_path,
+                    params={'unique': unique},
+                )
+            except exceptions.NotFound:
+                logger.error('Not found the issue by unique "%s"', unique)
+        raise
+
+
+def _issue_fields(self):
+    if self._fields is None:
+        raise exceptions.TrackerClientError(
+            "Issue fields are not loaded, use `await client.issues.load_fields()`"
+        )
+    return self._fields
+
+
+async def _load_issue_fields(self):
+    if self._fields is None:
+        if self._fields_lock is None:
+            self._fields_lock = asyncio.Lock()
+        async with self._fields_lock:
+            if self._fields is None:
+                self._fields = self._cached_fields()
+            if self._fields is None:
+                await self.refresh_fields()
+    return self._fields
+
+
+async def _refresh_issue_fields(self):
+    fields = await _collect(self._associated(collections.Fields).get_all())
+    self._fields = self._field_defaults(fields)
+    self._store_fields(self._fields)
+    return self._fields
+
+
+async def _get_all_dictionary(self, **params):
+    if params or self._dictionary_ttl is None:
+        return await collections.Collection.get_all(self, **params)
+    return list((await self._load_dictionary()).items)
+
+
+async def _get_dictionary_item(self, key, **params):
+    if params or self._dictionary_ttl is None:
+        return await collections.Collection.get(self, key, **params)
+    obj = (await self._load_dictionary()).find(key)
+    if obj is None:
+        return await collections.Collection.get(self, key)
+    return obj
+
+
+async def _refresh_dictionary(self):
+    return await self._load_dictionary(force=True)
+
+
+async def _load_dictionary(self, force=False):
+    dictionary = None if force else self._fresh_dictionary()
+    if dictionary is None:
+        if self._dictionary_async_lock is None:
+            self._dictionary_async_lock = asyncio.Lock()
+        async with self._dictionary_async_lock:
+            dictionary = None if force else self._fresh_dictionary()
+            if dictionary is None:
+                items = await _collect(collections.Collection.get_all(self))
+                dictionary = self._store_dictionary(items)
+    return dictionary
+
+
+async def _execute_issue_request(self, method, path, params=None, data=None, files=None, **kwargs):
+    await self.load_fields()
+    return await collections.Collection._execute_request(
+        self, method, path, params=params, data=data, files=files, **kwargs
+    )
+
+
+async def _get_many_issues(self, keys, fields=None, chunk_size=100, workers=1, **kwargs):
+    keys, chunks, params = self._get_many_chunks(keys, fields, chunk_size, kwargs)
+    semaphore = asyncio.Semaphore(max(workers, 1))
+
+    async def find_chunk(chunk):
+        async with semaphore:
+            return await _collect(self.find(keys=chunk, per_page=len(chunk), **params))
+
+    results = await asyncio.gather(*(find_chunk(chunk) for chunk in chunks))
+    return self._match_many(keys, results)
+
+
+async def _scroll_issues(self, query=None, per_page=None, scroll_type='sorted', ttl=None, keys=None, filter=None,
+                         filter_id=None, order=None, **kwargs):
+    data = self._search_data(query, keys, filter, filter_id, order, kwargs)
+    params = dict(kwargs, scrollType=scroll_type, perScroll=per_page, scrollTTLMillis=ttl)
+    while params is not None:
+        page, response = await self._execute_request(
+            functools.partial(self._connection.request_with_response, 'POST'),
+            path=self.search_path,
+            params=params,
+            data=data,
+        )
+        items, params = self._next_scroll(page, response, params)
+        for item in items:
+            yield item
+
+
+async def _create_attachment(self, file, params=None, **kwargs):
+    if isinstance(file, string_types):
+        with open(file, 'rb') as file_to_upload:
+            return await self._create_from_file(file_to_upload, params, **kwargs)
+    return await self._create_from_file(file, params, **kwargs)
+
+
+async def _download(connection, path, destination):
+    with open(destination, 'wb') as dest:
+        async for chunk in connection.stream(path=path):
+            dest.write(chunk)
+
+
+async def _download_to(self, attachment, directory):
+    assert attachment.content is not None
+    await _download(self._connection, attachment.content, os.path.join(directory, attachment.name))
+
+
+async def _download_thumbnail_to(self, attachment, directory):
+    assert attachment.thumbnail is not None
+    await _download(self._connection, attachment.thumbnail, os.path.join(directory, attachment.name))
+
+
+async def _wait(self, bulkchange, interval=1.0):
+    for _ in range(10):
+        try:
+            bulkchange = await self.get(bulkchange.id)
+        except exceptions.NotFound:
+            logger.warning(
+                'Not found bulkchange with id: "{}", retrying'.format(bulkchange.id)
+            )
+            await asyncio.sleep(interval)
+        else:
+            break
+    while bulkchange.status not in ('COMPLETE', 'FAILED'):
+        await asyncio.sleep(interval)
+        bulkchange = await self.get(bulkchange.id)
+    return bulkchange
+
+
+_UPLOADS_ATTACHMENTS = (collections.Issues, collections.IssueComments, collections.EntityComments)
+
+_async_collections = {}
+
+
+def async_collection(cls):
+    """Return the awaitable-friendly subclass of collection ``cls``.
+
+    Plain request methods of collections already return awaitables when
+    bound to ``AsyncConnection``, subclasses override only those methods
+    which need several round trips or use the result synchronously.
+    """
+    if getattr(cls, '_asynchronous', False):
+        return cls
+    if cls not in _async_collections:
+        members = {
+            '__module__': __name__,
+            '__doc__': cls.__doc__,
+            '_routable': False,
+            '_asynchronous': True,
+            '_associated': _associated,
+            '__aiter__': _aiter,
+        }
+        injected = {
+            'update': _update,
+            'delete': _delete,
+            'perform_action': _perform_action,
+        }
+
+        if issubclass(cls, _UPLOADS_ATTACHMENTS):
+            members['create'] = _create_with_attachments
+        if issubclass(cls, collections.Issues):
+            members.update(
+                create=_create_issue,
+                fields=property(_issue_fields),
+                load_fields=_load_issue_fields,
+                refresh_fields=_refresh_issue_fields,
+                scroll=_scroll_issues,
+                get_many=_get_many_issues,
+                _execute_request=_execute_issue_request,
+                _fields_lock=None,
+            )
+        if issubclass(cls, collections.DictionaryCollectionMixin):
+            members.update(
+                get_all=_get_all_dictionary,
+                get=_get_dictionary_item,
+                refresh=_refresh_dictionary,
+                _load_dictionary=_load_dictionary,
+                _dictionary_async_lock=None,
+            )
+        if issubclass(cls, collections.Attachments):
+            members['create'] = _create_attachment
+            injected.update(
+                download_to=_download_to,
+                download_thumbnail_to=_download_thumbnail_to,
+            )
+        if issubclass(cls, collections.BulkChange):
+            injected['wait'] = _wait
+        if issubclass(cls, collections.IssueTransitions):
+            injected['execute'] = _execute_transition
+
+        injected = dict(
+            (name, method) for name, method in injected.items()
+            if name in cls._injected_methods
+        )
+        for name, method in injected.items():
+            # Keep collection methods which only share the name with injected ones
+            if getattr(cls, name) is cls._injected_methods[name]:
+                members[name] = method
+
+        variant = collections.CollectionMeta('Async' + cls.__name__, (cls,), members)
+        variant._injected_methods = dict(variant._injected_methods, **injected)
+        _async_collections[cls] = variant
+    return _async_collections[cls]
+
+
+class AsyncTrackerClient(TrackerClient):
+    connector = AsyncConnection
+
+    def __init__(self, *args, **kwargs):
+        if kwargs.get('warm_up'):
+            raise exceptions.TrackerClientError("Use `await client.warm_up()` with AsyncTrackerClient")
+        super(AsyncTrackerClient, self).__init__(*args, **kwargs)
+        self.bulkchange = async_collection(collections.BulkChange)(self._connection)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        await self._connection.close()
+
+    async def dereference(self, reference):
+        identity_map = self._connection.identity_map
+        if identity_map is not None:
+            reference._target = identity_map.get(reference._path)
+        if reference._target is None:
+            reference._target = await self._connection.get(path=reference._path)
+            if identity_map is not None:
+                identity_map.set(reference._path, reference._target)
+        return reference._target
+
+    async def resolve(self, objects, attrs=None, workers=8):
+        pending = _pending_references(collect_references(objects, attrs), self._connection.identity_map)
+        issue_paths, issue_keys, other_paths = _split_pending(pending)
+        semaphore = asyncio.Semaphore(max(workers, 1))
+
+        async def get(path):
+            async with semaphore:
+                return await self._connection.get(path=path)
+
+        targets = {}
+        if issue_paths:
+            targets.update(zip(issue_paths, await self.issues.get_many(issue_keys, workers=workers)))
+        targets.update(zip(other_paths, await asyncio.gather(*(get(path) for path in other_paths))))
+        return _fill_targets(pending, targets, self._connection.identity_map)
+
+    async def warm_up(self, workers=1):
+        semaphore = asyncio.Semaphore(max(workers, 1))
+
+        async def refresh(collection):
+            async with semaphore:
+                return await collection.refresh()
+
+        await asyncio.gather(*(refresh(collection) for collection in self._dictionaries()))
+
+    def _get_collection(self, cls):
+        return super(AsyncTrackerClient, self)._get_collection(async_collection(cls))
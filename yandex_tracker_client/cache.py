@@ -0,0 +1,141 @@
+# coding: utf-8
+from __future__ import absolute_import
+
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+timer = getattr(time, 'monotonic', time.time)
+_replace = getattr(os, 'replace', os.rename)
+
+
+class LRUCache(object):
+    """Thread-safe in-memory cache.
+
+    Keeps at most ``maxsize`` entries, evicting the least recently used
+    ones, and forgets entries older than ``ttl`` seconds (if given).
+    """
+
+    def __init__(self, maxsize=1024, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= timer():
+                return default
+
+            self._entries[key] = entry
+            return value
+
+    def set(self, key, value):
+        expires_at = timer() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (value, expires_at)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FileCache(object):
+    """Cache of JSON-serializable values kept in files under ``directory``.
+
+    Entries survive process restarts, so short-lived workers may share
+    them. Entries older than ``ttl`` seconds (if given) are ignored.
+
+    ``directory`` defaults to ``yandex_tracker_client`` in the user's cache
+    directory (``$XDG_CACHE_HOME`` or ``~/.cache``). A missing directory is
+    created accessible by its owner only.
+    """
+
+    def __init__(self, directory=None, ttl=None):
+        if directory is None:
+            directory = _default_directory()
+        self.directory = directory
+        self.ttl = ttl
+
+    def get(self, key, default=None):
+        try:
+            with io.open(self._path(key), encoding='utf-8') as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return default
+
+        if entry.get('key') != key:
+            return default
+        if self.ttl is not None and entry['created'] + self.ttl <= time.time():
+            return default
+        return entry['value']
+
+    def set(self, key, value):
+        if not os.path.isdir(self.directory):
+            try:
+                os.makedirs(self.directory, 0o700)
+            except OSError:
+                if not os.path.isdir(self.directory):
+                    raise
+
+        # Write to a temporary file first, so that concurrent readers
+        # never see a partially written entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'key': key, 'created': time.time(), 'value': value}, f)
+            _replace(tmp_path, self._path(key))
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def _path(self, key):
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name + '.json')
+
+
+def _default_directory():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'yandex_tracker_client')
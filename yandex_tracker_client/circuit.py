@@ -0,0 +1,119 @@
+# coding: utf-8
+from __future__ import absolute_import
+
+import threading
+
+from . import exceptions
+from .cache import timer
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker(object):
+    """Stops sending requests to an endpoint which keeps failing.
+
+    Endpoints are told apart by a key, which ``Connection`` makes of the
+    request method and the path template of the collection, e.g.
+    ``('GET', '/{api_version}/issues/{issue}/comments/{id}')``.
+
+    After ``failure_threshold`` failures in a row (5xx responses and errors
+    below HTTP), the circuit of the endpoint opens: requests to it raise
+    ``exceptions.CircuitOpen`` at once, retries included. After
+    ``recovery_timeout`` seconds the circuit is half-open and lets up to
+    ``probes`` requests through at a time: a successful one closes the
+    circuit, a failed one opens it again.
+
+    ``on_state_change(key, state)``, if given, is called whenever a circuit
+    changes state.
+    """
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30, probes=1, on_state_change=None):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.probes = probes
+        self.on_state_change = on_state_change
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def state(self, key):
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                return CLOSED
+            if circuit.state == OPEN and circuit.opened_at + self.recovery_timeout <= timer():
+                return HALF_OPEN
+            return circuit.state
+
+    def enter(self, key):
+        """Allow a request to ``key`` or raise ``exceptions.CircuitOpen``.
+
+        Returns whether the request is a probe of a half-open circuit;
+        pass it to ``leave()`` with the outcome of the request.
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit.state == CLOSED:
+                return False
+            now = timer()
+            changed = circuit.state == OPEN
+            if changed:
+                retry_after = circuit.opened_at + self.recovery_timeout - now
+                if retry_after > 0:
+                    raise exceptions.CircuitOpen(key, retry_after)
+                circuit.state = HALF_OPEN
+            if circuit.probing >= self.probes:
+                raise exceptions.CircuitOpen(key, 0)
+            circuit.probing += 1
+
+        if changed:
+            self._notify(key, HALF_OPEN)
+        return True
+
+    def leave(self, key, probe, failed):
+        """Record the outcome of a request allowed by ``enter()``."""
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None:
+                if not failed:
+                    return
+                circuit = self._circuits[key] = _Circuit()
+
+            old_state = circuit.state
+            if probe:
+                circuit.probing -= 1
+            elif old_state != CLOSED:
+                # only probes decide whether an open circuit recovered
+                return
+
+            if not failed:
+                circuit.failures = 0
+                circuit.state = CLOSED
+            else:
+                circuit.failures += 1
+                if probe or circuit.failures >= self.failure_threshold:
+                    circuit.state = OPEN
+                    circuit.opened_at = timer()
+            new_state = circuit.state
+
+            if new_state == CLOSED and circuit.failures == 0 and circuit.probing == 0:
+                # keep only circuits which remember something
+                del self._circuits[key]
+
+        if new_state != old_state:
+            self._notify(key, new_state)
+
+    def _notify(self, key, state):
+        if self.on_state_change is not None:
+            self.on_state_change(key, state)
+
+
+class _Circuit(object):
+    __slots__ = ('state', 'failures', 'opened_at', 'probing')
+
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probing = 0
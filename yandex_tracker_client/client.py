@@ -1,7 +1,10 @@
 # coding: utf-8
 
 from .connection import Connection
+from .objects import collect_references, resolve_references
 from . import collections
+from . import exceptions
+from . import parallel
 
 __all__ = ['TrackerClient']
 
@@ -13,6 +16,7 @@ class TrackerClient(object):
         self._collections = {}
 
         conn = kwargs.pop('connection', None)
+        warm_up = kwargs.pop('warm_up', False)
 
         if conn is None:
             conn = self.connector(*args, **kwargs)
@@ -52,10 +56,40 @@ class TrackerClient(object):
         self.portfolio = self._get_collection(collections.Portfolio)
         self.goal = self._get_collection(collections.Goal)
 
+        if warm_up:
+            self.warm_up(workers=int(warm_up))
+
     @property
     def myself(self):
         return self._connection.get(path='/v2/myself')
 
+    def resolve(self, objects, attrs=None, workers=8):
+        """Dereference references in ``objects`` with as few requests as possible.
+
+        ``objects`` are references or resources; for resources, references
+        in ``attrs`` (all top-level fields by default) are resolved.
+        """
+        return resolve_references(self._connection, collect_references(objects, attrs), workers)
+
+    def warm_up(self, workers=1):
+        """Load all dictionary collections (statuses, priorities etc.),
+        ``workers`` of them at a time. Requires ``dictionary_ttl``.
+
+        ``TrackerClient(..., warm_up=True)`` (or a number of workers) does
+        this at construction.
+        """
+        dictionaries = self._dictionaries()
+        for _ in parallel.imap(lambda collection: collection.refresh(), dictionaries, workers=workers):
+            pass
+
+    def _dictionaries(self):
+        if getattr(self._connection, 'dictionary_ttl', None) is None:
+            raise exceptions.TrackerClientError("Set dictionary_ttl to keep dictionary collections")
+        return [
+            collection for collection in self._collections.values()
+            if isinstance(collection, collections.DictionaryCollectionMixin)
+        ]
+
     def _get_collection(self, cls):
         if cls not in self._collections:
             self._collections[cls] = cls(self._connection)
@@ -0,0 +1,101 @@
+# coding: utf-8
+from __future__ import absolute_import
+
+import json
+import sys
+
+import six
+from requests.utils import guess_json_utf
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONCodec(object):
+    """JSON codec based on the standard ``json`` module."""
+
+    name = 'json'
+
+    def loads(self, content, object_hook=None):
+        if isinstance(content, six.binary_type) and not six.PY2:
+            content = content.decode(guess_json_utf(content) or 'utf-8')
+        return json.loads(content, object_hook=object_hook)
+
+    def dumps(self, obj, default=None):
+        return json.dumps(obj, default=default)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec based on ``orjson``.
+
+    ``orjson`` has no ``object_hook``, so it is applied in a separate pass
+    over the parsed document, bottom-up, as ``json`` does.
+    """
+
+    name = 'orjson'
+
+    def loads(self, content, object_hook=None):
+        decoded = orjson.loads(content)
+        if object_hook is not None:
+            decoded = apply_object_hook(decoded, object_hook)
+        return decoded
+
+    def dumps(self, obj, default=None):
+        if default is None:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+        # orjson replaces exceptions raised by ``default`` with its own
+        errors = []
+
+        def call_default(value):
+            try:
+                return default(value)
+            except Exception:
+                errors.append(sys.exc_info())
+                raise
+
+        try:
+            return orjson.dumps(obj, default=call_default, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            if errors:
+                six.reraise(*errors[0])
+            raise
+
+
+def apply_object_hook(decoded, object_hook):
+    """Replace every dict in ``decoded`` with ``object_hook(dict)``, children first."""
+    if type(decoded) is dict:
+        _hook_dict(decoded, object_hook)
+        return object_hook(decoded)
+    elif type(decoded) is list:
+        _hook_list(decoded, object_hook)
+    return decoded
+
+
+def _hook_dict(obj, object_hook):
+    for key, value in obj.items():
+        value_type = type(value)
+        if value_type is dict:
+            _hook_dict(value, object_hook)
+            obj[key] = object_hook(value)
+        elif value_type is list:
+            _hook_list(value, object_hook)
+
+
+def _hook_list(items, object_hook):
+    for index, value in enumerate(items):
+        value_type = type(value)
+        if value_type is dict:
+            _hook_dict(value, object_hook)
+            items[index] = object_hook(value)
+        elif value_type is list:
+            _hook_list(value, object_hook)
+
+
+def default_codec():
+    """The fastest codec available."""
+    if orjson is not None:
+        return OrjsonCodec()
+    return JSONCodec()
@@ -1,16 +1,22 @@
 # coding: utf-8
+from __future__ import absolute_import
 
 import abc
+import functools
 import logging
 import os
 import re
+import threading
 import time
 import uuid
+from collections import OrderedDict
 
-from six import iteritems, with_metaclass, string_types
-from six.moves import range
+from six import iteritems, with_metaclass, string_types, text_type
+from six.moves import map, range
 
 from . import exceptions
+from . import parallel
+from .cache import timer
 from .settings import VERSION_V2
 from .uriutils import Matcher
 
@@ -65,7 +71,7 @@ class CollectionMeta(abc.ABCMeta):
 
         cls = super(CollectionMeta, mcs).__new__(mcs, name, bases, members)
 
-        if isinstance(cls.path, str):
+        if isinstance(cls.path, str) and members.get('_routable', True):
             mcs.matcher.add(cls.path, cls, cls._priority)
         return cls
 
@@ -198,15 +204,18 @@ class Collection(with_metaclass(CollectionMeta, object)):
                 path=obj._path,
                 params=params,
             )
-        obj.__dict__ = result.__dict__
+        self._connection.invalidate(obj._path)
+        obj._assign(result)
         return obj
 
     @injected_method
     def delete(self, obj):
-        return self._execute_request(
+        result = self._execute_request(
             self._connection.delete,
             path=obj._path,
         )
+        self._connection.invalidate(obj._path)
+        return result
 
     @injected_method
     def perform_action(self, obj, action, method, params=None, ignore_empty_body=False, list_data=None, **kwargs):
@@ -224,13 +233,15 @@ class Collection(with_metaclass(CollectionMeta, object)):
         else:
             data = kwargs
 
-        return self._execute_request(
+        result = self._execute_request(
             getattr(self._connection, method),
             path=obj._path + '/{}'.format(action),
             version=version,
             data=data,
             params=params,
         )
+        self._connection.invalidate(obj._path)
+        return result
 
 
 class ImportCollectionMixin(object):
@@ -272,7 +283,89 @@ class Users(Collection):
         )
 
 
-class IssueTypes(Collection):
+class DictionaryCollectionMixin(object):
+    """Collection of a few rarely changed objects, such as statuses.
+
+    If the connection has ``dictionary_ttl``, ``get_all()`` and ``get()``
+    without params are served from a copy of the whole collection, loaded
+    with one request and kept for ``dictionary_ttl`` seconds. ``get()``
+    finds an object by id, key or name in a dict, falling back to a
+    request for keys which are not in the copy.
+    """
+
+    # later fields win when values clash
+    _index_fields = ('name', 'key', 'id')
+
+    def __init__(self, connection, **kwargs):
+        super(DictionaryCollectionMixin, self).__init__(connection, **kwargs)
+        self._dictionary = None
+        self._dictionary_lock = threading.Lock()
+
+    @property
+    def _dictionary_ttl(self):
+        return getattr(self._connection, 'dictionary_ttl', None)
+
+    def get_all(self, **params):
+        if params or self._dictionary_ttl is None:
+            return super(DictionaryCollectionMixin, self).get_all(**params)
+        return list(self._load_dictionary().items)
+
+    def get(self, key, **params):
+        if params or self._dictionary_ttl is None:
+            return super(DictionaryCollectionMixin, self).get(key, **params)
+        obj = self._load_dictionary().find(key)
+        if obj is None:
+            return super(DictionaryCollectionMixin, self).get(key)
+        return obj
+
+    def refresh(self):
+        """Load the dictionary copy again."""
+        return self._load_dictionary(force=True)
+
+    def _load_dictionary(self, force=False):
+        dictionary = None if force else self._fresh_dictionary()
+        if dictionary is None:
+            with self._dictionary_lock:
+                dictionary = None if force else self._fresh_dictionary()
+                if dictionary is None:
+                    items = super(DictionaryCollectionMixin, self).get_all()
+                    dictionary = self._store_dictionary(items)
+        return dictionary
+
+    def _fresh_dictionary(self):
+        dictionary = self._dictionary
+        if dictionary is not None and timer() < dictionary.expires_at:
+            return dictionary
+        return None
+
+    def _store_dictionary(self, items):
+        self._dictionary = _Dictionary(items, self._index_fields, self._dictionary_ttl)
+        return self._dictionary
+
+
+class _Dictionary(object):
+    __slots__ = ('items', 'index', 'loaded_at', 'expires_at')
+
+    def __init__(self, items, index_fields, ttl):
+        self.items = list(items)
+        self.index = {}
+        for field in index_fields:
+            for obj in self.items:
+                value = obj._value.get(field)
+                if isinstance(value, (string_types, int)):
+                    self.index[value] = obj
+                    self.index[text_type(value)] = obj
+        self.loaded_at = timer()
+        self.expires_at = self.loaded_at + ttl
+
+    def find(self, key):
+        obj = self.index.get(key)
+        if obj is None and not isinstance(key, string_types):
+            obj = self.index.get(text_type(key))
+        return obj
+
+
+class IssueTypes(DictionaryCollectionMixin, Collection):
     """Extra get params = localized"""
     path = '/{api_version}/issuetypes/{id}'
     fields = {
@@ -285,7 +378,7 @@ class IssueTypes(Collection):
     }
 
 
-class Priorities(Collection):
+class Priorities(DictionaryCollectionMixin, Collection):
     """Extra get params = localized"""
     path = '/{api_version}/priorities/{id}'
     fields = {
@@ -314,7 +407,7 @@ class Groups(Collection):
     }
 
 
-class Statuses(Collection):
+class Statuses(DictionaryCollectionMixin, Collection):
     """Extra get params = localized"""
     path = '/{api_version}/statuses/{id}'
     fields = {
@@ -328,7 +421,7 @@ class Statuses(Collection):
     }
 
 
-class Resolutions(Collection):
+class Resolutions(DictionaryCollectionMixin, Collection):
     """Extra get params = localized"""
     path = '/{api_version}/resolutions/{id}'
     fields = {
@@ -480,8 +573,11 @@ class Issues(ImportCollectionMixin, Collection):
     unique_path = '/{api_version}/issues/_findByUnique'
     has_local_fields = True
     date_format = '%Y-%m-%dT%H:%M:%S.%f%z'
+    _header_param_names = dict(Collection._header_param_names, scroll_token='X-Scroll-Token')
 
     _fields = None
+    # Bump when the format of cached fields changes
+    _fields_cache_version = 1
 
     @staticmethod
     def _parse_order_params(order_by, order_asc, order_list):
@@ -497,12 +593,45 @@ class Issues(ImportCollectionMixin, Collection):
     @property
     def fields(self):
         if self._fields is None:
-            self._fields = dict(
-                (field.id, [] if field.schema['type'] == 'array' else None)
-                for field in Fields(self._connection).get_all()
-            )
+            self._fields = self._cached_fields()
+        if self._fields is None:
+            self.refresh_fields()
         return self._fields
 
+    def refresh_fields(self):
+        """Reload the fields schema and store it in the connection's ``fields_cache``."""
+        self._fields = self._field_defaults(Fields(self._connection).get_all())
+        self._store_fields(self._fields)
+        return self._fields
+
+    def _cached_fields(self):
+        fields_cache = getattr(self._connection, 'fields_cache', None)
+        if fields_cache is None:
+            return None
+        return fields_cache.get(self._fields_cache_key())
+
+    def _store_fields(self, fields):
+        fields_cache = getattr(self._connection, 'fields_cache', None)
+        if fields_cache is not None:
+            fields_cache.set(self._fields_cache_key(), fields)
+
+    def _fields_cache_key(self):
+        conn = self._connection
+        headers = conn.session.headers
+        return 'fields:{version}:{base_url}:{api_version}:{org_id}'.format(
+            version=self._fields_cache_version,
+            base_url=conn.base_url,
+            api_version=conn.api_version,
+            org_id=headers.get('X-Cloud-Org-Id') or headers.get('X-Org-Id'),
+        )
+
+    @staticmethod
+    def _field_defaults(fields):
+        return dict(
+            (field.id, [] if field.schema['type'] == 'array' else None)
+            for field in fields
+        )
+
     def create(self, params=None, **kwargs):
         _upload_attachments(self, kwargs)
         self._add_unique(kwargs)
@@ -540,7 +669,102 @@ class Issues(ImportCollectionMixin, Collection):
         Instead use the parameter 'order' in the form of the fields list
         like in Django: ['field1', '-field2', '+field3']
         """
-        data = {
+        data = self._search_data(query, keys, filter, filter_id, order, kwargs)
+        path = self.count_search_path if count_only else self.search_path
+        return self._execute_request(
+            self._connection.post,
+            path=path,
+            params=dict(kwargs, perPage=per_page),
+            data=data,
+        )
+
+    def get_many(self, keys, fields=None, chunk_size=100, workers=1, **kwargs):
+        """
+        Get issues by keys with as few search requests as possible.
+        Returns a list in the order of 'keys', where issues that
+        were not found are None.
+        'chunk_size' is the number of keys per search request,
+        'workers' is the number of requests made in parallel.
+        """
+        keys, chunks, params = self._get_many_chunks(keys, fields, chunk_size, kwargs)
+
+        def find_chunk(chunk):
+            return list(self.find(keys=chunk, per_page=len(chunk), **params))
+
+        if workers > 1:
+            results = parallel.imap(find_chunk, chunks, workers=workers)
+        else:
+            results = map(find_chunk, chunks)
+        return self._match_many(keys, results)
+
+    @staticmethod
+    def _get_many_chunks(keys, fields, chunk_size, params):
+        keys = list(keys)
+        unique_keys = list(OrderedDict.fromkeys(keys))
+        chunks = [
+            unique_keys[start:start + chunk_size]
+            for start in range(0, len(unique_keys), chunk_size)
+        ]
+        if fields is not None:
+            if isinstance(fields, string_types):
+                fields = fields.split(',')
+            # issues are matched with requested keys by key
+            params['fields'] = ','.join(sorted(set(fields) | {'key'}))
+        return keys, chunks, params
+
+    @staticmethod
+    def _match_many(keys, results):
+        found = {}
+        for issues in results:
+            for issue in issues:
+                found[issue.key] = issue
+        return [found.get(key) for key in keys]
+
+    def scroll(self, query=None, per_page=None, scroll_type='sorted', ttl=None, keys=None, filter=None,
+               filter_id=None, order=None, **kwargs):
+        """
+        Lazily iterate over search results with scrolling instead of pages,
+        so requesting the next portion doesn't slow down with depth.
+        'per_page' is the size of a portion (up to 1000),
+        'scroll_type' is 'sorted' or 'unsorted',
+        'ttl' is the lifetime of the scroll context in milliseconds.
+        Other parameters are the same as in 'find'.
+        """
+        data = self._search_data(query, keys, filter, filter_id, order, kwargs)
+        params = dict(kwargs, scrollType=scroll_type, perScroll=per_page, scrollTTLMillis=ttl)
+        while params is not None:
+            page, response = self._execute_request(
+                functools.partial(self._connection.request_with_response, 'POST'),
+                path=self.search_path,
+                params=params,
+                data=data,
+            )
+            items, params = self._next_scroll(page, response, params)
+            for item in items:
+                yield item
+
+    @staticmethod
+    def _next_scroll(page, response, params):
+        if page is None:
+            items = []
+        elif isinstance(page, list):
+            items = page
+        else:
+            items = page._data
+
+        scroll_id = response.headers.get('X-Scroll-Id')
+        if not items or not scroll_id:
+            return items, None
+
+        params = dict(params, scrollId=scroll_id)
+        params.pop('scrollType', None)
+        scroll_token = response.headers.get('X-Scroll-Token')
+        if scroll_token:
+            params['scroll_token'] = scroll_token
+        return items, params
+
+    def _search_data(self, query, keys, filter, filter_id, order, kwargs):
+        return {
             'filter': filter,
             'filterId': filter_id,
             'query': query,
@@ -552,13 +776,6 @@ class Issues(ImportCollectionMixin, Collection):
                 order or [],
             ),
         }
-        path = self.count_search_path if count_only else self.search_path
-        return self._execute_request(
-            self._connection.post,
-            path=path,
-            params=dict(kwargs, perPage=per_page),
-            data=data,
-        )
 
     @injected_method
     def add_remotelink(self, issue, relation, target_url):
@@ -901,11 +1118,17 @@ class IssueTransitions(Collection):
 
     @injected_method
     def execute(self, transition, **kwargs):
-        return self._execute_request(
+        result = self._execute_request(
             self._connection.post,
             path=transition._path + '/_execute',
             data=kwargs,
         )
+        self._connection.invalidate(self._issue_path(transition))
+        return result
+
+    @staticmethod
+    def _issue_path(transition):
+        return transition._path.rsplit('/transitions/', 1)[0]
 
 
 class IssueComments(ImportCollectionMixin, Collection):
@@ -1134,7 +1357,7 @@ class IssueWorklog(Collection, ImportCollectionMixin):
     _priority = 1
 
 
-class LinkTypes(Collection):
+class LinkTypes(DictionaryCollectionMixin, Collection):
     path = '/{api_version}/linktypes/{id}'
     fields = {
         'id': None,
@@ -1144,7 +1367,7 @@ class LinkTypes(Collection):
     }
 
 
-class Fields(Collection):
+class Fields(DictionaryCollectionMixin, Collection):
     path = '/{api_version}/fields/{id}'
     fields = {
         'id': None,
@@ -1159,7 +1382,7 @@ class Fields(Collection):
     }
 
 
-class FieldCategories(Collection):
+class FieldCategories(DictionaryCollectionMixin, Collection):
     path = '/{api_version}/fields/categories/{id}'
     fields = {
         'id': None,
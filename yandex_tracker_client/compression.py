@@ -0,0 +1,107 @@
+# coding: utf-8
+from __future__ import absolute_import
+
+import threading
+import zlib
+from collections import namedtuple
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+GZIP = 'gzip'
+DEFLATE = 'deflate'
+BROTLI = 'br'
+
+
+def accept_encoding():
+    """Value of ``Accept-Encoding`` for the encodings which can be decoded:
+    brotli first if ``brotli`` or ``brotlicffi`` is installed."""
+    if brotli is not None:
+        return 'br, gzip, deflate'
+    return 'gzip, deflate'
+
+
+def gzip(data, level=6):
+    """``data`` (bytes) compressed in gzip format."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+class Decoder(object):
+    """Incremental decoder of a body in ``Content-Encoding`` ``encoding``.
+
+    Bodies in an unknown encoding (or without one) are passed through as
+    they are, as ``requests`` does.
+    """
+
+    def __init__(self, encoding):
+        encoding = (encoding or '').strip().lower()
+        self._decompress = None
+        self._flush = None
+        if encoding in (GZIP, DEFLATE):
+            # 32 + MAX_WBITS detects gzip and zlib headers
+            obj = zlib.decompressobj(32 + zlib.MAX_WBITS)
+            self._decompress, self._flush = obj.decompress, obj.flush
+        elif encoding == BROTLI and brotli is not None:
+            obj = brotli.Decompressor()
+            self._decompress = getattr(obj, 'decompress', None) or obj.process
+
+    def decode(self, chunk):
+        if self._decompress is None:
+            return chunk
+        return self._decompress(chunk)
+
+    def flush(self):
+        if self._flush is None:
+            return b''
+        return self._flush()
+
+
+def decode(data, encoding):
+    """Whole body ``data`` in ``Content-Encoding`` ``encoding``, decoded."""
+    decoder = Decoder(encoding)
+    return decoder.decode(data) + decoder.flush()
+
+
+TransferSizes = namedtuple('TransferSizes', [
+    'request_bytes', 'request_wire_bytes', 'response_bytes', 'response_wire_bytes',
+])
+TransferSizes.__doc__ = """Sizes of bodies of one call in bytes.
+
+``*_bytes`` are sizes of decoded bodies, ``*_wire_bytes`` are sizes as
+sent over HTTP, compressed if ``Content-Encoding`` was used. Sizes which
+are not known (uploaded files, streamed responses) are ``None``.
+"""
+
+
+class ByteCounter(object):
+    """``metrics_hook`` for ``Connection`` which sums sizes of all calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def __call__(self, method, url, sizes):
+        with self._lock:
+            self.calls += 1
+            for name, value in zip(TransferSizes._fields, sizes):
+                if value is not None:
+                    setattr(self, name, getattr(self, name) + value)
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.request_bytes = 0
+            self.request_wire_bytes = 0
+            self.response_bytes = 0
+            self.response_wire_bytes = 0
+
+    @property
+    def saved_bytes(self):
+        """Bytes not sent or received thanks to compression."""
+        return (self.request_bytes - self.request_wire_bytes) + (self.response_bytes - self.response_wire_bytes)
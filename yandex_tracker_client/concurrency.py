@@ -0,0 +1,136 @@
+# coding: utf-8
+from __future__ import absolute_import
+
+import threading
+
+from .cache import timer
+
+
+class AdaptiveLimiter(object):
+    """Limits the number of requests in flight, adapting the limit to the
+    server's feedback (additive increase, multiplicative decrease).
+
+    While the limit is reached and responses come back without throttling
+    and without a latency spike, the limit grows by ``increase`` per
+    ``limit`` responses, that is roughly by ``increase`` per round trip.
+    A 429 or 503 response, an error below HTTP (e.g. a timeout) or a
+    recent latency above ``latency_tolerance`` times the baseline multiply
+    the limit by ``backoff``. Responses to requests sent before the last
+    decrease don't decrease it again, so one burst of 429s shrinks the
+    limit once.
+
+    The recent latency is a moving average over about ``1 / smoothing``
+    responses, so that a single slow response is not taken for overload.
+    The baseline is the lowest recent latency seen, slowly following
+    latencies above it, so that a permanent change of the server speed is
+    accepted.
+
+    ``metrics_hook(limit, reason)``, if given, is called whenever the limit
+    changes; ``reason`` is ``'increase'`` or ``'decrease'``.
+    """
+
+    baseline_drift = 0.01
+
+    def __init__(self,
+                 initial_limit=10,
+                 min_limit=1,
+                 max_limit=200,
+                 increase=1,
+                 backoff=0.5,
+                 latency_tolerance=2.0,
+                 smoothing=0.1,
+                 metrics_hook=None,
+                 ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.smoothing = smoothing
+        self.metrics_hook = metrics_hook
+        self.baseline = None
+        self.latency = None
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._decreased_at = None
+        self._saturated_at = None
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def try_acquire(self):
+        """Token to pass to ``release()``, or ``None`` if the limit is reached."""
+        with self._condition:
+            return self._take()
+
+    def acquire(self):
+        """Wait for a free slot and return a token to pass to ``release()``."""
+        with self._condition:
+            token = self._take()
+            while token is None:
+                self._condition.wait()
+                token = self._take()
+            return token
+
+    def release(self, token, dropped=False):
+        """Finish a request started with ``token``. ``dropped`` means that
+        the server throttled it or it failed without a response."""
+        now = timer()
+        latency = now - token
+        with self._condition:
+            self._in_flight -= 1
+            if dropped:
+                reason = self._on_drop(token, now)
+            else:
+                reason = self._on_success(token, now, latency)
+            limit = self.limit
+            self._condition.notify_all()
+
+        if reason is not None and self.metrics_hook is not None:
+            self.metrics_hook(limit, reason)
+
+    def _take(self):
+        if self._in_flight >= self.limit:
+            return None
+        self._in_flight += 1
+        now = timer()
+        if self._in_flight >= self.limit:
+            self._saturated_at = now
+        return now
+
+    def _on_success(self, started, now, latency):
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += (latency - self.latency) * self.smoothing
+        latency = self.latency
+
+        baseline = self.baseline
+        if baseline is None or latency < baseline:
+            self.baseline = latency
+        else:
+            self.baseline = baseline + (latency - baseline) * self.baseline_drift
+            if latency > baseline * self.latency_tolerance:
+                return self._on_drop(started, now)
+
+        # grow only a limit which was reached, otherwise it is not known
+        # whether the server would keep up with more requests
+        if self._saturated_at is None or started > self._saturated_at or self._limit >= self.max_limit:
+            return None
+        old = self.limit
+        self._limit = min(self.max_limit, self._limit + float(self.increase) / self._limit)
+        return 'increase' if self.limit != old else None
+
+    def _on_drop(self, started, now):
+        if self._decreased_at is not None and started <= self._decreased_at:
+            return None
+        self._decreased_at = now
+        old = self.limit
+        self._limit = max(self.min_limit, self._limit * self.backoff)
+        return 'decrease' if self.limit != old else None
@@ -1,10 +1,14 @@
 # coding: utf-8
 
-import json
+import hashlib
 import logging
+import re
+import threading
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 
 try:
     from requests.utils import check_header_validity
@@ -14,14 +18,28 @@ except:
 
 import six
 from six.moves.urllib.parse import urlparse, urljoin
-from six.moves import range
 
-from . import exceptions
-from .objects import Reference, Resource, PaginatedList, SeekablePaginatedList
+from . import compression, exceptions
+from .codec import apply_object_hook, default_codec
+from .collections import CollectionMeta
+from .objects import Reference, ReferenceBatch, Resource, PaginatedList, SeekablePaginatedList
+from .parallel import SingleFlight
+from .retry import NO_JITTER, RetryPolicy
 from .settings import VERSION_V2
 
 logger = logging.getLogger(__name__)
 
+_URL_PATH_END = re.compile(r'[;?#]')
+
+# Responses which mean that the server is overloaded
+_THROTTLED = frozenset([429, 503])
+
+# Headers describing the encoded body, not valid for a cached one
+_BODY_HEADERS = frozenset(['content-encoding', 'content-length', 'transfer-encoding'])
+
+# Headers which tell apart users, kept in cache keys only as a hash
+_CREDENTIAL_HEADERS = ('Authorization', 'X-Org-Id', 'X-Cloud-Org-Id')
+
 
 def bind_method(name):
     def method(self, *args, **kwargs):
@@ -32,6 +50,105 @@ def bind_method(name):
 
 
 class Connection(object):
+    """HTTP transport of the client.
+
+    A connection (and the ``TrackerClient`` built on it) may be shared
+    between threads: it keeps no per-request state, and connections are
+    taken from urllib3 pools, which are thread-safe. ``pool_maxsize`` limits
+    how many keep-alive connections per host are kept for reuse, so set it
+    to at least the number of worker threads. With ``pool_block=True``,
+    threads wait for a free connection instead of opening extra
+    short-lived ones.
+
+    ``requests.Session`` itself is not documented as thread-safe (for
+    example, its cookie jar is shared). With ``session_per_thread=True``,
+    every thread lazily gets its own session and pool, copied from the
+    session configured at construction time.
+
+    Limiters, circuit breakers, caches and ``compression.ByteCounter``
+    shipped with the client are thread-safe: one instance may be passed to
+    many connections and used from many threads.
+
+    ``prefetch_pages`` is the default number of next pages which paginated
+    results download in a background thread while the caller processes
+    the current one (see ``PaginatedList.prefetch_pages``).
+
+    With ``batch_dereference=True``, references decoded from one response
+    are dereferenced together: accessing an unknown field of one of them
+    fetches all pending references to the same collection, each distinct
+    resource once.
+
+    ``identity_map`` (e.g. ``cache.LRUCache(maxsize=10000, ttl=300)``) is
+    shared by all references: a resource is fetched once for all references
+    to its path, until the entry expires or is invalidated by ``update()``,
+    ``delete()`` or ``perform_action()`` on that path.
+
+    ``fields_cache`` (e.g. ``cache.FileCache(ttl=3600)``) keeps the issue
+    fields schema between processes, so that ``client.issues.fields`` is
+    loaded from it instead of the API. ``client.issues.refresh_fields()``
+    reloads the schema and updates the cache.
+
+    ``json_codec`` encodes request bodies and decodes responses. By default
+    it is ``codec.OrjsonCodec`` if ``orjson`` is installed, and
+    ``codec.JSONCodec`` (the standard ``json`` module) otherwise.
+
+    With ``lazy_decode=True``, resources keep the parsed JSON and create
+    references in a field (and local field aliases) when the field is
+    first accessed.
+
+    ``retry_policy`` (a ``retry.RetryPolicy``) decides which failed
+    requests are repeated and how long to wait in between: it honours
+    ``Retry-After``, adds jitter and limits the total time of a call. By
+    default, ``retries`` and ``retries_*`` arguments make a policy without
+    jitter which ignores ``Retry-After``, so a 429 response is only
+    retried if ``retries_initial_delay`` is set.
+
+    ``rate_limiter`` (e.g. ``ratelimit.TokenBucket(rate=10)``) is asked for
+    a token before every attempt, so that requests wait on the client side
+    instead of being rejected with 429. Share one limiter between clients
+    of the same organisation, or use ``ratelimit.FileTokenBucket`` to share
+    it between processes on a host.
+
+    ``concurrency_limiter`` (e.g. ``concurrency.AdaptiveLimiter()``) limits
+    the number of requests in flight, growing the limit while the server
+    keeps up and shrinking it on 429/503 responses, errors and latency
+    spikes. Share one limiter between all threads using the client.
+
+    ``circuit_breaker`` (e.g. ``circuit.CircuitBreaker()``) makes requests
+    to an endpoint which keeps failing raise ``exceptions.CircuitOpen``
+    at once instead of retrying. Endpoints are told apart by method and
+    the path template of their collection.
+
+    With ``single_flight=True``, identical GET requests (same url, params,
+    headers and credentials) made while one of them is in flight wait for
+    it and share its decoded result instead of being sent again. Callers
+    then get the same objects, so don't change them in place.
+
+    ``response_cache`` (e.g. ``cache.LRUCache()`` or ``cache.FileCache()``)
+    keeps bodies of GET responses which have ``ETag`` or ``Last-Modified``.
+    Repeated GETs of the same url send them back in ``If-None-Match`` and
+    ``If-Modified-Since``, and a ``304 Not Modified`` response is decoded
+    from the cached body.
+
+    With ``dictionary_ttl`` (seconds), collections of rarely changed
+    objects (statuses, priorities, issue types, resolutions, link types,
+    fields and field categories) keep a copy of all their objects, and
+    look them up by id, key or name without a request (see
+    ``collections.DictionaryCollectionMixin``).
+
+    Responses are requested in gzip, deflate or, if ``brotli`` or
+    ``brotlicffi`` is installed, brotli encoding. JSON request bodies of
+    at least ``compress_threshold`` bytes are sent gzip-compressed with
+    ``Content-Encoding: gzip``. ``metrics_hook(method, url, sizes)``, if
+    given, is called after every successful call with
+    ``compression.TransferSizes`` of its request and response bodies,
+    e.g. ``compression.ByteCounter()``.
+    """
+
+    reference_type = Reference
+    list_type = list
+    paginated_list_type = PaginatedList
+    seekable_paginated_list_type = SeekablePaginatedList
 
     def __init__(self,
                  token=None,
@@ -47,22 +164,47 @@ class Connection(object):
                  verify=True,
                  cloud_org_id=None,
                  iam_token=None,
+                 pool_connections=10,
+                 pool_maxsize=10,
+                 pool_block=False,
+                 session_per_thread=False,
+                 prefetch_pages=0,
+                 batch_dereference=False,
+                 identity_map=None,
+                 fields_cache=None,
+                 json_codec=None,
+                 lazy_decode=False,
+                 retry_policy=None,
+                 rate_limiter=None,
+                 concurrency_limiter=None,
+                 circuit_breaker=None,
+                 single_flight=False,
+                 response_cache=None,
+                 dictionary_ttl=None,
+                 compress_threshold=None,
+                 metrics_hook=None,
                  ):
 
-        self.session = requests.Session()
-        self.session.verify = verify
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self._thread_local = threading.local() if session_per_thread else None
+
+        self._session = session = self._create_session()
+        session.verify = verify
 
+        session.headers['Accept-Encoding'] = compression.accept_encoding()
         if headers is not None:
-            self.session.headers.update(headers)
+            session.headers.update(headers)
 
-        self.session.headers['Authorization'] = 'OAuth ' + (token or 'not provided')
-        self.session.headers['X-Org-Id'] = org_id or 'not provided'
-        self.session.headers['Content-Type'] = 'application/json'
+        session.headers['Authorization'] = 'OAuth ' + (token or 'not provided')
+        session.headers['X-Org-Id'] = org_id or 'not provided'
+        session.headers['Content-Type'] = 'application/json'
 
         if cloud_org_id:
             if cloud_org_id and org_id:
                 raise exceptions.TrackerClientError("Use either org_id or cloud_org_id to specify organization")
-            self.session.headers['X-Cloud-Org-Id'] = cloud_org_id
+            session.headers['X-Cloud-Org-Id'] = cloud_org_id
 
         if token and iam_token:
             raise exceptions.TrackerClientError("Use OAuth or IAM token for authorization")
@@ -70,10 +212,10 @@ class Connection(object):
         if iam_token:
             if not cloud_org_id:
                 raise exceptions.TrackerClientError("IAM token works only with cloud organizations. Use cloud_org_id to specify org id.")
-            self.session.headers['Authorization'] = 'Bearer ' + iam_token
+            session.headers['Authorization'] = 'Bearer ' + iam_token
 
         # Check validity headers for requests >= 2.11
-        for header in self.session.headers.items():
+        for header in session.headers.items():
             check_header_validity(header)
 
         self.base_url = base_url
@@ -83,6 +225,54 @@ class Connection(object):
         self.retries_initial_delay = retries_initial_delay
         self.retries_delay_multiplier = retries_delay_multiplier
         self.retries_delay_upper_limit = retries_delay_upper_limit
+        self.prefetch_pages = prefetch_pages
+        self.batch_dereference = batch_dereference
+        self.identity_map = identity_map
+        self.fields_cache = fields_cache
+        self.json_codec = json_codec or default_codec()
+        self.lazy_decode = lazy_decode
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.circuit_breaker = circuit_breaker
+        self.single_flight = single_flight
+        self._in_flight = SingleFlight()
+        self.response_cache = response_cache
+        self.dictionary_ttl = dictionary_ttl
+        self.compress_threshold = compress_threshold
+        self.metrics_hook = metrics_hook
+
+    @property
+    def session(self):
+        if self._thread_local is None:
+            return self._session
+
+        session = getattr(self._thread_local, 'session', None)
+        if session is None:
+            session = self._thread_local.session = self._create_session(template=self._session)
+        return session
+
+    @session.setter
+    def session(self, session):
+        self._session = session
+
+    def _create_session(self, template=None):
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        if template is not None:
+            session.headers.update(template.headers)
+            session.verify = template.verify
+            session.cert = template.cert
+            session.proxies.update(template.proxies)
+            session.auth = template.auth
+        return session
 
     get = bind_method('GET')
     put = bind_method('PUT')
@@ -112,8 +302,20 @@ class Connection(object):
         return decode_response(response, self)
 
     def request(self, method, path, params=None, data=None, files=None, version=None, **kwargs):
+        return self.request_with_response(method, path, params, data, files, version, **kwargs)[0]
+
+    def request_with_response(self, method, path, params=None, data=None, files=None, version=None, **kwargs):
+        """Same as ``request``, but returns a ``(decoded, response)`` pair
+        for callers which need response headers."""
         logger.info("Request %s %s", method, path)
         url = self.build_url(path)
+        key = self._single_flight_key(method, url, params, data, files, version, kwargs)
+        if key is not None:
+            return self._in_flight.do(key, self._request_and_decode, method, url, params, data, files, version,
+                                      **kwargs)
+        return self._request_and_decode(method, url, params, data, files, version, **kwargs)
+
+    def _request_and_decode(self, method, url, params=None, data=None, files=None, version=None, **kwargs):
         response = self._request(
             method=method,
             url=url,
@@ -123,25 +325,72 @@ class Connection(object):
             params=params,
             **kwargs
         )
-        return decode_response(response, self)
+        return decode_response(response, self), response
+
+    def _single_flight_key(self, method, url, params, data, files, version, kwargs):
+        if not self.single_flight or method != 'GET' or data is not None or files or kwargs.get('stream'):
+            return None
+        prepared = requests.PreparedRequest()
+        prepared.prepare_url(url, params)
+        session_headers = self.session.headers
+        return (
+            prepared.url,
+            version,
+            session_headers.get('Authorization'),
+            session_headers.get('X-Org-Id'),
+            session_headers.get('X-Cloud-Org-Id'),
+            tuple(sorted((kwargs.get('headers') or {}).items())),
+        )
+
+    def dereference(self, path):
+        if self.identity_map is None:
+            return self.get(path=path)
+
+        resource = self.identity_map.get(path)
+        if resource is None:
+            resource = self.get(path=path)
+            self.identity_map.set(path, resource)
+        return resource
+
+    def invalidate(self, path):
+        if self.identity_map is not None:
+            self.identity_map.delete(path)
 
     def build_url(self, path):
         return urljoin(self.base_url, path)
 
     def _request(self, method, url, data=None, files=None, version=None, headers=None, stream=False, params=None):
+        kwargs = self._prepare_request(
+            method=method,
+            url=url,
+            data=data,
+            files=files,
+            version=version,
+            headers=headers,
+            stream=stream,
+            params=params,
+        )
+        request_bytes = self._compress_body(kwargs)
+        cache_key, cached = self._add_validators(kwargs)
+        response = self._try_request(**kwargs)
+        self._report_sizes(kwargs, request_bytes, response)
+        return self._use_cached(cache_key, cached, response)
+
+    def _prepare_request(self, method, url, data=None, files=None, version=None, headers=None, stream=False,
+                         params=None):
         if headers is None:
             headers = {}
         # XXX: API does not always respect If-Match header :(
         if version is not None:
             headers['If-Match'] = '"{}"'.format(version)
         if data is not None:
-            data = json.dumps(data, default=encode_resource)
+            data = self.json_codec.dumps(data, default=encode_resource)
         logger.debug("HTTP %s %s DATA=%s", method, url, data)
 
         if files:
             headers['Content-Type'] = None
 
-        return self._try_request(
+        return dict(
             method=method,
             url=url,
             data=data,
@@ -152,39 +401,193 @@ class Connection(object):
             params=params,
         )
 
+    def _compress_body(self, kwargs):
+        """Gzip a large enough JSON body, return its size before that."""
+        data = kwargs['data']
+        if data is None:
+            return None if kwargs['files'] else 0
+        if isinstance(data, six.text_type):
+            data = kwargs['data'] = data.encode('utf-8')
+        size = len(data)
+        if self.compress_threshold is not None and size >= self.compress_threshold:
+            kwargs['data'] = compression.gzip(data)
+            kwargs['headers']['Content-Encoding'] = compression.GZIP
+        return size
+
+    def _report_sizes(self, kwargs, request_bytes, response):
+        if self.metrics_hook is None:
+            return
+        data = kwargs['data']
+        if kwargs['stream']:
+            response_bytes = response_wire_bytes = None
+        else:
+            response_bytes = len(response.content)
+            response_wire_bytes = self._wire_size(response, response_bytes)
+        self.metrics_hook(kwargs['method'], kwargs['url'], compression.TransferSizes(
+            request_bytes=request_bytes,
+            request_wire_bytes=len(data) if data is not None else request_bytes,
+            response_bytes=response_bytes,
+            response_wire_bytes=response_wire_bytes,
+        ))
+
+    def _wire_size(self, response, size):
+        """Size of the body of a read ``response`` before decoding."""
+        try:
+            # urllib3 counts bytes read from the socket
+            return response.raw.tell()
+        except (AttributeError, TypeError, ValueError):
+            pass
+        try:
+            return int(response.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return size
+
+    def _response_cache_key(self, kwargs):
+        if (self.response_cache is None or kwargs['method'] != 'GET' or kwargs['stream']
+                or kwargs['data'] is not None or kwargs['files'] or 'If-Match' in kwargs['headers']):
+            return None
+        prepared = requests.PreparedRequest()
+        prepared.prepare_url(kwargs['url'], kwargs['params'])
+        session_headers = self.session.headers
+        # the cache may be on disk, so credentials are only kept as a hash
+        credentials = hashlib.sha1(u'\n'.join(
+            session_headers.get(name) or u''
+            for name in _CREDENTIAL_HEADERS
+        ).encode('utf-8')).hexdigest()
+        # requests for next pages repeat session headers of the first one
+        skip = set(name.lower() for name in _CREDENTIAL_HEADERS)
+        headers = sorted(
+            (name, value) for name, value in kwargs['headers'].items()
+            if name.lower() not in skip
+        )
+        return u'{} {} {!r}'.format(prepared.url, credentials, headers)
+
+    def _add_validators(self, kwargs):
+        """Add validators of a cached response to request headers, return
+        ``(cache_key, cached)``."""
+        key = self._response_cache_key(kwargs)
+        if key is None:
+            return None, None
+
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            headers = kwargs['headers']
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+        return key, cached
+
+    def _use_cached(self, key, cached, response):
+        """Restore the body of a 304 response from the cache, or store a new
+        body with validators."""
+        if response.status_code == 304 and cached is None:
+            # validators came from the caller, there is no body to restore
+            raise exceptions.TrackerServerError(response)
+        if key is None:
+            return response
+
+        if response.status_code == 304 and cached is not None:
+            headers = CaseInsensitiveDict(cached['headers'])
+            headers.update(response.headers)
+            response.headers = headers
+            response.status_code = 200
+            response._content = cached['body'].encode('utf-8')
+        elif response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self.response_cache.set(key, {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'headers': dict(
+                        (name, value) for name, value in response.headers.items()
+                        if name.lower() not in _BODY_HEADERS
+                    ),
+                    'body': response.content.decode('utf-8'),
+                })
+        return response
+
     def _try_request(self, **kwargs):
         response = None
         exception = None
-        iterations = max(self.retries + 1, 1)
-
-        retry_delay = self.retries_initial_delay
-        multiplier = self.retries_delay_multiplier
-        limit = self.retries_delay_upper_limit
-
-        for retry in range(iterations):
+        retries = self._get_retry_policy().start()
+        endpoint = self._endpoint_key(kwargs['method'], kwargs['url'])
+
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            probe = self._enter_circuit(endpoint)
+            slot = None
+            dropped = failed = True
             try:
+                slot = self._acquire_slot()
                 response = self.session.request(**kwargs)
             except Exception as e:
                 exception = e
             else:
                 exception = None
-                if 500 <= response.status_code < 600 or response.status_code in {429, 409} and retry_delay > 0:
+                dropped = response.status_code in _THROTTLED
+                failed = response.status_code >= 500
+            finally:
+                self._release_slot(slot, dropped)
+                self._leave_circuit(endpoint, probe, failed)
+
+            if exception is None:
+                if retries.should_retry(response):
                     logger.warning(
                         "Request failed with status %d, retrying (%d)...",
-                        response.status_code, retry
+                        response.status_code, retries.attempt
                     )
                     self._log_error(logging.WARNING, response)
                 else:
                     break
 
-            if retry_delay > 0:
-                time.sleep(retry_delay)
-
-            if multiplier > 1:
-                retry_delay *= multiplier
-            if 0 < limit < retry_delay:
-                retry_delay = limit
+            delay = retries.next_delay(response if exception is None else None)
+            if delay is None:
+                break
+            if delay > 0:
+                time.sleep(delay)
+
+        return self._check_response(response, exception)
+
+    def _endpoint_key(self, method, url):
+        if self.circuit_breaker is None:
+            return None
+        path = urlparse(url).path
+        collection = CollectionMeta.matcher.match(path)
+        return method, collection.path if collection is not None else path
+
+    def _enter_circuit(self, endpoint):
+        if self.circuit_breaker is not None:
+            return self.circuit_breaker.enter(endpoint)
+        return False
+
+    def _leave_circuit(self, endpoint, probe, failed):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.leave(endpoint, probe, failed)
+
+    def _acquire_slot(self):
+        if self.concurrency_limiter is not None:
+            return self.concurrency_limiter.acquire()
+
+    def _release_slot(self, slot, dropped):
+        if slot is not None:
+            self.concurrency_limiter.release(slot, dropped)
+
+    def _get_retry_policy(self):
+        if self.retry_policy is not None:
+            return self.retry_policy
+        return RetryPolicy(
+            retries=self.retries,
+            initial_delay=self.retries_initial_delay,
+            multiplier=self.retries_delay_multiplier,
+            max_delay=self.retries_delay_upper_limit,
+            jitter=NO_JITTER,
+            respect_retry_after=False,
+        )
 
+    def _check_response(self, response, exception=None):
         if exception is not None:
             raise exceptions.TrackerRequestError(exception)
         elif 500 <= response.status_code < 600:
@@ -216,25 +619,57 @@ def decode_response(response, conn):
     if not response.content:
         return None
 
+    batch = ReferenceBatch(conn) if conn.batch_dereference else None
+
+    # Most of urls point to the API itself, their path is cut out without
+    # parsing the whole url
+    prefix = conn.base_url.rstrip('/') + '/'
+    prefix_length = len(prefix) - 1
+
+    def path_of(url):
+        url = url.encode('utf-8') if six.PY2 else url
+        if url.startswith(prefix) and not _URL_PATH_END.search(url, prefix_length):
+            return url[prefix_length:]
+        return urlparse(url).path
+
     def decode_object(obj):
         if 'self' in obj:
-            url = obj['self'].encode('utf-8') if six.PY2 else obj['self']
-            path = urlparse(url).path
-
-            return Reference(conn, path, obj)
+            reference = conn.reference_type(conn, path_of(obj['self']), obj)
+            if batch is not None:
+                batch.add(reference)
+            return reference
         return obj
 
+    def decode_lazily(obj):
+        if type(obj) is dict and 'self' in obj:
+            return Resource(conn, path_of(obj['self']), obj, object_hook=decode_object)
+        return apply_object_hook(obj, decode_object)
+
     try:
-        decoded = response.json(object_hook=decode_object)
+        if conn.lazy_decode:
+            decoded = conn.json_codec.loads(response.content)
+        else:
+            decoded = conn.json_codec.loads(response.content, object_hook=decode_object)
     except ValueError:
         raise exceptions.InvalidJSONResponse(response)
 
+    if conn.lazy_decode:
+        if isinstance(decoded, list):
+            decoded = [decode_lazily(item) for item in decoded]
+        else:
+            decoded = decode_lazily(decoded)
+    elif batch is not None:
+        # top-level objects become resources, they are not references
+        batch.discard(decoded if isinstance(decoded, list) else [decoded])
+
     if isinstance(decoded, Reference):
         return decoded.copy_into(conn, Resource)
     elif isinstance(decoded, list):
-        items = []
+        items = conn.list_type()
         for item in decoded:
-            if hasattr(item, '_path') and hasattr(item, '_value') and hasattr(item, '_local_fields_map'):
+            if isinstance(item, Resource):
+                r = item
+            elif hasattr(item, '_path') and hasattr(item, '_value') and hasattr(item, '_local_fields_map'):
                 r = Resource(conn, item._path, item._value, item._local_fields_map)
             elif hasattr(item, '_path') and hasattr(item, '_value'):
                 r = Resource(conn, item._path, item._value)
@@ -248,9 +683,9 @@ def decode_response(response, conn):
                 'response': response,
             }
             if 'seek' in response.links:
-                return SeekablePaginatedList(**params)
+                return conn.seekable_paginated_list_type(**params)
             else:
-                return PaginatedList(**params)
+                return conn.paginated_list_type(**params)
         else:
             return items
     else:
@@ -29,6 +29,29 @@ class UnencodableValue(TrackerClientError, ValueError):
         )
 
 
+class ReferenceNotLoaded(TrackerClientError, AttributeError):
+    """Access to a field of a reference which has not been fetched yet."""
+
+
+@six.python_2_unicode_compatible
+class CircuitOpen(TrackerClientError):
+    """Request not sent, because its endpoint keeps failing."""
+
+    key = None
+    retry_after = None
+
+    def __init__(self, key, retry_after):
+        self.key = key
+        self.retry_after = retry_after
+        super(CircuitOpen, self).__init__(key, retry_after)
+
+    def __str__(self):
+        return "Circuit for {} is open, retry in {:.1f} s".format(
+            " ".join(self.key) if isinstance(self.key, tuple) else self.key,
+            self.retry_after,
+        )
+
+
 @six.python_2_unicode_compatible
 class TrackerRequestError(TrackerError, IOError):
     """Connection failure below HTTP layer."""
@@ -137,6 +160,10 @@ class PreconditionRequired(TrackerServerError):
     pass
 
 
+class TooManyRequests(TrackerServerError):
+    pass
+
+
 STATUS_CODES = {
     400: BadRequest,
     403: Forbidden,
@@ -145,4 +172,5 @@ STATUS_CODES = {
     412: PreconditionFailed,
     422: UnprocessableEntity,
     428: PreconditionRequired,
+    429: TooManyRequests,
 }
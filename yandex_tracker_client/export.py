@@ -0,0 +1,176 @@
+# coding: utf-8
+"""Export of search results as tables.
+
+Columns are given as dotted field paths, e.g. ``['key', 'status.key',
+'assignee.login', 'followers.id']``. Paths through a list (``followers``)
+give a list of values. A reference or resource at the end of a path is
+exported as its key or id.
+
+References are not dereferenced unless ``dereference=True``: a field which
+is not in the response is exported as ``None``.
+
+Paginated results are consumed with ``iter_streaming()``, so only one page
+of resources is kept in memory at a time.
+
+Results of ``AsyncTrackerClient`` are exported row by row with
+``aio.aiter_rows()``.
+
+Record batches require ``pyarrow``, data frames require ``pandas``.
+"""
+from __future__ import absolute_import
+
+import csv
+import json
+
+import six
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+from . import exceptions
+from .objects import Object, PaginatedList, Reference, object_id
+
+__all__ = [
+    'iter_rows', 'iter_batches', 'iter_record_batches',
+    'to_pandas', 'write_csv', 'write_jsonl',
+]
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def iter_rows(objects, fields, dereference=False):
+    """Lists of values of ``fields``, one per object."""
+    paths = [field.split('.') for field in fields]
+    for obj in _iter_once(objects):
+        yield [_simplify(_get_path(obj, path, dereference)) for path in paths]
+
+
+def iter_batches(objects, fields, batch_size=DEFAULT_BATCH_SIZE, dereference=False):
+    """Dicts of field -> list of values, for ``batch_size`` objects each."""
+    columns = [[] for _ in fields]
+    size = 0
+    for row in iter_rows(objects, fields, dereference):
+        for column, value in zip(columns, row):
+            column.append(value)
+        size += 1
+        if size == batch_size:
+            yield dict(zip(fields, columns))
+            columns = [[] for _ in fields]
+            size = 0
+    if size:
+        yield dict(zip(fields, columns))
+
+
+def iter_record_batches(objects, fields, batch_size=DEFAULT_BATCH_SIZE, dereference=False, schema=None):
+    """``pyarrow.RecordBatch`` objects of ``batch_size`` rows each.
+
+    Column types are inferred for each batch unless ``schema`` is given.
+    """
+    _require(pyarrow, 'pyarrow')
+    for batch in iter_batches(objects, fields, batch_size, dereference):
+        if schema is None:
+            arrays = [pyarrow.array(batch[field]) for field in fields]
+            yield pyarrow.RecordBatch.from_arrays(arrays, names=list(fields))
+        else:
+            arrays = [pyarrow.array(batch[field], type=schema.field(field).type) for field in fields]
+            yield pyarrow.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def to_pandas(objects, fields, batch_size=DEFAULT_BATCH_SIZE, dereference=False):
+    """``pandas.DataFrame`` with a column per field."""
+    _require(pandas, 'pandas')
+    frames = [
+        pandas.DataFrame(batch, columns=list(fields))
+        for batch in iter_batches(objects, fields, batch_size, dereference)
+    ]
+    if not frames:
+        return pandas.DataFrame(columns=list(fields))
+    return pandas.concat(frames, ignore_index=True)
+
+
+def write_csv(objects, fields, file, dereference=False, header=True, **fmtparams):
+    """Write rows into ``file`` in CSV format.
+
+    Lists are joined with commas, dicts are written as JSON.
+    """
+    writer = csv.writer(file, **fmtparams)
+    if header:
+        writer.writerow([_csv_value(field) for field in fields])
+    for row in iter_rows(objects, fields, dereference):
+        writer.writerow([_csv_value(value) for value in row])
+
+
+def write_jsonl(objects, fields, file, dereference=False):
+    """Write rows into ``file`` as JSON objects, one per line."""
+    for row in iter_rows(objects, fields, dereference):
+        file.write(json.dumps(dict(zip(fields, row)), ensure_ascii=False))
+        file.write(u'\n')
+
+
+def _iter_once(objects):
+    if isinstance(objects, PaginatedList):
+        if hasattr(objects, '__aiter__'):
+            raise TypeError(
+                "{} is iterated with `async for`, use aio.aiter_rows()".format(objects.__class__.__name__)
+            )
+        return objects.iter_streaming()
+    return iter(objects)
+
+
+def _get_path(value, path, dereference):
+    for index, name in enumerate(path):
+        if isinstance(value, list):
+            rest = path[index:]
+            return [_get_path(item, rest, dereference) for item in value]
+        value = _get_field(value, name, dereference)
+        if value is None:
+            return None
+    return value
+
+
+def _get_field(value, name, dereference):
+    if isinstance(value, Object):
+        if value._lazy is not None:
+            return value._raw_field_or_none(name)
+        field = value._value.get(name)
+        if field is None and dereference and isinstance(value, Reference):
+            field = getattr(value._dereference(), name, None)
+        return field
+    elif isinstance(value, dict):
+        return value.get(name)
+    return None
+
+
+def _simplify(value):
+    if isinstance(value, Object):
+        return object_id(value)
+    elif isinstance(value, list):
+        return [_simplify(item) for item in value]
+    elif isinstance(value, dict):
+        return dict((key, _simplify(item)) for key, item in six.iteritems(value))
+    return value
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        value = u','.join(six.text_type(item) for item in value if item is not None)
+    elif isinstance(value, dict):
+        value = json.dumps(value, ensure_ascii=False)
+    if six.PY2 and isinstance(value, six.text_type):
+        # csv module of Python 2 works with bytes
+        value = value.encode('utf-8')
+    return value
+
+
+def _require(module, name):
+    if module is None:
+        raise exceptions.TrackerClientError(
+            "{0} is required for this export, install {0}".format(name)
+        )
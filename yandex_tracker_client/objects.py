@@ -2,9 +2,12 @@
 from __future__ import absolute_import
 
 import functools
+import itertools
 import json
 import logging
 import textwrap
+import threading
+from collections import OrderedDict
 
 try:
     from collections import MutableMapping
@@ -12,9 +15,12 @@ except ImportError:
     from collections.abc import MutableMapping
 
 import six
+from six.moves import range
 from six.moves.urllib.parse import urlsplit, urlunsplit
 
-from .collections import match_collection
+from . import compression, parallel
+from .codec import apply_object_hook
+from .collections import Issues, match_collection
 
 __all__ = [
     'Object',
@@ -24,6 +30,12 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+# Headers of the first page request which are not valid for other pages:
+# they describe its encoded body or validate its cached response
+_PAGE_REQUEST_SKIP_HEADERS = frozenset([
+    'content-encoding', 'content-length', 'if-none-match', 'if-modified-since',
+])
+
 
 class FieldLoggingDict(MutableMapping, dict):
     def __init__(self, delegate, obj):
@@ -51,17 +63,91 @@ class FieldLoggingDict(MutableMapping, dict):
         return dict.__contains__(self, x)
 
 
+class LazyFields(object):
+    """Parsed fields of a lazily decoded object, until it is completely decoded."""
+    __slots__ = ('raw', 'object_hook', 'decoded_keys')
+
+    def __init__(self, raw, object_hook):
+        self.raw = raw
+        self.object_hook = object_hook
+        self.decoded_keys = set()
+
+    def decode(self, key):
+        value = self.raw[key]
+        if key not in self.decoded_keys:
+            value = self.raw[key] = apply_object_hook(value, self.object_hook)
+            self.decoded_keys.add(key)
+        return value
+
+    def decode_all(self):
+        for key in self.raw:
+            self.decode(key)
+        return self.raw
+
+
 class Object(object):
-    def __init__(self, connection, path, value, local_fields_map=None):
+    # Objects are numerous, so they have no __dict__. Connection and other
+    # common attributes are taken from the collection, shared by all
+    # objects of the same type.
+    __slots__ = ('_collection', '_path', '_local_fields_map', '_decoded_value', '_version', '_lazy', '__weakref__')
+
+    def __init__(self, connection, path, value, local_fields_map=None, object_hook=None):
         self._collection = connection._client._get_collection(match_collection(path))
         logger.debug('%s -> %s', path, self._collection)
-        self._connection = connection
         self._path = path
-        self._has_local_fields = self._collection.has_local_fields
-        self._local_fields_map = {} if local_fields_map is None else local_fields_map
-        self._value = self._process_value(value)
+        self._local_fields_map = local_fields_map or None
+        if object_hook is None:
+            self._lazy = None
+            self._decoded_value = self._process_value(value)
+        else:
+            self._lazy = LazyFields(value, object_hook)
+            self._decoded_value = None
         self._version = value.get('version')
 
+    @property
+    def _connection(self):
+        return self._collection._connection
+
+    @property
+    def _has_local_fields(self):
+        return self._collection.has_local_fields
+
+    @property
+    def _value(self):
+        if self._lazy is not None:
+            self._decoded_value = self._process_value(self._lazy.decode_all())
+            self._lazy = None
+        return self._decoded_value
+
+    def _assign(self, other):
+        """Make this object a copy of ``other``, e.g. to update it in place."""
+        for cls in type(other).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if name != '__weakref__':
+                    setattr(self, name, getattr(other, name))
+        if type(other).__dictoffset__:
+            # subclasses without __slots__
+            self.__dict__ = other.__dict__
+
+    def _get_raw_field(self, key):
+        """Value of ``key`` of a lazily decoded object, decoding only this field.
+
+        Raises KeyError if the object has no such field.
+        """
+        raw = self._lazy.raw
+        if key in raw:
+            return self._lazy.decode(key)
+        if self._has_local_fields and any('--' in field for field in raw):
+            # ``key`` may be an alias of a local field
+            return self._value[key]
+        raise KeyError(key)
+
+    def _raw_field_or_none(self, key):
+        try:
+            return self._get_raw_field(key)
+        except KeyError:
+            return None
+
     def _local_fields_map_type(self):
         return dict
 
@@ -77,17 +163,29 @@ class Object(object):
                     if local_field_key in value:
                         local_field_key = 'local_{}'.format(local_field_key)
                     local_fields_to_add[local_field_key] = field_value
+                    if self._local_fields_map is None:
+                        self._local_fields_map = {}
                     self._local_fields_map[local_field_key] = field
             value.update(local_fields_to_add)
             if type(value) == self._local_fields_map_type():
+                if type(value) is FieldLoggingDict:
+                    # don't keep alive the object the value was copied from
+                    value._obj = self
                 return value
             return self._local_fields_map_type()(value, self)
 
         return value
 
+    def _get_local_fields_map(self):
+        if self._lazy is not None and self._has_local_fields and any('--' in field for field in self._lazy.raw):
+            # the map is filled when the fields are decoded
+            self._value
+        return self._local_fields_map
+
     def process_kwargs(self, kwargs):
-        if self._has_local_fields:
-            for field_key, local_field_key in six.iteritems(self._local_fields_map):
+        local_fields_map = self._get_local_fields_map()
+        if self._has_local_fields and local_fields_map:
+            for field_key, local_field_key in six.iteritems(local_fields_map):
                 if field_key in kwargs:
                     kwargs[local_field_key] = kwargs.pop(field_key)
                     Object._log_local_key_usage_warning(field_key, local_field_key, 'update')
@@ -95,8 +193,9 @@ class Object(object):
         return kwargs
 
     def log_local_key_usage(self, key):
-        if self._has_local_fields and key in self._local_fields_map:
-            local_field_key = self._local_fields_map[key]
+        local_fields_map = self._get_local_fields_map()
+        if self._has_local_fields and local_fields_map and key in local_fields_map:
+            local_field_key = local_fields_map[key]
             Object._log_local_key_usage_warning(key, local_field_key, 'access')
             self._collection._read_local_field = local_field_key
 
@@ -111,27 +210,104 @@ class Object(object):
                        .format(action.title(), field_key, local_field_key,
                                action.lower(), action.lower(), field_key))
 
-    def as_dict(self):
-        def to_simple(value):
-            if isinstance(value, dict):
-                return dict((k, to_simple(v)) for k, v in six.iteritems(value))
+    def as_dict(self, flatten_references=False, skip_defaults=False):
+        """Fields of the object as plain dicts and lists.
+
+        With ``flatten_references``, nested references and resources are
+        replaced by their key or id. With ``skip_defaults``, fields equal
+        to their default value (``None`` or ``[]`` for most fields) are
+        omitted.
+        """
+        return to_simple(self, flatten_references, skip_defaults)
+
+    def write_json(self, file, flatten_references=False, skip_defaults=False, **kwargs):
+        """Write the object as JSON into ``file`` chunk by chunk, without
+        building its ``as_dict()`` first. ``kwargs`` are passed to
+        ``json.JSONEncoder``.
+        """
+        def default(value):
+            if isinstance(value, Object):
+                if flatten_references and value is not self:
+                    return object_id(value)
+                if skip_defaults:
+                    return dict(_iter_fields(value, skip_defaults))
+                return value._value
+            elif isinstance(value, (set, tuple)):
+                return list(value)
+            raise TypeError(value)
+
+        for chunk in json.JSONEncoder(default=default, **kwargs).iterencode(self):
+            file.write(chunk)
 
-            elif isinstance(value, Object):
-                return value.as_dict()
+    def __reduce__(self):
+        return (self.__class__, (self._connection, self._path, self._value))
 
-            elif isinstance(value, (list, set, tuple)):
-                return [to_simple(v) for v in value]
 
-            else:
-                return value
+def object_id(obj):
+    """Key or id of a resource or reference, without dereferencing it."""
+    fields = obj._value
+    return next((fields[name] for name in ('key', 'id') if name in fields), None)
+
+
+def to_simple(value, flatten_references=False, skip_defaults=False):
+    """Copy of ``value`` where objects are replaced with dicts of their
+    fields (see ``Object.as_dict``).
+
+    Works with an explicit stack, so deeply nested values don't hit the
+    recursion limit.
+    """
+    result = [None]
+    # (container, key, value): simplified value goes to container[key]
+    stack = [(result, 0, value)]
+    top_level = value
+
+    while stack:
+        container, key, value = stack.pop()
+
+        if isinstance(value, Object):
+            if flatten_references and value is not top_level:
+                container[key] = object_id(value)
+                continue
+            items = _iter_fields(value, skip_defaults)
+        elif isinstance(value, dict):
+            items = six.iteritems(value)
+        elif isinstance(value, (list, set, tuple)):
+            simple = container[key] = [None] * len(value)
+            for index, item in enumerate(value):
+                if isinstance(item, _CONTAINER_TYPES):
+                    stack.append((simple, index, item))
+                else:
+                    simple[index] = item
+            continue
+        else:
+            container[key] = value
+            continue
 
-        return to_simple(self._value)
+        simple = container[key] = {}
+        for name, item in items:
+            simple[name] = item
+            if isinstance(item, _CONTAINER_TYPES):
+                stack.append((simple, name, item))
 
-    def __reduce__(self):
-        return (self.__class__, (self._connection, self._path, self._value))
+    return result[0]
+
+
+_CONTAINER_TYPES = (dict, list, set, tuple, Object)
+
+
+def _iter_fields(obj, skip_defaults):
+    if not skip_defaults:
+        return six.iteritems(obj._value)
+
+    defaults = obj._collection.fields
+    return (
+        (name, value) for name, value in six.iteritems(obj._value)
+        if name not in defaults or value != defaults[name]
+    )
 
 
 class Resource(Object):
+    __slots__ = ()
 
     def _local_fields_map_type(self):
         return FieldLoggingDict
@@ -164,6 +340,16 @@ class Resource(Object):
             method = collection._injected_properties[key]
             return method(collection, self)
 
+        if self._lazy is not None:
+            try:
+                return self._get_raw_field(key)
+            except KeyError:
+                pass
+            if self._lazy is not None:
+                if key in collection.fields:
+                    return collection.fields[key]
+                raise AttributeError(key)
+
         if key in collection.fields:
             return self._value.get(key, collection.fields[key])
         elif key in self._value:
@@ -213,7 +399,12 @@ class Resource(Object):
 
 
 class Reference(Object):
-    _target = None
+    __slots__ = ('_target', '_batch')
+
+    def __init__(self, *args, **kwargs):
+        self._target = None
+        self._batch = None
+        super(Reference, self).__init__(*args, **kwargs)
 
     def __repr__(self):
         display = self._value.get('display', '')
@@ -239,8 +430,13 @@ class Reference(Object):
         return getattr(self._dereference(), key)
 
     def _dereference(self):
+        if self._connection.identity_map is not None:
+            # the shared entry may have expired or been invalidated
+            self._target = self._connection.identity_map.get(self._path)
+        if self._target is None and self._batch is not None:
+            self._batch.resolve(self)
         if self._target is None:
-            self._target = self._connection.get(path=self._path)
+            self._target = self._connection.dereference(self._path)
         return self._target
 
     def _repr_pretty_(self, p, cycle):
@@ -265,6 +461,122 @@ class Reference(Object):
                     p.text(self._value['display'])
 
 
+class ReferenceBatch(object):
+    """References decoded from one response.
+
+    Dereferencing one of them fetches targets of all pending references
+    to the same collection at once.
+    """
+
+    def __init__(self, connection, workers=8):
+        self._connection = connection
+        self._workers = workers
+        self._references = []
+        self._lock = threading.Lock()
+
+    def add(self, reference):
+        reference._batch = self
+        self._references.append(reference)
+
+    def discard(self, references):
+        ids = set(id(reference) for reference in references)
+        self._references = [
+            reference for reference in self._references
+            if id(reference) not in ids
+        ]
+
+    def resolve(self, reference):
+        with self._lock:
+            collection = type(reference._collection)
+            group = [ref for ref in self._references if type(ref._collection) is collection]
+            self._references = [ref for ref in self._references if type(ref._collection) is not collection]
+            resolve_references(self._connection, group, self._workers)
+
+
+def collect_references(objects, attrs=None):
+    """References among ``objects`` and in their ``attrs``
+    (all top-level fields by default)."""
+    if isinstance(objects, Object):
+        objects = [objects]
+
+    for obj in objects:
+        if isinstance(obj, Reference):
+            yield obj
+        elif isinstance(obj, Object):
+            if attrs is None:
+                values = list(obj._value.values())
+            elif obj._lazy is not None:
+                values = [obj._raw_field_or_none(attr) for attr in attrs]
+            else:
+                values = [obj._value.get(attr) for attr in attrs]
+            for value in values:
+                for item in (value if isinstance(value, list) else [value]):
+                    if isinstance(item, Reference):
+                        yield item
+
+
+def resolve_references(connection, references, workers=8):
+    """Fetch targets of ``references`` with as few requests as possible.
+
+    Each distinct path is fetched once: issues by chunked search,
+    other resources by GET requests made in ``workers`` threads.
+    Returns the list of fetched targets.
+    """
+    pending = _pending_references(references, connection.identity_map)
+    issue_paths, issue_keys, other_paths = _split_pending(pending)
+
+    targets = {}
+    if issue_paths:
+        issues = connection._client._get_collection(Issues)
+        targets.update(zip(issue_paths, issues.get_many(issue_keys, workers=workers)))
+
+    def get(path):
+        return connection.get(path=path)
+
+    if workers > 1:
+        found = parallel.imap(get, other_paths, workers=workers)
+    else:
+        found = (get(path) for path in other_paths)
+    targets.update(zip(other_paths, found))
+
+    return _fill_targets(pending, targets, connection.identity_map)
+
+
+def _pending_references(references, identity_map=None):
+    pending = OrderedDict()
+    for reference in references:
+        if reference._target is None and identity_map is not None:
+            reference._target = identity_map.get(reference._path)
+        if reference._target is None:
+            pending.setdefault(reference._path, []).append(reference)
+    return pending
+
+
+def _split_pending(pending):
+    issue_paths, issue_keys, other_paths = [], [], []
+    for path, references in six.iteritems(pending):
+        reference = references[0]
+        if isinstance(reference._collection, Issues) and 'key' in reference._value:
+            issue_paths.append(path)
+            issue_keys.append(reference._value['key'])
+        else:
+            other_paths.append(path)
+    return issue_paths, issue_keys, other_paths
+
+
+def _fill_targets(pending, targets, identity_map=None):
+    resolved = []
+    for path, references in six.iteritems(pending):
+        target = targets.get(path)
+        if target is not None:
+            for reference in references:
+                reference._target = target
+            if identity_map is not None:
+                identity_map.set(path, target)
+            resolved.append(target)
+    return resolved
+
+
 class PaginatedList(object):
     def __init__(self, connection, head, response):
         self._data = head
@@ -273,6 +585,8 @@ class PaginatedList(object):
         self._original_request = response.request
 
         self._one_page = False  # итерироваться только по этой странице?
+        # how many next pages to download in background while iterating
+        self.prefetch_pages = connection.prefetch_pages
 
     def _strip_host(self, url):
         u = urlsplit(url)
@@ -282,28 +596,63 @@ class PaginatedList(object):
         for item in self._data:
             yield item
 
-        if not self._one_page:
-            next_page = self._next_page
+        for data in self._next_pages():
+            for item in data:
+                yield item
 
-            while next_page is not None:
-                page = self._get_page_data(next_page)
-                if isinstance(page, list):
-                    next_page = None
-                    data = page
-                else:
-                    next_page = page._next_page
-                    data = page._data
+    def iter_streaming(self):
+        """Iterate once over all items, releasing them as they are yielded.
 
-                for item in data:
-                    yield item
+        Only the page being consumed (plus ``prefetch_pages`` buffered ones)
+        stays in memory, so memory use does not grow with the number of
+        results. The first page is released too, so the list is empty
+        afterwards.
+        """
+        pages = itertools.chain([self._data], self._next_pages())
+        self._data = []
+        self._one_page = True
+
+        for data in pages:
+            data.reverse()
+            while data:
+                yield data.pop()
+
+    def _next_pages(self):
+        if self._one_page:
+            return iter(())
+
+        pages = self._iter_pages(self._next_page)
+        if self.prefetch_pages > 0:
+            pages = parallel.prefetch(pages, self.prefetch_pages)
+        return pages
+
+    def _iter_pages(self, next_page):
+        while next_page is not None:
+            page = self._get_page_data(next_page)
+            if isinstance(page, list):
+                next_page = None
+                data = page
+            else:
+                next_page = page._next_page
+                data = page._data
+
+            yield data
 
     def _get_page_data(self, path):
         req = self._original_request
         method = req.method
         data = req.body
-        if data and isinstance(data, six.string_types):
-            data = json.loads(data)
-        headers = req.headers
+        headers = {}
+        encoding = None
+        for name, value in req.headers.items():
+            if name.lower() == 'content-encoding':
+                encoding = value
+            if name.lower() not in _PAGE_REQUEST_SKIP_HEADERS:
+                headers[name] = value
+        if data and isinstance(data, (six.text_type, six.binary_type)):
+            if encoding is not None:
+                data = compression.decode(data, encoding)
+            data = self._connection.json_codec.loads(data)
         return self._connection.request(method, path, data=data, headers=headers)
 
 
@@ -328,3 +677,31 @@ class SeekablePaginatedList(PaginatedList):
         if isinstance(plist, SeekablePaginatedList):
             plist._one_page = True
         return plist
+
+    def iter_parallel(self, workers=8, ordered=True, lookahead=None):
+        """Iterate over all pages, fetching pages 2..N in parallel by number.
+
+        At most ``lookahead`` pages (``workers`` by default) are fetched ahead
+        of the consumer. With ``ordered=False`` pages are yielded in
+        completion order.
+        """
+        for item in self._data:
+            yield item
+
+        if not self._one_page:
+            pages = parallel.imap(
+                self._get_page_items,
+                range(2, self.pages_count + 1),
+                workers=workers,
+                lookahead=lookahead,
+                ordered=ordered,
+            )
+            for data in pages:
+                for item in data:
+                    yield item
+
+    def _get_page_items(self, number):
+        page = self.get_page(number)
+        if isinstance(page, list):
+            return page
+        return page._data
@@ -0,0 +1,162 @@
+# coding: utf-8
+
+import sys
+import threading
+from multiprocessing.pool import ThreadPool
+
+import six
+from six.moves import queue
+
+_ITEM, _ERROR, _END = range(3)
+_POLL_INTERVAL = 0.1
+
+
+def imap(func, iterable, workers=8, lookahead=None, ordered=True):
+    """Lazy ``map`` of ``func`` over ``iterable`` on a pool of threads.
+
+    No more than ``lookahead`` (``workers`` by default) results are computed
+    ahead of the consumer. With ``ordered=False`` results are yielded as
+    soon as they are ready. An exception raised by ``func`` is re-raised
+    when its result is reached.
+    """
+    lookahead = max(lookahead or workers, 1)
+    done = queue.Queue()
+
+    def call(index, arg):
+        try:
+            done.put((index, func(arg), None))
+        except Exception:
+            done.put((index, None, sys.exc_info()))
+
+    pool = ThreadPool(workers)
+    try:
+        args = enumerate(iterable)
+        scheduled = 0
+        yielded = 0
+        ready = {}
+        while True:
+            while scheduled - yielded < lookahead:
+                try:
+                    index, arg = next(args)
+                except StopIteration:
+                    break
+                pool.apply_async(call, (index, arg))
+                scheduled += 1
+
+            if yielded == scheduled:
+                return
+
+            if ordered:
+                while yielded not in ready:
+                    index, result, exc_info = done.get()
+                    ready[index] = (result, exc_info)
+                result, exc_info = ready.pop(yielded)
+            else:
+                _, result, exc_info = done.get()
+
+            if exc_info is not None:
+                six.reraise(*exc_info)
+            yielded += 1
+            yield result
+    finally:
+        pool.terminate()
+
+
+def prefetch(iterable, depth=1):
+    """Iterate over ``iterable`` in a background thread.
+
+    Up to ``depth`` items are produced ahead of the consumer. An exception
+    raised by ``iterable`` is re-raised after the items produced before
+    it. Abandoning the iterator stops the background thread.
+    """
+    buffer = queue.Queue(maxsize=max(depth, 1))
+    stop = threading.Event()
+
+    def put(kind, value):
+        while not stop.is_set():
+            try:
+                buffer.put((kind, value), timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(_ITEM, item):
+                    return
+        except Exception:
+            put(_ERROR, sys.exc_info())
+        else:
+            put(_END, None)
+
+    thread = threading.Thread(target=produce)
+    thread.daemon = True
+    thread.start()
+    try:
+        while True:
+            kind, value = buffer.get()
+            if kind == _END:
+                return
+            elif kind == _ERROR:
+                six.reraise(*value)
+            yield value
+    finally:
+        stop.set()
+
+
+class SingleFlight(object):
+    """Runs concurrent calls with the same key once.
+
+    A call made while another one with the same key is running waits for
+    it and gets its result (or its exception) instead of running again.
+    A call made after it finished runs anew, so nothing is cached.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # calls in flight belong to this process
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def do(self, key, func, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.exc_info is not None:
+                six.reraise(*call.exc_info)
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException:
+            call.exc_info = sys.exc_info()
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def __len__(self):
+        return len(self._calls)
+
+
+class _Call(object):
+    __slots__ = ('done', 'result', 'exc_info')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exc_info = None
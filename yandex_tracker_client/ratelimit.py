@@ -0,0 +1,110 @@
+# coding: utf-8
+from __future__ import absolute_import
+
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from . import exceptions
+from .cache import timer
+
+
+class TokenBucket(object):
+    """Limits requests to ``rate`` per second with bursts of up to ``burst``
+    requests (``rate`` by default).
+
+    ``reserve()`` takes a token and returns how many seconds the caller
+    must wait before using it. Tokens are handed out in order of
+    ``reserve()`` calls, so waiting callers form a queue instead of
+    competing for the next free token.
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else rate)
+        self._tokens = self.burst
+        self._updated = timer()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens=1):
+        with self._lock:
+            self._tokens, self._updated, wait = _take(
+                self._tokens, self._updated, timer(), tokens, self.rate, self.burst
+            )
+        return wait
+
+    def acquire(self, tokens=1):
+        """Block until ``tokens`` may be used."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+
+class FileTokenBucket(TokenBucket):
+    """``TokenBucket`` whose state is kept in ``path`` under an exclusive
+    file lock, so that all processes on the host using the same file share
+    the limit.
+
+    ``path`` is required: use one file per organisation, in a directory
+    other users can't write to. The file is created readable and writable
+    by its owner only.
+
+    Requires ``fcntl`` (POSIX).
+    """
+
+    def __init__(self, rate, burst=None, path=None):
+        if fcntl is None:
+            raise exceptions.TrackerClientError("FileTokenBucket requires fcntl, which is not available")
+        if path is None:
+            raise ValueError("path of the state file is required")
+        super(FileTokenBucket, self).__init__(rate, burst)
+        self.path = path
+
+    def reserve(self, tokens=1):
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                state, updated = self._read(fd)
+                # wall clock, the only one shared between processes
+                state, updated, wait = _take(state, updated, time.time(), tokens, self.rate, self.burst)
+                self._write(fd, state, updated)
+            finally:
+                os.close(fd)
+        return wait
+
+    def _read(self, fd):
+        os.lseek(fd, 0, os.SEEK_SET)
+        data = os.read(fd, 64)
+        try:
+            tokens, updated = data.split()
+            return float(tokens), float(updated)
+        except ValueError:
+            return self.burst, time.time()
+
+    def _write(self, fd, tokens, updated):
+        data = '{!r} {!r}'.format(tokens, updated).encode('ascii')
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, data)
+        os.ftruncate(fd, len(data))
+
+
+def _take(available, updated, now, tokens, rate, burst):
+    """New ``(available, updated)`` after taking ``tokens`` at ``now``, and
+    the wait until they are refilled.
+
+    ``available`` goes below zero while callers wait for their tokens.
+    """
+    if now > updated:
+        available = min(burst, available + (now - updated) * rate)
+        updated = now
+    available -= tokens
+    wait = -available / rate if available < 0 else 0.0
+    return available, updated, wait
@@ -0,0 +1,156 @@
+# coding: utf-8
+from __future__ import absolute_import
+
+import calendar
+import random
+import time
+from email.utils import parsedate_tz
+
+from .cache import timer
+
+NO_JITTER = None
+FULL_JITTER = 'full'
+DECORRELATED_JITTER = 'decorrelated'
+
+
+class RetryPolicy(object):
+    """When and how long to wait before repeating a failed request.
+
+    Connection errors and 5xx responses are retried up to ``retries``
+    times. 429 and 409 responses are retried if the delay is not zero or
+    the server sent ``Retry-After``.
+
+    The delay starts at ``initial_delay`` and is multiplied by
+    ``multiplier`` after every attempt, up to ``max_delay`` (``0`` means no
+    limit). ``jitter`` spreads delays of concurrent clients, so that they
+    don't come back at the same moment:
+
+    * ``FULL_JITTER``: a random delay between zero and the current one;
+    * ``DECORRELATED_JITTER``: a random delay between ``initial_delay`` and
+      three times the previous delay, up to ``max_delay``.
+
+    Unless ``respect_retry_after`` is false, ``Retry-After`` of 429 and
+    503 responses replaces the delay. With jitter, a random share of up to
+    one more ``Retry-After`` is added, so that clients throttled together
+    don't return together. If it is longer than ``max_retry_after``
+    seconds, the request is not retried.
+
+    ``budget`` limits the total time in seconds of one call, counted from
+    its start and including the time spent in requests: a retry whose
+    delay would end after the budget is not made.
+    """
+
+    retry_after_statuses = frozenset([429, 503])
+
+    def __init__(self,
+                 retries=10,
+                 initial_delay=0.1,
+                 multiplier=2,
+                 max_delay=10,
+                 jitter=FULL_JITTER,
+                 budget=None,
+                 max_retry_after=120,
+                 respect_retry_after=True,
+                 ):
+        if jitter not in (NO_JITTER, FULL_JITTER, DECORRELATED_JITTER):
+            raise ValueError("Unknown jitter: {!r}".format(jitter))
+        self.retries = retries
+        self.initial_delay = initial_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.budget = budget
+        self.max_retry_after = max_retry_after
+        self.respect_retry_after = respect_retry_after
+
+    def start(self):
+        """State of retries of a single call."""
+        return Retries(self)
+
+    def is_retriable(self, response, delay):
+        status_code = response.status_code
+        if 500 <= status_code < 600:
+            return True
+        if status_code in (429, 409):
+            return delay > 0 or self.retry_after(response) is not None
+        return False
+
+    def retry_after(self, response):
+        """Seconds from ``Retry-After`` header of ``response``, or ``None``."""
+        if (not self.respect_retry_after or response is None
+                or response.status_code not in self.retry_after_statuses):
+            return None
+
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            pass
+
+        date = parsedate_tz(value)
+        if date is None:
+            return None
+        timestamp = calendar.timegm(date[:9]) - (date[9] or 0)
+        return max(timestamp - time.time(), 0)
+
+    def next_delay(self, delay):
+        """Delay after ``delay``, without jitter."""
+        if self.multiplier > 1:
+            delay *= self.multiplier
+        return self._cap(delay)
+
+    def jittered(self, delay, previous):
+        """Delay to wait instead of ``delay``; ``previous`` is the
+        previous jittered one."""
+        if self.jitter == FULL_JITTER:
+            return random.uniform(0, delay)
+        elif self.jitter == DECORRELATED_JITTER:
+            return self._cap(random.uniform(self.initial_delay, max(previous, self.initial_delay) * 3))
+        return delay
+
+    def _cap(self, delay):
+        if 0 < self.max_delay < delay:
+            return self.max_delay
+        return delay
+
+
+class Retries(object):
+    """Attempts of one call made under a ``RetryPolicy``."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.attempt = 0
+        self.delay = policy.initial_delay
+        self.previous = policy.initial_delay
+        self.deadline = timer() + policy.budget if policy.budget is not None else None
+
+    def should_retry(self, response):
+        return self.policy.is_retriable(response, self.delay)
+
+    def next_delay(self, response=None):
+        """Seconds to wait before the next attempt after a failed one, or
+        ``None`` if the call should give up. ``response`` is ``None`` if
+        the request failed below HTTP."""
+        policy = self.policy
+        self.attempt += 1
+        if self.attempt > policy.retries:
+            return None
+
+        delay = policy.jittered(self.delay, self.previous)
+        self.previous = delay
+        self.delay = policy.next_delay(self.delay)
+
+        retry_after = policy.retry_after(response)
+        if retry_after is not None:
+            if policy.max_retry_after is not None and retry_after > policy.max_retry_after:
+                return None
+            if policy.jitter is NO_JITTER:
+                delay = retry_after
+            else:
+                delay = retry_after + random.uniform(0, max(retry_after, policy.initial_delay))
+
+        if self.deadline is not None and timer() + delay > self.deadline:
+            return None
+        return delay
@@ -2,42 +2,107 @@
 
 import re
 
+from .cache import LRUCache
+
 VARIABLE = re.compile(r'{([\w\d\-_\.]+)}')
+VARIABLE_VALUE = r'[\w\d\-\_\.]+'
+VARIABLE_VALUE_RE = re.compile(VARIABLE_VALUE + r'\Z')
+VARIABLE_VALUE_START_RE = re.compile(VARIABLE_VALUE)
 
 
 class Matcher(object):
+    """Finds the value registered for the first (by priority) uri template
+    which matches the beginning of an uri.
 
-    def __init__(self):
+    Templates are kept in a trie of path segments, so matching cost
+    depends on the depth of an uri rather than on the number of templates.
+    Results for ``memo_size`` recently matched uris are memoised.
+    """
+
+    def __init__(self, memo_size=1024):
         self._patterns = []
+        self._trie = None
+        self._recent = LRUCache(maxsize=memo_size)
 
     def add(self, uri, resource, priority=0):
-        parts = uri.strip('/').split('/')
-
-        pattern_parts = []
-        for part in parts:
-            is_variable = VARIABLE.search(part)
-            if is_variable:
-                pattern_part = r'(?P<{0}>[\w\d\-\_\.]+)'.format(
-                    is_variable.group(1)
-                )
-                pattern_parts.append(pattern_part)
-            else:
-                pattern_parts.append(part)
-
-        pattern = re.compile('/'.join(pattern_parts))
-        self._patterns.append((
-            priority,
-            pattern,
-            resource
-        ))
+        # path segments, None for variables
+        parts = [
+            None if VARIABLE.search(part) else part
+            for part in uri.strip('/').split('/')
+        ]
+        self._patterns.append((priority, resource, parts))
 
         #sort by priority
-        self._patterns.sort(key=lambda it: it[0], reverse=True)  # ok for our N < 20
+        self._patterns.sort(key=lambda it: it[0], reverse=True)
+        self._trie = None
+        self._recent.clear()
 
     def match(self, uri):
-        path = uri.strip('/')
-        for _, pattern, value in self._patterns:
-            match = pattern.match(path)
-            if match:
-                return value
+        value = self._recent.get(uri, _MISSING)
+        if value is _MISSING:
+            value = self._match(uri)
+            self._recent.set(uri, value)
+        return value
+
+    def _match(self, uri):
+        if self._trie is None:
+            self._trie = self._build_trie()
+
+        segments = uri.strip('/').split('/')
+        best = _find_first(self._trie, segments, 0, len(self._patterns))
+        if best < len(self._patterns):
+            return self._patterns[best][1]
         return None
+
+    def _build_trie(self):
+        root = _TrieNode()
+        for order, (_, _, parts) in enumerate(self._patterns):
+            node = root
+            for part in parts[:-1]:
+                node = node.child(part)
+            node.tails.append((order, parts[-1]))
+        return root
+
+
+class _TrieNode(object):
+    __slots__ = ('literals', 'variable', 'tails')
+
+    def __init__(self):
+        self.literals = {}
+        self.variable = None
+        # (order, last part) of templates ending below this node
+        self.tails = []
+
+    def child(self, part):
+        if part is None:
+            if self.variable is None:
+                self.variable = _TrieNode()
+            return self.variable
+        if part not in self.literals:
+            self.literals[part] = _TrieNode()
+        return self.literals[part]
+
+
+def _find_first(node, segments, index, best):
+    """Smallest order (< ``best``) of templates matching ``segments[index:]``."""
+    segment = segments[index]
+
+    # Like re.match, a template may match the beginning of the last part
+    for order, part in node.tails:
+        if order < best:
+            if part is None:
+                if VARIABLE_VALUE_START_RE.match(segment):
+                    best = order
+            elif segment.startswith(part):
+                best = order
+
+    if index + 1 < len(segments):
+        child = node.literals.get(segment)
+        if child is not None:
+            best = _find_first(child, segments, index + 1, best)
+        if node.variable is not None and VARIABLE_VALUE_RE.match(segment):
+            best = _find_first(node.variable, segments, index + 1, best)
+    return best
+
+
+_MISSING = object()